@@ -0,0 +1,166 @@
+"""
+SQLite performance profile benchmark
+Compares insert throughput and UI read latency between the default SQLite
+configuration and the tuned profile (WAL, synchronous=NORMAL, mmap, single writer)
+"""
+
+import sys
+import time
+import tempfile
+import threading
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+# Add src directory to path (as main.py: the package directory is imported as "src")
+src_dir = Path(__file__).parent
+sys.path.insert(0, str(src_dir.parent))
+
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.models.base import Base, db_manager
+from src.models.device import Device
+from src.models.check_result import CheckResult, CheckType
+
+DEVICE_COUNT = 200
+WRITER_THREADS = 4
+BATCHES_PER_WRITER = 50
+BATCH_SIZE = 200
+
+
+def _seed_devices(session_factory):
+    """Create the device rows the UI query reads"""
+    session = session_factory()
+    try:
+        session.add_all([
+            Device(name=f"bench-{i}", ip_address=f"10.0.{i // 250}.{i % 250 + 1}")
+            for i in range(DEVICE_COUNT)
+        ])
+        session.commit()
+    finally:
+        session.close()
+
+
+def _make_batch(writer_id: int):
+    """Build one batch of check result rows"""
+    now = datetime.now()
+    return [
+        {
+            'device_id': (writer_id * BATCH_SIZE + i) % DEVICE_COUNT + 1,
+            'check_type': CheckType.PING,
+            'check_time': now,
+            'success': True,
+            'response_time': float(i % 50),
+            'check_data': '{}'
+        }
+        for i in range(BATCH_SIZE)
+    ]
+
+
+def _run(label: str, write_session_factory, read_session_factory):
+    """Run concurrent writers plus one UI-style reader and report the results"""
+    _seed_devices(write_session_factory)
+
+    read_latencies = []
+    errors = {'write': 0, 'read': 0}
+    done = threading.Event()
+
+    def writer(writer_id: int):
+        for _ in range(BATCHES_PER_WRITER):
+            session = write_session_factory()
+            try:
+                session.connection().execute(insert(CheckResult.__table__), _make_batch(writer_id))
+                session.commit()
+            except OperationalError:
+                errors['write'] += 1
+                session.rollback()
+            finally:
+                session.close()
+
+    def reader():
+        # Mirrors the device table refresh: all devices plus a per-device count
+        while not done.is_set():
+            session = read_session_factory()
+            start = time.perf_counter()
+            try:
+                session.execute(select(Device)).all()
+                session.execute(
+                    select(CheckResult.device_id, func.count()).group_by(CheckResult.device_id)
+                ).all()
+                read_latencies.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                errors['read'] += 1
+            finally:
+                session.close()
+            time.sleep(0.01)
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+
+    start = time.perf_counter()
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(WRITER_THREADS)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    reader_thread.join()
+
+    total_rows = WRITER_THREADS * BATCHES_PER_WRITER * BATCH_SIZE - errors['write'] * BATCH_SIZE
+    latencies = sorted(read_latencies) or [0.0]
+
+    print(f"\n{label}")
+    print("-" * 80)
+    print(f"  Inserted rows:       {total_rows} in {elapsed:.2f}s")
+    print(f"  Insert throughput:   {total_rows / elapsed:,.0f} rows/sec")
+    print(f"  UI reads:            {len(read_latencies)}")
+    print(f"  UI read p50:         {statistics.median(latencies):.1f}ms")
+    print(f"  UI read p95:         {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.1f}ms")
+    print(f"  UI read max:         {latencies[-1]:.1f}ms")
+    print(f"  'database is locked' errors: write={errors['write']} read={errors['read']}")
+
+    return total_rows / elapsed, statistics.median(latencies)
+
+
+def benchmark():
+    """Run the default and tuned configurations against fresh databases"""
+    print("\n" + "="*80)
+    print("SQLITE PROFILE BENCHMARK")
+    print(f"{WRITER_THREADS} writers x {BATCHES_PER_WRITER} batches x {BATCH_SIZE} rows, {DEVICE_COUNT} devices")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Default: rollback journal, pooled connections all writing
+        default_url = f"sqlite:///{Path(tmp_dir) / 'default.db'}"
+        default_engine = create_engine(
+            default_url,
+            pool_size=20,
+            max_overflow=10,
+            pool_timeout=30,
+            connect_args={'check_same_thread': False}
+        )
+        Base.metadata.create_all(default_engine)
+        default_sessions = sessionmaker(bind=default_engine)
+        before = _run("DEFAULT (journal_mode=DELETE, synchronous=FULL, pooled writers)",
+                      default_sessions, default_sessions)
+        default_engine.dispose()
+
+        # Tuned: SQLite profile + single writer connection
+        tuned_url = f"sqlite:///{Path(tmp_dir) / 'tuned.db'}"
+        db_manager.initialize(tuned_url)
+        after = _run("TUNED (WAL, synchronous=NORMAL, mmap, single writer)",
+                     db_manager.get_write_session, db_manager.get_session)
+        db_manager.close()
+
+    print("\n" + "="*80)
+    print(f"Insert throughput: {before[0]:,.0f} -> {after[0]:,.0f} rows/sec ({after[0] / before[0]:.1f}x)")
+    print(f"UI read p50:       {before[1]:.1f}ms -> {after[1]:.1f}ms")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    benchmark()
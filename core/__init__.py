@@ -5,5 +5,6 @@ PingMonitor Pro v2.0 - Core Module
 from .config_manager import ConfigManager
 from .logger import log_manager, get_logger
 from .monitoring_engine import MonitoringEngine
+from .async_monitoring_engine import AsyncMonitoringEngine
 
-__all__ = ['ConfigManager', 'log_manager', 'get_logger', 'MonitoringEngine']
+__all__ = ['ConfigManager', 'log_manager', 'get_logger', 'MonitoringEngine', 'AsyncMonitoringEngine']
@@ -0,0 +1,203 @@
+"""
+PingMonitor Pro v2.3 - Async Monitoring Engine
+Runs check probes as coroutines on a single event loop
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+from typing import Callable, List, Optional, Tuple
+import logging
+
+from ..models.check_result import CheckType
+from .monitoring_engine import MonitoringEngine, CheckTask, BatchCheckTask, CHECK_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMonitoringEngine(MonitoringEngine):
+    """
+    Monitoring engine that runs checks as coroutines on one asyncio event loop
+
+    Coroutine check services (e.g. PingService.async_check) are awaited on the
+    loop, bounded by an asyncio.Semaphore; plain callables still work and are
+    run on the thread pool, so registration is the same as MonitoringEngine.
+    Scheduling, result processing and callbacks are inherited unchanged.
+    Worker busy/idle telemetry only covers checks run on the thread pool.
+    """
+
+    def __init__(self, max_workers: int = 10, max_concurrent: int = 500):
+        """
+        Initialize async monitoring engine
+
+        Args:
+            max_workers: Thread pool size for blocking (non-coroutine) check services
+            max_concurrent: Maximum number of checks in flight on the event loop
+        """
+        super().__init__(max_workers=max_workers)
+        self.max_concurrent = max_concurrent
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue_reader: Optional[ThreadPoolExecutor] = None
+
+        logger.info(f"Async monitoring engine initialized with {max_concurrent} concurrent checks")
+
+    def register_check_service(self, check_type: CheckType, service: Callable):
+        """
+        Register a check service
+
+        Args:
+            check_type: Type of check
+            service: Coroutine function (awaited on the loop) or callable (run on the thread pool)
+        """
+        super().register_check_service(check_type, service)
+        if not asyncio.iscoroutinefunction(service):
+            logger.debug(f"Check service {check_type.value} is blocking - will run on thread pool")
+
+    def _monitoring_loop(self):
+        """Run the async dispatcher on this thread's own event loop"""
+        logger.debug("Async monitoring loop started")
+
+        # Single thread dedicated to blocking reads from task_queue
+        self._queue_reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='task-queue-reader')
+        try:
+            asyncio.run(self._dispatch())
+        except Exception as e:
+            logger.error(f"Error in async monitoring loop: {e}", exc_info=True)
+        finally:
+            self._queue_reader.shutdown(wait=False)
+            self._loop = None
+
+    def _next_task(self) -> Optional[CheckTask]:
+        """Blocking read of the next task (runs on the queue reader thread)"""
+        try:
+            _, task = self.task_queue.get(timeout=0.5)
+        except Empty:
+            return None
+
+        self.telemetry.record('queue_wait', (time.monotonic() - task.enqueued_at) * 1000)
+        return task
+
+    async def _dispatch(self):
+        """Keep up to max_concurrent checks in flight, starting one as soon as a slot frees up"""
+        self._loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        pending = set()
+
+        try:
+            while self.running:
+                if self.paused:
+                    await asyncio.sleep(1)
+                    continue
+
+                await semaphore.acquire()
+
+                task = await self._loop.run_in_executor(self._queue_reader, self._next_task)
+                if task is None or not self.running:
+                    semaphore.release()
+                    continue
+
+                check = asyncio.create_task(self._run_check(task, semaphore))
+                pending.add(check)
+                check.add_done_callback(pending.discard)
+        finally:
+            for check in pending:
+                check.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run_check(self, task: CheckTask, semaphore: asyncio.Semaphore):
+        """
+        Run one check and hand its result to the result consumer thread
+
+        Args:
+            task: Check task to execute
+            semaphore: Concurrency semaphore, released when the check ends
+        """
+        device_tasks = task.tasks if isinstance(task, BatchCheckTask) else [task]
+
+        try:
+            if isinstance(task, BatchCheckTask):
+                pairs = await asyncio.wait_for(self._execute_batch_check_async(task), timeout=CHECK_TIMEOUT)
+            else:
+                result = await asyncio.wait_for(self._execute_check_async(task), timeout=CHECK_TIMEOUT)
+                pairs = [(task, result)]
+
+            for device_task, result in pairs:
+                self.result_queue.put((device_task, result, None))
+        except asyncio.TimeoutError:
+            for device_task in device_tasks:
+                error = TimeoutError(
+                    f"Check exceeded {CHECK_TIMEOUT}s total timeout "
+                    f"(device timeout: {device_task.device.timeout}s, check type: {device_task.check_type})"
+                )
+                self.result_queue.put((device_task, None, error))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            for device_task in device_tasks:
+                self.result_queue.put((device_task, None, e))
+        finally:
+            semaphore.release()
+
+    async def _execute_batch_check_async(self, task: BatchCheckTask) -> List[Tuple[CheckTask, dict]]:
+        """
+        Execute a batch check task on the event loop
+
+        Args:
+            task: Batch check task to execute
+
+        Returns:
+            List of (per-device task, check result dict)
+        """
+        check_service = self.batch_check_services.get(task.check_type)
+
+        if not asyncio.iscoroutinefunction(check_service):
+            return await self._loop.run_in_executor(self.executor, self._execute_batch_check, task)
+
+        start_time = time.time()
+        logger.info(f"[CHECK] Executing batch {task.check_type.value} check for {len(task.devices)} devices")
+        try:
+            results = await check_service(task.devices)
+        finally:
+            self.telemetry.record('service_time', (time.time() - start_time) * 1000)
+        return self._split_batch_results(task, results, start_time)
+
+    async def _execute_check_async(self, task: CheckTask) -> dict:
+        """
+        Execute a check task on the event loop
+
+        Args:
+            task: Check task to execute
+
+        Returns:
+            Check result dict
+        """
+        start_time = time.time()
+        device = task.device
+        check_type = task.check_type
+
+        logger.info(f"[CHECK] Executing {check_type.value} check for {device.name} ({device.ip_address})")
+
+        try:
+            # Get the appropriate check service
+            check_service = self.check_services.get(check_type)
+
+            if check_service is None:
+                raise ValueError(f"No check service registered for {check_type.value}")
+
+            # Execute check
+            if asyncio.iscoroutinefunction(check_service):
+                result = await check_service(device)
+            else:
+                result = await self._loop.run_in_executor(self.executor, check_service, device)
+
+            return self._complete_check_result(task, result, start_time)
+
+        except Exception as e:
+            return self._exception_check_result(task, e, start_time)
+        finally:
+            self.telemetry.record('service_time', (time.time() - start_time) * 1000)
+
+    def __repr__(self):
+        return f"<AsyncMonitoringEngine(devices={len(self.devices)}, running={self.running}, max_concurrent={self.max_concurrent})>"
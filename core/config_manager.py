@@ -274,6 +274,8 @@ class ConfigManager:
                 "default_interval": 60,
                 "default_timeout": 5,
                 "concurrent_checks": 10,
+                "engine": "threaded",  # threaded, async
+                "async_concurrency": 500,
                 "retry_attempts": 3,
                 "retry_delay": 5,
                 "adaptive_interval": True,
@@ -285,7 +287,16 @@ class ConfigManager:
                 "path": str(self.config_dir / "pingmonitor.db"),
                 "backup_enabled": True,
                 "backup_interval": 86400,
-                "retention_days": 90
+                "backup_keep": 7,
+                "retention_days": 90,
+                "statistics_retention_days": 365,
+                "archive_enabled": False,
+                "archive_after_days": 7,
+                "archive_retention_days": 365,
+                "rollup_interval": 300,
+                "dedup_enabled": False,
+                "dedup_response_band_ms": 50.0,
+                "dedup_keyframe_interval": 300
             },
             "logging": {
                 "level": "INFO",
@@ -318,7 +329,10 @@ class ConfigManager:
                 "port": 8000,
                 "enable_docs": True,
                 "cors_enabled": False,
-                "cors_origins": ["*"]
+                "cors_origins": ["*"],
+                "rest_enabled": True,
+                "metrics_enabled": True,
+                "metrics_interval": 5
             },
             "devices": [],
             "device_groups": []
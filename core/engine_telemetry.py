@@ -0,0 +1,163 @@
+"""
+PingMonitor Pro v2.3 - Engine Telemetry
+Scheduler lag, queue wait, service time and worker utilisation for MonitoringEngine
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..services.latency_histogram import LatencyHistogram, WindowedHistogram, bucket_index
+
+
+class EngineTelemetry:
+    """
+    Histograms and worker utilisation for MonitoringEngine internals
+
+    Timings (ms), each kept for the lifetime and a sliding window:
+    - schedule_drift: scheduler start of a device's checks vs its due time
+    - queue_wait: time a task spent in task_queue
+    - service_time: time inside the check service (whole batch for batch checks)
+    - process_time: time in _process_check_result
+
+    Worker busy/idle ratio is the share of the utilisation window each check
+    worker thread spent executing checks, including checks still running.
+    """
+
+    HISTOGRAMS = ('schedule_drift', 'queue_wait', 'service_time', 'process_time')
+
+    def __init__(self, window_seconds: int = 300, slots: int = 10, utilization_window: int = 60,
+                 utilization_slots: int = 6):
+        """
+        Initialize engine telemetry
+
+        Args:
+            window_seconds: Sliding window for the timing histograms
+            slots: Slots in the timing window
+            utilization_window: Sliding window for worker busy/idle ratios
+            utilization_slots: Slots in the utilisation window
+        """
+        self.window_seconds = window_seconds
+        self.lifetime = {name: LatencyHistogram() for name in self.HISTOGRAMS}
+        self.windows = {name: WindowedHistogram(window_seconds, slots) for name in self.HISTOGRAMS}
+
+        self.utilization_window = utilization_window
+        self.utilization_slot_seconds = utilization_window / utilization_slots
+        self.utilization_slots = utilization_slots
+        self.workers: Dict[str, Dict[str, Any]] = {}
+
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, name: str, value_ms: float):
+        """
+        Record one timing
+
+        Args:
+            name: One of HISTOGRAMS
+            value_ms: Duration in milliseconds
+        """
+        value_ms = max(0.0, value_ms)
+        index = bucket_index(value_ms)
+        now = time.time()
+        with self.lock:
+            self.lifetime[name].record(value_ms, index)
+            self.windows[name].record(value_ms, index, now)
+
+    def _worker(self, name: str) -> Dict[str, Any]:
+        worker = self.workers.get(name)
+        if worker is None:
+            worker = self.workers[name] = {
+                'busy': [0.0] * self.utilization_slots,
+                'epochs': [-1] * self.utilization_slots,
+                'busy_since': None,
+                'busy_seconds': 0.0,
+                'checks': 0,
+                'first_seen': time.time()
+            }
+        return worker
+
+    def worker_started(self, name: Optional[str] = None):
+        """Mark the calling (or named) worker thread busy"""
+        name = name or threading.current_thread().name
+        with self.lock:
+            self._worker(name)['busy_since'] = time.time()
+
+    def worker_finished(self, name: Optional[str] = None):
+        """Mark the calling (or named) worker thread idle and account its busy time"""
+        name = name or threading.current_thread().name
+        now = time.time()
+        with self.lock:
+            worker = self._worker(name)
+            started = worker['busy_since']
+            worker['busy_since'] = None
+            if started is None:
+                return
+
+            worker['busy_seconds'] += now - started
+            worker['checks'] += 1
+
+            # Spread the busy interval over the slots it covers
+            position = max(started, now - self.utilization_window)
+            while position < now:
+                epoch = int(position // self.utilization_slot_seconds)
+                slot_end = min(now, (epoch + 1) * self.utilization_slot_seconds)
+                slot = epoch % self.utilization_slots
+                if worker['epochs'][slot] != epoch:
+                    worker['busy'][slot] = 0.0
+                    worker['epochs'][slot] = epoch
+                worker['busy'][slot] += slot_end - position
+                position = slot_end
+
+    def _busy_ratio(self, worker: Dict[str, Any], now: float) -> float:
+        epoch = int(now // self.utilization_slot_seconds)
+        oldest = epoch - self.utilization_slots + 1
+        window_start = max(oldest * self.utilization_slot_seconds, worker['first_seen'])
+
+        busy = sum(
+            slot_busy for slot_busy, slot_epoch in zip(worker['busy'], worker['epochs'])
+            if slot_epoch >= oldest
+        )
+        if worker['busy_since'] is not None:
+            busy += now - max(worker['busy_since'], window_start)
+
+        elapsed = now - window_start
+        return min(1.0, busy / elapsed) if elapsed > 0 else 0.0
+
+    def get_histograms(self) -> Dict[str, LatencyHistogram]:
+        """Copies of the lifetime timing histograms"""
+        with self.lock:
+            return {name: histogram.copy() for name, histogram in self.lifetime.items()}
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Timing histograms and worker utilisation
+
+        Returns:
+            {'histograms': {name: {'lifetime': summary, 'window': summary}},
+             'workers': {thread name: {'busy_ratio', 'busy', 'busy_seconds', 'checks'}},
+             'window_seconds', 'utilization_window'}
+        """
+        now = time.time()
+        with self.lock:
+            lifetime = {name: histogram.copy() for name, histogram in self.lifetime.items()}
+            windows = {name: windowed.snapshot(now) for name, windowed in self.windows.items()}
+            workers = {
+                name: {
+                    'busy_ratio': self._busy_ratio(worker, now),
+                    'busy': worker['busy_since'] is not None,
+                    'busy_seconds': worker['busy_seconds'],
+                    'checks': worker['checks']
+                }
+                for name, worker in self.workers.items()
+            }
+
+        return {
+            'histograms': {
+                name: {'lifetime': lifetime[name].summary(), 'window': windows[name].summary()}
+                for name in self.HISTOGRAMS
+            },
+            'workers': workers,
+            'window_seconds': self.window_seconds,
+            'utilization_window': self.utilization_window
+        }
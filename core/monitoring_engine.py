@@ -7,18 +7,32 @@ import asyncio
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue, PriorityQueue
+from typing import Dict, List, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future
+from queue import Queue, PriorityQueue, Empty
 import logging
 
 from ..models.device import Device
-from ..models.check_result import CheckResult, CheckType
+from ..models.check_result import CheckResult, CheckType, to_epoch_ms
 from ..models.base import db_manager
-from ..services.performance_service import batch_writer, performance_metrics, device_cache
+from ..services.performance_service import batch_writer, performance_metrics, device_cache, device_state_store, device_latency
+from ..services.incident_service import incident_store
+from ..services.tcp_service import TCPService
+from .engine_telemetry import EngineTelemetry
+from ..services.status_snapshot import StatusSnapshot, device_state
+from .scheduler import DueTimeScheduler
 
 logger = logging.getLogger(__name__)
 
+# Shortest honoured check interval (seconds)
+MIN_CHECK_INTERVAL = 1.0
+
+# Seconds after which an in-flight check is reported as failed
+CHECK_TIMEOUT = 30
+
+# Default maximum number of devices per batch check task
+MAX_BATCH_SIZE = 4096
+
 
 class CheckTask:
     """Represents a monitoring check task"""
@@ -28,8 +42,28 @@ class CheckTask:
         self.check_type = check_type
         self.priority = priority
         self.scheduled_time = datetime.utcnow()
+        self.enqueued_at = time.monotonic()
+        self.retry_count = 0
+
+    def __lt__(self, other):
+        """For priority queue ordering"""
+        return self.priority < other.priority
+
+
+class BatchCheckTask:
+    """Represents one check type for several devices, run by a single batch service call"""
+
+    def __init__(self, devices: List[Device], check_type: CheckType, priority: int = 5):
+        self.devices = devices
+        self.check_type = check_type
+        self.priority = priority
+        self.scheduled_time = datetime.utcnow()
+        self.enqueued_at = time.monotonic()
         self.retry_count = 0
 
+        # Per-device tasks used to hand results to the result consumer
+        self.tasks = [CheckTask(device, check_type, priority) for device in devices]
+
     def __lt__(self, other):
         """For priority queue ordering"""
         return self.priority < other.priority
@@ -40,6 +74,9 @@ class MonitoringEngine:
     Main monitoring engine with intelligent task scheduling
     """
 
+    # Minimum seconds between status snapshot publishes (API freshness vs copy/encode cost)
+    SNAPSHOT_INTERVAL = 0.5
+
     def __init__(self, max_workers: int = 10):
         """
         Initialize monitoring engine
@@ -48,7 +85,7 @@ class MonitoringEngine:
             max_workers: Maximum number of concurrent workers
         """
         self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='check-worker')
         self.executor_shutdown = False  # Track if executor has been shutdown
         self.task_queue = PriorityQueue()
         self.result_queue = Queue()
@@ -57,10 +94,19 @@ class MonitoringEngine:
         self.paused = False
         self._monitor_thread: Optional[threading.Thread] = None
         self._scheduler_thread: Optional[threading.Thread] = None
+        self._result_thread: Optional[threading.Thread] = None
+
+        # In-flight checks: bounded by max_workers, refilled as soon as one completes
+        self._inflight_slots = threading.BoundedSemaphore(max_workers)
+        self._in_flight: Dict[Future, tuple] = {}  # future -> (task, monotonic start)
+        self._in_flight_lock = threading.Lock()
 
         self.devices: Dict[int, Device] = {}
         self.last_check_times: Dict[int, datetime] = {}
+        self.scheduler = DueTimeScheduler()
         self.check_services: Dict[CheckType, Callable] = {}
+        self.batch_check_services: Dict[CheckType, Callable] = {}
+        self.max_batch_size = MAX_BATCH_SIZE
 
         # Thread safety locks
         self._last_check_times_lock = threading.Lock()
@@ -77,6 +123,18 @@ class MonitoringEngine:
             'average_response_time': 0.0
         }
 
+        # Scheduler lag, queue wait, service/processing time, worker utilisation
+        self.telemetry = EngineTelemetry()
+
+        # Immutable status snapshot for the API, republished at most every SNAPSHOT_INTERVAL
+        self.status_snapshot: Optional[StatusSnapshot] = None
+        self._snapshot_epoch = int(time.time())
+        self._snapshot_version = 0
+        self._snapshot_dirty = True
+        self._snapshot_changed_ids: set = set()  # Devices whose state changed since the last publish
+        self._snapshot_lock = threading.Lock()
+        self._last_snapshot_publish = 0.0
+
         self.callbacks = {
             'on_check_complete': [],
             'on_status_change': [],
@@ -148,6 +206,21 @@ class MonitoringEngine:
         self.check_services[check_type] = service
         logger.debug(f"Registered check service: {check_type.value}")
 
+    def register_batch_check_service(self, check_type: CheckType, service: Callable):
+        """
+        Register a batch check service
+
+        All devices due in the same scheduler tick are checked by one call,
+        e.g. PingService.check_many. The single-device service registered with
+        register_check_service is still used for forced and retried checks.
+
+        Args:
+            check_type: Type of check
+            service: Callable taking a list of devices and returning {device_id: result}
+        """
+        self.batch_check_services[check_type] = service
+        logger.debug(f"Registered batch check service: {check_type.value}")
+
     def set_auto_recovery_service(self, auto_recovery_service):
         """
         Set the auto-recovery service
@@ -171,7 +244,10 @@ class MonitoringEngine:
             logger.info(f"SSH auto-enabled for PAI-PL device: {device.name}")
 
         self.devices[device.id] = device
-        self.last_check_times[device.id] = datetime.utcnow() - timedelta(hours=1)
+        self._mark_snapshot_dirty(device.id)
+        with self._last_check_times_lock:
+            self.last_check_times[device.id] = datetime.utcnow() - timedelta(hours=1)
+        self.scheduler.schedule(device.id)
         logger.info(f"Device added to monitoring: {device.name} ({device.ip_address})")
 
     def remove_device(self, device_id: int):
@@ -184,8 +260,11 @@ class MonitoringEngine:
         if device_id in self.devices:
             device = self.devices[device_id]
             del self.devices[device_id]
-            if device_id in self.last_check_times:
-                del self.last_check_times[device_id]
+            with self._last_check_times_lock:
+                self.last_check_times.pop(device_id, None)
+            self.scheduler.remove(device_id)
+            device_latency.remove_device(device_id)
+            self._mark_snapshot_dirty()
             logger.info(f"Device removed from monitoring: {device.name}")
 
     def load_devices(self):
@@ -217,9 +296,14 @@ class MonitoringEngine:
         # Recreate executor if it was shutdown (after stop/restart)
         if self.executor_shutdown:
             logger.info("Recreating ThreadPoolExecutor after stop")
-            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='check-worker')
             self.executor_shutdown = False
 
+        # Fresh in-flight accounting (futures cancelled by a previous stop are dropped)
+        self._inflight_slots = threading.BoundedSemaphore(self.max_workers)
+        with self._in_flight_lock:
+            self._in_flight.clear()
+
         # Load devices
         logger.info("=" * 80)
         logger.info("STARTING MONITORING ENGINE")
@@ -229,6 +313,7 @@ class MonitoringEngine:
         logger.info("Loading devices from database...")
         self.load_devices()
         logger.info(f"Devices loaded: {len(self.devices)}")
+        self.publish_status_snapshot()
         for device_id, device in self.devices.items():
             logger.info(f"  - Device #{device_id}: {device.name} ({device.ip_address}) - Status: {device.current_status} - Interval: {device.check_interval}s")
 
@@ -237,6 +322,11 @@ class MonitoringEngine:
         self._monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self._monitor_thread.start()
 
+        # Start result consumer thread
+        logger.info("Starting result consumer thread...")
+        self._result_thread = threading.Thread(target=self._result_loop, daemon=True)
+        self._result_thread.start()
+
         # Start scheduler thread
         logger.info("Starting scheduler thread...")
         self._scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
@@ -258,6 +348,7 @@ class MonitoringEngine:
         logger.info("Stopping monitoring engine...")
         self.running = False
         self.paused = False
+        self.scheduler.wakeup()
 
         try:
             # 1. Cancel all active timers FIRST to prevent new tasks
@@ -275,6 +366,12 @@ class MonitoringEngine:
                 if self._monitor_thread.is_alive():
                     logger.warning("Monitor thread did not finish in time")
 
+            logger.info("Waiting for result consumer thread...")
+            if self._result_thread and self._result_thread.is_alive():
+                self._result_thread.join(timeout=2.0)
+                if self._result_thread.is_alive():
+                    logger.warning("Result consumer thread did not finish in time")
+
             # 3. Wait for scheduler thread to finish (max 2 seconds)
             logger.info("Waiting for scheduler thread...")
             if self._scheduler_thread and self._scheduler_thread.is_alive():
@@ -298,6 +395,11 @@ class MonitoringEngine:
                     self.task_queue.get_nowait()
                 except:
                     break
+            while not self.result_queue.empty():
+                try:
+                    self.result_queue.get_nowait()
+                except:
+                    break
 
             # 6. Flush pending batch writes
             logger.info("Flushing pending database writes...")
@@ -305,6 +407,14 @@ class MonitoringEngine:
                 batch_writer.force_flush()
             except Exception as e:
                 logger.warning(f"Batch writer flush warning: {e}")
+            try:
+                device_state_store.force_flush()
+            except Exception as e:
+                logger.warning(f"Device state flush warning: {e}")
+            try:
+                incident_store.force_flush()
+            except Exception as e:
+                logger.warning(f"Incident flush warning: {e}")
 
             # 7. Log final performance metrics
             logger.info("Final performance summary:")
@@ -330,10 +440,10 @@ class MonitoringEngine:
         logger.info("Monitoring resumed")
 
     def _scheduler_loop(self):
-        """Main scheduler loop - schedules check tasks"""
+        """Main scheduler loop - sleeps until the next device is due and schedules its checks"""
         logger.debug("Scheduler loop started")
-        last_perf_log = time.time()
-        last_queue_check = time.time()
+        next_perf_log = time.monotonic() + 300
+        next_queue_check = time.monotonic() + 30
 
         while self.running:
             try:
@@ -341,78 +451,126 @@ class MonitoringEngine:
                     time.sleep(1)
                     continue
 
-                current_time = datetime.utcnow()
+                # Wake up for the next due device or the next housekeeping task
+                now = time.monotonic()
+                timeout = max(0.0, min(next_perf_log, next_queue_check) - now)
+                due_devices = self.scheduler.pop_due(timeout=timeout)
+
+                if not self.running:
+                    break
 
-                # Schedule checks for all devices (thread-safe)
-                for device in self.devices.values():
-                    if not device.enabled:
+                now = time.monotonic()
+                batches: Dict[CheckType, List[Device]] = {}
+                for device_id, due_time in due_devices:
+                    device = self.devices.get(device_id)
+                    if device is None:
                         continue
 
-                    with self._last_check_times_lock:
-                        last_check = self.last_check_times.get(device.id)
-                        check_interval = timedelta(seconds=device.check_interval)
+                    interval = max(float(device.check_interval or 0), MIN_CHECK_INTERVAL)
 
-                        if last_check is None or (current_time - last_check) >= check_interval:
-                            logger.info(f"[SCHEDULER] Scheduling checks for {device.name} ({device.ip_address}) - Last check: {last_check}, Interval: {device.check_interval}s")
-                            self._schedule_device_checks(device)
-                            self.last_check_times[device.id] = current_time
+                    if device.enabled:
+                        self.telemetry.record('schedule_drift', (now - due_time) * 1000)
+                        logger.info(f"[SCHEDULER] Scheduling checks for {device.name} ({device.ip_address}) - Lag: {(now - due_time) * 1000:.0f}ms, Interval: {device.check_interval}s")
+                        self._schedule_device_checks(device, batches)
+                        with self._last_check_times_lock:
+                            self.last_check_times[device_id] = datetime.utcnow()
+
+                    # Next due time is anchored to the previous one to avoid drift,
+                    # but never in the past (e.g. after a pause or an overload)
+                    self.scheduler.schedule(device_id, max(due_time + interval, now))
+
+                self._schedule_batch_checks(batches)
 
                 # Log performance metrics every 5 minutes
-                if time.time() - last_perf_log >= 300:
+                if now >= next_perf_log:
                     performance_metrics.log_summary()
-                    last_perf_log = time.time()
+                    next_perf_log = now + 300
 
                 # Monitor queue size every 30 seconds for memory optimization
-                if time.time() - last_queue_check >= 30:
+                if now >= next_queue_check:
                     queue_size = self.task_queue.qsize()
                     if queue_size > 100:
                         logger.warning(f"[MEMORY] Task queue size high: {queue_size} tasks pending")
-                    last_queue_check = time.time()
-
-                time.sleep(5)  # Scheduler runs every 5 seconds
+                    next_queue_check = now + 30
 
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}", exc_info=True)
                 time.sleep(5)
 
-    def _schedule_device_checks(self, device: Device):
+    def _schedule_device_checks(self, device: Device, batches: Optional[Dict[CheckType, List[Device]]] = None):
         """
         Schedule all enabled checks for a device
 
         Args:
             device: Device to schedule checks for
+            batches: Collects devices for check types with a batch service (None = no batching)
         """
         # Determine priority based on device status
         priority = self._calculate_priority(device)
         checks_scheduled = []
 
         if device.ping_enabled:
-            self.task_queue.put((priority, CheckTask(device, CheckType.PING, priority)))
+            self._enqueue_check(device, CheckType.PING, priority, batches)
             checks_scheduled.append("PING")
 
         if device.http_enabled:
-            self.task_queue.put((priority, CheckTask(device, CheckType.HTTP, priority)))
+            self._enqueue_check(device, CheckType.HTTP, priority, batches)
             checks_scheduled.append("HTTP")
 
         if device.https_enabled:
-            self.task_queue.put((priority, CheckTask(device, CheckType.HTTPS, priority)))
+            self._enqueue_check(device, CheckType.HTTPS, priority, batches)
             checks_scheduled.append("HTTPS")
 
         if device.ssh_enabled:
-            self.task_queue.put((priority, CheckTask(device, CheckType.SSH, priority)))
+            self._enqueue_check(device, CheckType.SSH, priority, batches)
             checks_scheduled.append("SSH")
 
         if device.dns_enabled:
-            self.task_queue.put((priority, CheckTask(device, CheckType.DNS, priority)))
+            self._enqueue_check(device, CheckType.DNS, priority, batches)
             checks_scheduled.append("DNS")
 
         if device.snmp_enabled:
-            self.task_queue.put((priority, CheckTask(device, CheckType.SNMP, priority)))
+            self._enqueue_check(device, CheckType.SNMP, priority, batches)
             checks_scheduled.append("SNMP")
 
+        # TCP has no Device flag: enabled by a port list in custom_fields
+        if CheckType.TCP in self.check_services and TCPService.get_ports(device):
+            self._enqueue_check(device, CheckType.TCP, priority, batches)
+            checks_scheduled.append("TCP")
+
         if checks_scheduled:
             logger.info(f"[QUEUE] Added tasks for {device.name}: {', '.join(checks_scheduled)} (priority: {priority})")
 
+    def _enqueue_check(self, device: Device, check_type: CheckType, priority: int,
+                       batches: Optional[Dict[CheckType, List[Device]]]):
+        """
+        Queue a single check, or collect it for a batch check
+
+        Args:
+            device: Device to check
+            check_type: Type of check
+            priority: Task priority
+            batches: Batch collector, or None to always queue a single check
+        """
+        if batches is not None and check_type in self.batch_check_services:
+            batches.setdefault(check_type, []).append(device)
+        else:
+            self.task_queue.put((priority, CheckTask(device, check_type, priority)))
+
+    def _schedule_batch_checks(self, batches: Dict[CheckType, List[Device]]):
+        """
+        Queue collected batch checks, split into chunks of max_batch_size devices
+
+        Args:
+            batches: Devices per batched check type
+        """
+        for check_type, devices in batches.items():
+            for offset in range(0, len(devices), self.max_batch_size):
+                chunk = devices[offset:offset + self.max_batch_size]
+                priority = min(self._calculate_priority(device) for device in chunk)
+                self.task_queue.put((priority, BatchCheckTask(chunk, check_type, priority)))
+                logger.info(f"[QUEUE] Added batch {check_type.value} task for {len(chunk)} devices (priority: {priority})")
+
     def _calculate_priority(self, device: Device) -> int:
         """
         Calculate check priority based on device status
@@ -437,19 +595,15 @@ class MonitoringEngine:
         Args:
             device_id: Device ID to check, or None for all devices
         """
-        # Set last check time to past to trigger immediate scheduling
-        force_time = datetime.utcnow() - timedelta(hours=1)
-
-        with self._last_check_times_lock:
-            if device_id is not None:
-                if device_id in self.last_check_times:
-                    self.last_check_times[device_id] = force_time
-                    logger.info(f"Forced immediate check for device {device_id}")
-            else:
-                # Force all devices
-                for dev_id in self.devices:
-                    self.last_check_times[dev_id] = force_time
-                logger.info(f"Forced immediate check for all {len(self.devices)} devices")
+        if device_id is not None:
+            if device_id in self.devices:
+                self.scheduler.schedule(device_id)
+                logger.info(f"Forced immediate check for device {device_id}")
+        else:
+            # Force all devices
+            for dev_id in list(self.devices):
+                self.scheduler.schedule(dev_id)
+            logger.info(f"Forced immediate check for all {len(self.devices)} devices")
 
     def reload_devices(self) -> int:
         """
@@ -477,6 +631,7 @@ class MonitoringEngine:
                 if device.id in self.devices:
                     # Update existing device
                     self.devices[device.id] = device
+                    self._mark_snapshot_dirty(device.id)
                 else:
                     # Add new device
                     self.add_device(device)
@@ -491,7 +646,12 @@ class MonitoringEngine:
             session.close()
 
     def _monitoring_loop(self):
-        """Main monitoring loop - processes check tasks"""
+        """
+        Dispatcher loop - keeps up to max_workers checks in flight
+
+        A slot is refilled as soon as any check completes; results are handed
+        to the result consumer thread, so a slow check never holds back idle workers.
+        """
         logger.debug("Monitoring loop started")
 
         while self.running:
@@ -500,66 +660,132 @@ class MonitoringEngine:
                     time.sleep(1)
                     continue
 
-                # Get tasks from queue and submit to executor
-                tasks_to_process = []
-
-                # Get up to max_workers tasks
-                while len(tasks_to_process) < self.max_workers and not self.task_queue.empty():
-                    try:
-                        _, task = self.task_queue.get_nowait()
-                        tasks_to_process.append(task)
-                    except:
-                        break
+                # Wait for a free slot
+                if not self._inflight_slots.acquire(timeout=0.5):
+                    continue
 
-                if not tasks_to_process:
-                    time.sleep(0.1)
+                try:
+                    _, task = self.task_queue.get(timeout=0.5)
+                except Empty:
+                    self._inflight_slots.release()
                     continue
 
-                # Submit tasks to executor (check if still running before submitting)
-                future_to_task = {}
-                for task in tasks_to_process:
-                    if not self.running:
-                        # Monitoring has been stopped, don't submit new tasks
-                        logger.debug("Monitoring stopped, skipping task submission")
-                        break
-                    try:
-                        future = self.executor.submit(self._execute_check, task)
-                        future_to_task[future] = task
-                    except RuntimeError as e:
-                        # Executor has been shutdown
-                        logger.warning(f"Executor shutdown, cannot submit task: {e}")
-                        break
+                self.telemetry.record('queue_wait', (time.monotonic() - task.enqueued_at) * 1000)
+
+                if not self.running:
+                    # Monitoring has been stopped, don't submit new tasks
+                    logger.debug("Monitoring stopped, skipping task submission")
+                    self._inflight_slots.release()
+                    break
 
-                # Process completed checks as they complete (non-blocking)
                 try:
-                    for future in as_completed(future_to_task, timeout=30):
-                        task = future_to_task[future]
-                        try:
-                            result = future.result(timeout=0.1)  # Quick timeout since already completed
-                            self._process_check_result(task, result)
-                        except TimeoutError:
-                            timeout_val = task.device.timeout + 5
-                            error_msg = f"Check timed out after {timeout_val}s (device timeout: {task.device.timeout}s, check type: {task.check_type})"
-                            logger.error(f"Check failed for {task.device.name}: {error_msg}")
-                            self._handle_check_failure(task, error_msg)
-                        except Exception as e:
-                            error_msg = str(e) if str(e) else 'Unknown error - no exception message'
-                            logger.error(f"Check failed for {task.device.name}: {error_msg}", exc_info=True)
-                            self._handle_check_failure(task, error_msg)
-                except TimeoutError:
-                    # Some futures didn't complete in time - handle remaining futures
-                    logger.warning(f"Some checks did not complete within 30s timeout")
-                    for future, task in future_to_task.items():
-                        if not future.done():
-                            error_msg = f"Check exceeded 30s total timeout (device timeout: {task.device.timeout}s, check type: {task.check_type})"
-                            logger.error(f"Check failed for {task.device.name}: {error_msg}")
-                            self._handle_check_failure(task, error_msg)
-                            future.cancel()  # Cancel the slow future
+                    if isinstance(task, BatchCheckTask):
+                        future = self.executor.submit(self._execute_batch_check, task)
+                    else:
+                        future = self.executor.submit(self._execute_check, task)
+                except RuntimeError as e:
+                    # Executor has been shutdown
+                    logger.warning(f"Executor shutdown, cannot submit task: {e}")
+                    self._inflight_slots.release()
+                    break
+
+                with self._in_flight_lock:
+                    self._in_flight[future] = (task, time.monotonic())
+                future.add_done_callback(self._on_check_done)
 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}", exc_info=True)
                 time.sleep(1)
 
+    def _on_check_done(self, future: Future):
+        """
+        Executor callback - frees the slot and hands the result to the consumer
+
+        Args:
+            future: Completed check future
+        """
+        self._inflight_slots.release()
+
+        with self._in_flight_lock:
+            entry = self._in_flight.pop(future, None)
+
+        if entry is None or future.cancelled():
+            # Already reported as timed out, or cancelled on stop
+            return
+
+        task = entry[0]
+        error = future.exception()
+
+        if isinstance(task, BatchCheckTask):
+            if error is not None:
+                for device_task in task.tasks:
+                    self.result_queue.put((device_task, None, error))
+            else:
+                for device_task, result in future.result():
+                    self.result_queue.put((device_task, result, None))
+        else:
+            self.result_queue.put((task, None if error else future.result(), error))
+
+    def _result_loop(self):
+        """Result consumer loop - processes completed checks and expires stuck ones"""
+        logger.debug("Result consumer loop started")
+        last_expiry_check = time.monotonic()
+
+        while self.running:
+            try:
+                # While a publish is pending, wake up in time for it
+                timeout = 1.0
+                if self._snapshot_dirty:
+                    timeout = min(timeout, max(0.0, self.SNAPSHOT_INTERVAL - (time.monotonic() - self._last_snapshot_publish)))
+
+                try:
+                    task, result, error = self.result_queue.get(timeout=timeout)
+                except Empty:
+                    task = None
+
+                if task is not None:
+                    if error is None:
+                        process_start = time.perf_counter()
+                        self._process_check_result(task, result)
+                        self.telemetry.record('process_time', (time.perf_counter() - process_start) * 1000)
+                    else:
+                        error_msg = str(error) if str(error) else 'Unknown error - no exception message'
+                        logger.error(f"Check failed for {task.device.name}: {error_msg}", exc_info=error)
+                        self._handle_check_failure(task, error_msg)
+                    self._mark_snapshot_dirty(task.device.id)
+
+                # Rate-limited: results arriving in between are folded into one publish
+                if self._snapshot_dirty and time.monotonic() - self._last_snapshot_publish >= self.SNAPSHOT_INTERVAL:
+                    self.publish_status_snapshot()
+
+                if time.monotonic() - last_expiry_check >= 1.0:
+                    self._expire_stuck_checks()
+                    last_expiry_check = time.monotonic()
+
+            except Exception as e:
+                logger.error(f"Error in result consumer loop: {e}", exc_info=True)
+                time.sleep(1)
+
+    def _expire_stuck_checks(self):
+        """Report checks in flight for longer than CHECK_TIMEOUT as failed"""
+        now = time.monotonic()
+        with self._in_flight_lock:
+            expired = [
+                (future, task) for future, (task, started) in self._in_flight.items()
+                if now - started >= CHECK_TIMEOUT
+            ]
+            for future, _ in expired:
+                # Late results for these futures are discarded by _on_check_done
+                del self._in_flight[future]
+
+        for future, expired_task in expired:
+            device_tasks = expired_task.tasks if isinstance(expired_task, BatchCheckTask) else [expired_task]
+            for task in device_tasks:
+                error_msg = f"Check exceeded {CHECK_TIMEOUT}s total timeout (device timeout: {task.device.timeout}s, check type: {task.check_type})"
+                logger.error(f"Check failed for {task.device.name}: {error_msg}")
+                self._handle_check_failure(task, error_msg)
+            future.cancel()
+
     def _execute_check(self, task: CheckTask) -> dict:
         """
         Execute a check task
@@ -576,6 +802,7 @@ class MonitoringEngine:
 
         logger.info(f"[CHECK] Executing {check_type.value} check for {device.name} ({device.ip_address})")
 
+        self.telemetry.worker_started()
         try:
             # Get the appropriate check service
             check_service = self.check_services.get(check_type)
@@ -586,29 +813,134 @@ class MonitoringEngine:
             # Execute check
             result = check_service(device)
 
-            # Calculate response time
+            return self._complete_check_result(task, result, start_time)
+
+        except Exception as e:
+            return self._exception_check_result(task, e, start_time)
+        finally:
+            self.telemetry.worker_finished()
+            self.telemetry.record('service_time', (time.time() - start_time) * 1000)
+
+    def _execute_batch_check(self, task: BatchCheckTask) -> List[Tuple[CheckTask, dict]]:
+        """
+        Execute a batch check task
+
+        Args:
+            task: Batch check task to execute
+
+        Returns:
+            List of (per-device task, check result dict)
+        """
+        start_time = time.time()
+        logger.info(f"[CHECK] Executing batch {task.check_type.value} check for {len(task.devices)} devices")
+
+        check_service = self.batch_check_services.get(task.check_type)
+        if check_service is None:
+            raise ValueError(f"No batch check service registered for {task.check_type.value}")
+
+        self.telemetry.worker_started()
+        try:
+            results = check_service(task.devices)
+        finally:
+            self.telemetry.worker_finished()
+            self.telemetry.record('service_time', (time.time() - start_time) * 1000)
+        return self._split_batch_results(task, results, start_time)
+
+    def _split_batch_results(self, task: BatchCheckTask, results: Dict[int, dict],
+                             start_time: float) -> List[Tuple[CheckTask, dict]]:
+        """
+        Stamp each device result of a batch check with engine metadata
+
+        Args:
+            task: Executed batch check task
+            results: {device_id: result} returned by the batch service
+            start_time: time.time() when the batch started
+
+        Returns:
+            List of (per-device task, check result dict)
+        """
+        pairs = []
+        for device_task in task.tasks:
+            result = results.get(device_task.device.id)
+            if result is None:
+                result = self._exception_check_result(
+                    device_task, ValueError("No result returned by batch check service"), start_time)
+            else:
+                # Keep the per-device response time measured by the service
+                result = self._complete_check_result(device_task, result, None)
+            pairs.append((device_task, result))
+
+        elapsed = (time.time() - start_time) * 1000
+        logger.info(f"[CHECK] Batch {task.check_type.value} for {len(task.devices)} devices completed in {elapsed:.1f}ms")
+        return pairs
+
+    def _complete_check_result(self, task: CheckTask, result: dict, start_time: Optional[float]) -> dict:
+        """
+        Stamp a check service result with engine metadata
+
+        Args:
+            task: Executed check task
+            result: Result dict returned by the check service
+            start_time: time.time() when the check started, None to keep the
+                response_time reported by the service (batch checks)
+
+        Returns:
+            Check result dict
+        """
+        device = task.device
+        check_type = task.check_type
+
+        # Calculate response time
+        if start_time is not None:
             response_time = (time.time() - start_time) * 1000  # Convert to ms
+        else:
+            response_time = result.get('response_time') or 0
 
-            result['response_time'] = response_time
-            result['check_type'] = check_type
-            result['device_id'] = device.id
-            result['timestamp'] = datetime.utcnow().isoformat()
+        result['response_time'] = response_time
+        result['check_type'] = check_type
+        result['device_id'] = device.id
+        result.update(self._result_timestamp())
 
-            success_str = "SUCCESS" if result.get('success') else "FAILED"
-            logger.info(f"[CHECK] {check_type.value} for {device.name}: {success_str} ({response_time:.1f}ms)")
+        success_str = "SUCCESS" if result.get('success') else "FAILED"
+        logger.info(f"[CHECK] {check_type.value} for {device.name}: {success_str} ({response_time:.1f}ms)")
 
-            return result
+        return result
 
-        except Exception as e:
-            logger.error(f"[CHECK] Execution exception for {device.name} ({check_type.value}): {e}", exc_info=True)
-            return {
-                'success': False,
-                'error': str(e),
-                'check_type': check_type,
-                'device_id': device.id,
-                'timestamp': datetime.utcnow().isoformat(),
-                'response_time': (time.time() - start_time) * 1000
-            }
+    def _exception_check_result(self, task: CheckTask, error: Exception, start_time: float) -> dict:
+        """
+        Build a failed check result from an exception raised by a check service
+
+        Args:
+            task: Executed check task
+            error: Raised exception
+            start_time: time.time() when the check started
+
+        Returns:
+            Check result dict
+        """
+        device = task.device
+        check_type = task.check_type
+
+        logger.error(f"[CHECK] Execution exception for {device.name} ({check_type.value}): {error}", exc_info=True)
+        return {
+            'success': False,
+            'error': str(error),
+            'check_type': check_type,
+            'device_id': device.id,
+            **self._result_timestamp(),
+            'response_time': (time.time() - start_time) * 1000
+        }
+
+    @staticmethod
+    def _result_timestamp() -> dict:
+        """
+        Timestamp fields for a check result
+
+        Returns:
+            Dict with 'timestamp' (ISO string) and 'check_ts' (epoch ms) for the same instant
+        """
+        now = datetime.utcnow()
+        return {'timestamp': now.isoformat(), 'check_ts': to_epoch_ms(now)}
 
     def _process_check_result(self, task: CheckTask, result: dict):
         """
@@ -624,6 +956,10 @@ class MonitoringEngine:
 
             # Update statistics
             self.statistics['total_checks'] += 1
+            response_time = result.get('response_time') or 0
+            self.statistics['average_response_time'] += (
+                (response_time - self.statistics['average_response_time']) / self.statistics['total_checks']
+            )
             if success:
                 self.statistics['successful_checks'] += 1
             else:
@@ -636,6 +972,8 @@ class MonitoringEngine:
                 response_time=result.get('response_time', 0),
                 success=success
             )
+            if success and result.get('response_time') is not None:
+                device_latency.record(device.id, check_type_str, result['response_time'])
 
             # Store result in database (using batch writer for optimal performance)
             self._store_check_result(result)
@@ -718,40 +1056,16 @@ class MonitoringEngine:
         """
         Persist device updates to database for real-time UI synchronization
 
+        Changes are recorded in the write-behind device state store and flushed
+        in batches by its writer thread.
+
         Args:
             device: Device to persist
         """
-        session = db_manager.get_session()
         try:
-            # Get the device from database
-            db_device = session.query(Device).filter_by(id=device.id).first()
-
-            if db_device:
-                # Update critical fields for UI display
-                db_device.current_status = device.current_status
-                db_device.last_check_time = device.last_check_time
-                db_device.response_time = device.response_time
-                db_device.total_checks = device.total_checks
-                db_device.successful_checks = device.successful_checks
-                db_device.failed_checks = device.failed_checks
-                db_device.uptime_percentage = device.uptime_percentage
-
-                # Persist ping/web status for DEGRADED detection
-                if hasattr(device, 'ping_status'):
-                    db_device.ping_status = device.ping_status
-                if hasattr(device, 'web_status'):
-                    db_device.web_status = device.web_status
-
-                session.commit()
-                logger.debug(f"Persisted device updates to DB: {device.name} - Status: {device.current_status}, Last Check: {device.last_check_time}")
-            else:
-                logger.warning(f"Device {device.id} not found in database - cannot persist updates")
-
+            device_state_store.update(device)
         except Exception as e:
-            logger.error(f"Failed to persist device updates for {device.name}: {e}")
-            session.rollback()
-        finally:
-            session.close()
+            logger.error(f"Failed to record device updates for {device.name}: {e}")
 
     def _determine_device_status(self, device: Device, result: dict) -> str:
         """
@@ -820,6 +1134,9 @@ class MonitoringEngine:
 
         device.last_status_change = datetime.utcnow().isoformat()
 
+        # Open/close downtime incidents (written in batches by the incident store)
+        incident_store.record_transition(device.id, old_status, new_status)
+
         # TRIGGER AUTO-RECOVERY when entering DEGRADED state (PING OK + WEB FAIL)
         if new_status == 'degraded' and old_status != 'degraded':
             if device.ssh_enabled and self.auto_recovery_service:
@@ -989,7 +1306,7 @@ class MonitoringEngine:
             'check_type': task.check_type,
             'success': False,
             'error': error,
-            'timestamp': datetime.utcnow().isoformat(),
+            **self._result_timestamp(),
             'response_time': 0
         }
 
@@ -1011,5 +1328,80 @@ class MonitoringEngine:
         """Get monitoring statistics"""
         return self.statistics.copy()
 
+    def _mark_snapshot_dirty(self, device_id: Optional[int] = None):
+        """Flag the status snapshot for republishing (device_id: its state changed)"""
+        with self._snapshot_lock:
+            if device_id is not None:
+                self._snapshot_changed_ids.add(device_id)
+            self._snapshot_dirty = True
+
+    def publish_status_snapshot(self) -> StatusSnapshot:
+        """
+        Build and publish a new immutable status snapshot
+
+        Called from the result consumer thread (the thread that updates
+        device state), so each snapshot is a consistent copy. Only devices
+        changed since the previous snapshot are copied; the state dicts of
+        the others are shared with it (snapshots never modify them).
+
+        Returns:
+            The published snapshot
+        """
+        with self._snapshot_lock:
+            changed_ids, self._snapshot_changed_ids = self._snapshot_changed_ids, set()
+            self._snapshot_dirty = False
+
+        previous = self.status_snapshot.by_id if self.status_snapshot is not None else {}
+        devices = []
+        for device_id, device in list(self.devices.items()):
+            state = None if device_id in changed_ids else previous.get(device_id)
+            devices.append(state if state is not None else device_state(device))
+
+        self._snapshot_version += 1
+        snapshot = StatusSnapshot(
+            version=self._snapshot_version,
+            epoch=self._snapshot_epoch,
+            devices=devices,
+            statistics=self.get_statistics()
+        )
+        # Single reference swap - readers see the old or the new snapshot, never a mix
+        self.status_snapshot = snapshot
+        self._last_snapshot_publish = time.monotonic()
+        return snapshot
+
+    def get_engine_telemetry(self) -> dict:
+        """
+        Get engine health telemetry
+
+        Returns:
+            Dict with 'histograms' (schedule_drift, queue_wait, service_time,
+            process_time - each with 'lifetime' and sliding 'window' summaries
+            in ms), 'workers' (busy/idle ratio per check worker thread) and
+            current queue depths
+        """
+        telemetry = self.telemetry.get_snapshot()
+        with self._in_flight_lock:
+            in_flight = len(self._in_flight)
+        telemetry.update({
+            'max_workers': self.max_workers,
+            'task_queue_depth': self.task_queue.qsize(),
+            'result_queue_depth': self.result_queue.qsize(),
+            'in_flight': in_flight
+        })
+        return telemetry
+
+    def get_device_latency(self, device_id: int, check_type: Optional[CheckType] = None) -> dict:
+        """
+        Get sliding-window latency percentiles for a device
+
+        Args:
+            device_id: Device ID
+            check_type: Check type, or None for all check types of the device
+
+        Returns:
+            Dict of check type value -> p50/p95/p99/min/max/avg/count
+        """
+        return device_latency.get_percentiles(device_id, check_type.value if check_type else None)
+
     def __repr__(self):
         return f"<MonitoringEngine(devices={len(self.devices)}, running={self.running})>"
@@ -0,0 +1,138 @@
+"""
+PingMonitor Pro v2.3 - Due-Time Scheduler
+Min-heap of device due times keyed on monotonic time
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DueTimeScheduler:
+    """
+    Keeps every monitored device in a min-heap ordered by its next due time.
+
+    Rescheduling or removing a device does not touch the heap: the latest due
+    time is kept in a side table and stale heap entries are skipped when they
+    surface. Waiting threads are woken whenever an earlier due time is pushed,
+    so the scheduler sleeps exactly until the next check is due.
+    """
+
+    def __init__(self):
+        """Initialize an empty scheduler"""
+        self._heap: List[Tuple[float, int, int]] = []  # (due, seq, device_id)
+        self._due: Dict[int, float] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def schedule(self, device_id: int, due: Optional[float] = None):
+        """
+        Schedule (or reschedule) a device
+
+        Args:
+            device_id: Device ID
+            due: Monotonic due time, None for immediately
+        """
+        if due is None:
+            due = time.monotonic()
+
+        with self._cond:
+            self._due[device_id] = due
+            heapq.heappush(self._heap, (due, next(self._seq), device_id))
+
+            # Drop stale entries once they outnumber the live ones
+            if len(self._heap) > 2 * len(self._due) + 64:
+                self._compact()
+
+            if self._heap[0][2] == device_id:
+                self._cond.notify_all()
+
+    def remove(self, device_id: int):
+        """Remove a device from the schedule"""
+        with self._cond:
+            self._due.pop(device_id, None)
+
+    def clear(self):
+        """Remove all devices from the schedule"""
+        with self._cond:
+            self._heap.clear()
+            self._due.clear()
+            self._cond.notify_all()
+
+    def wakeup(self):
+        """Wake any thread blocked in pop_due (used on stop/pause)"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def next_due(self) -> Optional[float]:
+        """Get the earliest monotonic due time, or None if nothing is scheduled"""
+        with self._cond:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, timeout: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        Block until at least one device is due (or timeout) and pop all due devices
+
+        Popped devices are no longer scheduled; the caller reschedules them.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            List of (device_id, due_time) tuples, empty on timeout or wakeup
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                self._discard_stale()
+                now = time.monotonic()
+
+                if self._heap and self._heap[0][0] <= now:
+                    due_devices = []
+                    while self._heap and self._heap[0][0] <= now:
+                        due, _, device_id = heapq.heappop(self._heap)
+                        if self._due.get(device_id) == due:
+                            del self._due[device_id]
+                            due_devices.append((device_id, due))
+                    return due_devices
+
+                wait = None if deadline is None else deadline - now
+                if self._heap:
+                    until_due = self._heap[0][0] - now
+                    wait = until_due if wait is None else min(wait, until_due)
+
+                if wait is not None and wait <= 0:
+                    return []
+
+                self._cond.wait(timeout=wait)
+
+                # Any notify (earlier due time, wakeup) hands control back to the
+                # caller unless something has become due in the meantime
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > time.monotonic():
+                    return []
+
+    def _discard_stale(self):
+        """Pop stale entries off the top of the heap (caller holds the lock)"""
+        while self._heap:
+            due, _, device_id = self._heap[0]
+            if self._due.get(device_id) == due:
+                return
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        """Rebuild the heap from the live due table (caller holds the lock)"""
+        self._heap = [(due, next(self._seq), device_id) for device_id, due in self._due.items()]
+        heapq.heapify(self._heap)
+        logger.debug(f"[SCHEDULER] Heap compacted to {len(self._heap)} entries")
+
+    def __len__(self):
+        with self._cond:
+            return len(self._due)
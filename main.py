@@ -6,6 +6,7 @@ by Fabrizio Cerchia
 
 import sys
 import signal
+from functools import partial
 from pathlib import Path
 
 # Add src directory to path
@@ -21,12 +22,23 @@ import platform
 from src.core.config_manager import ConfigManager
 from src.core.logger import log_manager
 from src.core.monitoring_engine import MonitoringEngine
+from src.core.async_monitoring_engine import AsyncMonitoringEngine
 from src.models.base import db_manager
+from src.migrate_add_check_ts import migrate as migrate_check_ts
+from src.migrate_add_rollup_columns import migrate as migrate_rollup_columns
 from src.models.check_result import CheckType
-from src.services.ping_service import PingService
-from src.services.http_service import HTTPService
+from src.services.ping_service import PingService, batch_pinger
+from src.services.http_service import HTTPService, http_session_pool
 from src.services.ssh_service import SSHService
 from src.services.dns_service import DNSService
+from src.services.tcp_service import TCPService
+from src.services.statistics_service import StatisticsRollupService
+from src.services.retention_service import RetentionService
+from src.services.archive_service import check_archive
+from src.services.backup_service import BackupService
+from src.services.api_server import ApiServer
+from src.services.metrics_exporter import MetricsExporter
+from src.services.performance_service import batch_writer, device_latency
 from src.ui.main_window_v2 import MainWindowV2 as MainWindow
 from src.utils.auto_updater import AutoUpdater
 from src.ui.design_system import DesignSystem as DS
@@ -88,9 +100,24 @@ class PingMonitorApp:
 
         # Initialize database
         db_path = self.config.get('database.path')
-        db_manager.initialize(f"sqlite:///{db_path}")
+        db_manager.initialize(f"sqlite:///{db_path}", self.config.get('database.sqlite_pragmas'))
         logger.info(f"Database initialized: {db_path}")
 
+        # Upgrade databases created before check_ts / rollup bucket columns existed
+        self._upgrade_schema(Path(db_path))
+
+        # Replay check results a previous run accepted but never committed
+        batch_writer.enable_journal(Path(db_path).parent / "journal")
+        batch_writer.configure_dedup(
+            enabled=self.config.get('database.dedup_enabled', False),
+            response_band_ms=self.config.get('database.dedup_response_band_ms', 50.0),
+            keyframe_interval=self.config.get('database.dedup_keyframe_interval', 300)
+        )
+
+        # Restore per-device latency histograms saved at the last shutdown
+        self.latency_state_path = Path(db_path).parent / "latency_histograms.json.gz"
+        device_latency.load(self.latency_state_path)
+
         # AUTO-SYNC: Check and update device configuration
         self._auto_sync_updated = False
         try:
@@ -109,11 +136,83 @@ class PingMonitorApp:
 
         # Initialize monitoring engine
         max_workers = self.config.get('monitoring.concurrent_checks', 10)
-        self.monitoring_engine = MonitoringEngine(max_workers=max_workers)
+        if self.config.get('monitoring.engine', 'threaded') == 'async':
+            self.monitoring_engine = AsyncMonitoringEngine(
+                max_workers=max_workers,
+                max_concurrent=self.config.get('monitoring.async_concurrency', 500)
+            )
+        else:
+            self.monitoring_engine = MonitoringEngine(max_workers=max_workers)
 
         # Register check services
         self._register_check_services()
 
+        # Start hourly/daily statistics rollups
+        self.statistics_rollup = StatisticsRollupService(
+            interval=self.config.get('database.rollup_interval', 300)
+        )
+        self.statistics_rollup.start()
+
+        # Start retention purge of expired check results
+        self.retention_service = RetentionService(
+            retention_days=self.config.get('database.retention_days', 90),
+            statistics_retention_days=self.config.get('database.statistics_retention_days', 365)
+        )
+        self.retention_service.start()
+
+        # Start archiving old check results into columnar segments (opt-in: segments
+        # keep only check_ts/check_type/success/response_time of the raw rows)
+        if self.config.get('database.archive_enabled', False):
+            archive_after_days = self.config.get('database.archive_after_days', 7)
+            retention_days = self.config.get('database.retention_days', 90)
+            if archive_after_days < retention_days:
+                logger.warning(
+                    f"[ARCHIVE] Archive enabled: raw check results are now kept {archive_after_days} days "
+                    f"instead of retention_days={retention_days}; older rows lose error_message, "
+                    f"status_code and check_data"
+                )
+            check_archive.configure(
+                archive_dir=Path(db_path).parent / "archive",
+                archive_after_days=archive_after_days,
+                retention_days=self.config.get('database.archive_retention_days', 365)
+            )
+            check_archive.start()
+
+        # Start scheduled online backups
+        self.backup_service = None
+        if self.config.get('database.backup_enabled', True):
+            self.backup_service = BackupService(
+                db_path=db_path,
+                backup_dir=Path(db_path).parent / "backups",
+                interval=self.config.get('database.backup_interval', 86400),
+                keep=self.config.get('database.backup_keep', 7)
+            )
+            self.backup_service.start()
+
+        # Start local API listener (JSON status API, Prometheus metrics)
+        self.api_server = None
+        if self.config.get('api.enabled', False):
+            metrics_exporter = None
+            if self.config.get('api.metrics_enabled', True):
+                metrics_exporter = MetricsExporter(
+                    self.monitoring_engine,
+                    interval=self.config.get('api.metrics_interval', 5)
+                )
+            self.api_server = ApiServer(
+                host=self.config.get('api.host', '127.0.0.1'),
+                port=self.config.get('api.port', 8000),
+                metrics_exporter=metrics_exporter,
+                monitoring_engine=self.monitoring_engine if self.config.get('api.rest_enabled', True) else None,
+                enable_docs=self.config.get('api.enable_docs', True),
+                cors_enabled=self.config.get('api.cors_enabled', False),
+                cors_origins=self.config.get('api.cors_origins', ['*'])
+            )
+            try:
+                self.api_server.start()
+            except OSError as e:
+                logger.error(f"API server could not start on port {self.api_server.port}: {e}")
+                self.api_server = None
+
         # Create main window
         self.main_window = MainWindow(self.config, self.monitoring_engine)
 
@@ -140,6 +239,44 @@ class PingMonitorApp:
 
         logger.info("Application initialized successfully")
 
+    def _upgrade_schema(self, db_path: Path):
+        """
+        Add columns that newer models write but an existing database lacks
+
+        The batch writer inserts check_ts and the rollup service writes bucket
+        columns on every run; without them every flush would fail. Runs the
+        matching migration scripts, and refuses to start if columns are still
+        missing afterwards.
+        """
+        missing = db_manager.get_missing_columns()
+        if not missing:
+            return
+
+        logger.warning(f"[SCHEMA] Database is missing columns {missing} - running migrations")
+        if 'check_results.check_ts' in missing:
+            migrate_check_ts(db_path)
+        if any(column.startswith(('device_statistics.', 'system_statistics.')) for column in missing):
+            migrate_rollup_columns(db_path)
+
+        missing = db_manager.get_missing_columns()
+        if not missing:
+            logger.info("[SCHEMA] Database schema upgraded")
+            return
+
+        logger.error(f"[SCHEMA] Database schema is out of date, missing columns: {missing}")
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Icon.Critical)
+        msg.setWindowTitle("PingMonitor Pro - Database Upgrade Failed")
+        msg.setText("The database could not be upgraded to this version.")
+        msg.setInformativeText(
+            f"Missing columns: {', '.join(missing)}\n\n"
+            f"Database: {db_path}\n\n"
+            "Run the migrate_*.py scripts against this database, or restore a backup."
+        )
+        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
+        msg.exec()
+        sys.exit(1)
+
     def _load_professional_theme(self):
         """Load professional theme from QSS file"""
         try:
@@ -187,6 +324,22 @@ class PingMonitorApp:
 
     def _register_check_services(self):
         """Register all check services with monitoring engine"""
+        if isinstance(self.monitoring_engine, AsyncMonitoringEngine):
+            # Coroutine probes; SSH stays blocking and runs on the engine thread pool
+            self.monitoring_engine.register_check_service(CheckType.PING, PingService.async_check)
+            self.monitoring_engine.register_check_service(CheckType.HTTP,
+                partial(HTTPService.async_check, use_https=False))
+            self.monitoring_engine.register_check_service(CheckType.HTTPS,
+                partial(HTTPService.async_check, use_https=True))
+            self.monitoring_engine.register_check_service(CheckType.SSH, SSHService.check)
+            self.monitoring_engine.register_check_service(CheckType.DNS, DNSService.async_check)
+            self.monitoring_engine.register_check_service(CheckType.TCP, TCPService.async_check)
+
+            self._register_batch_check_services()
+
+            logger.info("Async check services registered")
+            return
+
         self.monitoring_engine.register_check_service(CheckType.PING, PingService.check)
         self.monitoring_engine.register_check_service(CheckType.HTTP,
             lambda device: HTTPService.check(device, use_https=False))
@@ -194,9 +347,20 @@ class PingMonitorApp:
             lambda device: HTTPService.check(device, use_https=True))
         self.monitoring_engine.register_check_service(CheckType.SSH, SSHService.check)
         self.monitoring_engine.register_check_service(CheckType.DNS, DNSService.check)
+        self.monitoring_engine.register_check_service(CheckType.TCP, TCPService.check)
+
+        self._register_batch_check_services()
 
         logger.info("Check services registered")
 
+    def _register_batch_check_services(self):
+        """Register fleet-level batch check services when the platform supports them"""
+        if batch_pinger.is_available():
+            self.monitoring_engine.register_batch_check_service(CheckType.PING, PingService.check_many)
+            logger.info("Batch ICMP ping enabled")
+        else:
+            logger.info("Batch ICMP ping unavailable - using per-device ping")
+
     def _signal_handler(self, signum, frame):
         """Handle system signals for graceful shutdown"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
@@ -226,6 +390,29 @@ class PingMonitorApp:
             if self.monitoring_engine.running:
                 self.monitoring_engine.stop()
 
+            # Close pooled keep-alive HTTP connections
+            http_session_pool.close_all()
+
+            # Stop local API listener
+            if self.api_server:
+                self.api_server.stop()
+
+            # Stop statistics rollups and retention purge
+            self.statistics_rollup.stop()
+            self.retention_service.stop()
+            check_archive.stop()
+            if self.backup_service:
+                self.backup_service.stop()
+
+            # Write remaining check results and close the journal
+            batch_writer.stop()
+
+            # Keep per-device latency histograms across restarts
+            try:
+                device_latency.save(self.latency_state_path)
+            except Exception as e:
+                logger.warning(f"Could not save latency histograms: {e}")
+
             # Save configuration
             self.config.save()
 
@@ -0,0 +1,147 @@
+"""
+Database migration script to add the check_ts column to check_results
+Adds an integer epoch-millisecond timestamp, backfills it from check_time in
+batches and creates the composite (device_id, check_ts) index used for
+per-device history range queries
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import sqlite3
+
+# Rows updated per backfill transaction (keeps each write lock short)
+BACKFILL_BATCH_SIZE = 10000
+
+# check_time is an ISO string in UTC; %s gives whole seconds, %f gives SS.SSS
+EPOCH_MS_EXPR = (
+    "CAST(strftime('%s', check_time) AS INTEGER) * 1000"
+    " + CAST(substr(strftime('%f', check_time), 4, 3) AS INTEGER)"
+)
+
+
+def migrate(db_path: Path = None):
+    """Add check_ts column, backfill it and create the composite index"""
+    print("\n" + "="*80)
+    print("DATABASE MIGRATION: Adding check_ts column and (device_id, check_ts) index")
+    print("="*80)
+
+    # Get database path (from user home directory)
+    if db_path is None:
+        db_path = Path.home() / ".pingmonitor" / "pingmonitor.db"
+
+    if not db_path.exists():
+        print(f"\n[ERROR] Database not found at: {db_path}")
+        print("The application has not been run yet, or database is in a different location.")
+        return False
+
+    print(f"\nDatabase location: {db_path}")
+
+    # Connect to database
+    print("\nConnecting to database...")
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    print("[OK] Connected")
+
+    try:
+        # Check if column already exists
+        print("\nChecking for existing column...")
+        cursor.execute("PRAGMA table_info(check_results)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if not columns:
+            print("\n[ERROR] check_results table not found")
+            return False
+
+        has_check_ts = 'check_ts' in columns
+        print(f"  check_ts exists: {has_check_ts}")
+
+        # Add check_ts column if it doesn't exist
+        if not has_check_ts:
+            print("\nAdding check_ts column...")
+            cursor.execute("""
+                ALTER TABLE check_results
+                ADD COLUMN check_ts BIGINT
+            """)
+            conn.commit()
+            print("[OK] check_ts column added")
+        else:
+            print("\n[SKIP] check_ts column already exists")
+
+        # Backfill in primary key ranges so the app can keep writing between batches
+        cursor.execute("SELECT MIN(id), MAX(id) FROM check_results WHERE check_ts IS NULL")
+        min_id, max_id = cursor.fetchone()
+
+        if min_id is None:
+            print("\n[SKIP] No rows to backfill")
+        else:
+            print(f"\nBackfilling check_ts for ids {min_id}..{max_id} in batches of {BACKFILL_BATCH_SIZE}...")
+            start_time = time.time()
+            updated = 0
+
+            for batch_start in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+                batch_end = batch_start + BACKFILL_BATCH_SIZE - 1
+                cursor.execute(f"""
+                    UPDATE check_results
+                    SET check_ts = {EPOCH_MS_EXPR}
+                    WHERE id BETWEEN ? AND ? AND check_ts IS NULL
+                """, (batch_start, batch_end))
+                conn.commit()
+                updated += cursor.rowcount
+
+                if (batch_start - min_id) // BACKFILL_BATCH_SIZE % 10 == 0:
+                    print(f"  ... {updated} rows updated (id <= {batch_end})")
+
+            print(f"[OK] Backfilled {updated} rows in {time.time() - start_time:.1f}s")
+
+        # Create index after backfill (building it once is faster than maintaining it per update)
+        print("\nCreating index ix_check_results_device_ts...")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_check_results_device_ts
+            ON check_results (device_id, check_ts)
+        """)
+        conn.commit()
+        print("[OK] Index created")
+
+        # Verify migration
+        print("\nVerifying migration...")
+        cursor.execute("SELECT COUNT(*) FROM check_results WHERE check_ts IS NULL")
+        missing = cursor.fetchone()[0]
+        cursor.execute("PRAGMA index_list(check_results)")
+        indexes = [row[1] for row in cursor.fetchall()]
+
+        if missing == 0 and 'ix_check_results_device_ts' in indexes:
+            print("[OK] check_ts populated and index verified")
+            print("\n" + "="*80)
+            print("MIGRATION SUCCESSFUL")
+            print("="*80)
+            return True
+        else:
+            print("[ERROR] Verification failed")
+            print(f"  rows without check_ts: {missing}")
+            print(f"  index present: {'ix_check_results_device_ts' in indexes}")
+            return False
+
+    except sqlite3.Error as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        cursor.close()
+        conn.close()
+        print("\nDatabase connection closed")
+
+
+if __name__ == "__main__":
+    success = migrate(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
+    if success:
+        print("\nPer-device history queries now use the (device_id, check_ts) index.")
+        sys.exit(0)
+    else:
+        print("\nMigration failed. Please check the error messages above.")
+        sys.exit(1)
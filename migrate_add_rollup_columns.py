@@ -0,0 +1,110 @@
+"""
+Database migration script to add rollup bucket columns to the statistics tables
+Adds period/bucket_ts (and uptime_seconds, response_time_count) to
+device_statistics and system_statistics, plus the unique bucket indexes used by the rollup service
+"""
+
+import sys
+from pathlib import Path
+
+import sqlite3
+
+# (table, column, SQL type)
+COLUMNS = [
+    ('device_statistics', 'period', 'VARCHAR(10)'),
+    ('device_statistics', 'bucket_ts', 'BIGINT'),
+    ('device_statistics', 'uptime_seconds', 'INTEGER'),
+    ('device_statistics', 'response_time_count', 'INTEGER'),
+    ('system_statistics', 'period', 'VARCHAR(10)'),
+    ('system_statistics', 'bucket_ts', 'BIGINT'),
+]
+
+INDEXES = [
+    ('ix_device_statistics_bucket', 'device_statistics', 'device_id, period, bucket_ts'),
+    ('ix_system_statistics_bucket', 'system_statistics', 'period, bucket_ts'),
+]
+
+
+def migrate(db_path: Path = None):
+    """Add rollup bucket columns and indexes to the statistics tables"""
+    print("\n" + "="*80)
+    print("DATABASE MIGRATION: Adding rollup bucket columns to statistics tables")
+    print("="*80)
+
+    # Get database path (from user home directory)
+    if db_path is None:
+        db_path = Path.home() / ".pingmonitor" / "pingmonitor.db"
+
+    if not db_path.exists():
+        print(f"\n[ERROR] Database not found at: {db_path}")
+        print("The application has not been run yet, or database is in a different location.")
+        return False
+
+    print(f"\nDatabase location: {db_path}")
+
+    # Connect to database
+    print("\nConnecting to database...")
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    print("[OK] Connected")
+
+    try:
+        # Add missing columns
+        for table, column, column_type in COLUMNS:
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = [row[1] for row in cursor.fetchall()]
+
+            if column not in columns:
+                print(f"\nAdding {table}.{column} column...")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                print(f"[OK] {table}.{column} column added")
+            else:
+                print(f"\n[SKIP] {table}.{column} column already exists")
+
+        # Create bucket indexes
+        for index, table, columns in INDEXES:
+            print(f"\nCreating index {index}...")
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({columns})")
+            print(f"[OK] {index} created")
+
+        # Commit changes
+        conn.commit()
+        print("\n[OK] Migration committed successfully")
+
+        # Verify columns were added
+        print("\nVerifying migration...")
+        missing = []
+        for table, column, _ in COLUMNS:
+            cursor.execute(f"PRAGMA table_info({table})")
+            if column not in [row[1] for row in cursor.fetchall()]:
+                missing.append(f"{table}.{column}")
+
+        if not missing:
+            print("[OK] All rollup columns verified in database schema")
+            print("\n" + "="*80)
+            print("MIGRATION SUCCESSFUL")
+            print("="*80)
+            return True
+        else:
+            print(f"[ERROR] Column verification failed: {', '.join(missing)}")
+            return False
+
+    except sqlite3.Error as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        cursor.close()
+        conn.close()
+        print("\nDatabase connection closed")
+
+
+if __name__ == "__main__":
+    success = migrate(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
+    if success:
+        print("\nHourly/daily statistics rollups can now be stored.")
+        sys.exit(0)
+    else:
+        print("\nMigration failed. Please check the error messages above.")
+        sys.exit(1)
@@ -0,0 +1,124 @@
+"""
+Database migration script to convert check_data to compact JSON
+Older versions stored check_data as a Python repr string (str(dict)); this
+rewrites those rows in the JSON format understood by CheckResult.get_data()
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path (as main.py: the package directory is imported as "src")
+src_dir = Path(__file__).parent
+sys.path.insert(0, str(src_dir.parent))
+
+from src.models.check_result import encode_check_data, decode_check_data, ZLIB_JSON_PREFIX, ZLIB_MSGPACK_PREFIX
+import json
+import sqlite3
+
+# Rows converted per transaction (keeps each write lock short)
+BATCH_SIZE = 5000
+
+
+def _is_current_format(value: str) -> bool:
+    """Whether a check_data value is already JSON or compressed"""
+    if value.startswith((ZLIB_JSON_PREFIX, ZLIB_MSGPACK_PREFIX)):
+        return True
+    try:
+        json.loads(value)
+        return True
+    except ValueError:
+        return False
+
+
+def migrate(db_path: Path = None):
+    """Convert legacy repr check_data rows to compact JSON"""
+    print("\n" + "="*80)
+    print("DATABASE MIGRATION: Converting check_data to compact JSON")
+    print("="*80)
+
+    # Get database path (from user home directory)
+    if db_path is None:
+        db_path = Path.home() / ".pingmonitor" / "pingmonitor.db"
+
+    if not db_path.exists():
+        print(f"\n[ERROR] Database not found at: {db_path}")
+        print("The application has not been run yet, or database is in a different location.")
+        return False
+
+    print(f"\nDatabase location: {db_path}")
+
+    # Connect to database
+    print("\nConnecting to database...")
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    print("[OK] Connected")
+
+    try:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM check_results")
+        min_id, max_id = cursor.fetchone()
+
+        if min_id is None:
+            print("\n[SKIP] No check results to convert")
+            return True
+
+        print(f"\nConverting ids {min_id}..{max_id} in batches of {BATCH_SIZE}...")
+        start_time = time.time()
+        converted = 0
+        unreadable = 0
+
+        for batch_start in range(min_id, max_id + 1, BATCH_SIZE):
+            cursor.execute("""
+                SELECT id, check_data FROM check_results
+                WHERE id >= ? AND id < ? AND check_data IS NOT NULL
+            """, (batch_start, batch_start + BATCH_SIZE))
+
+            updates = []
+            for row_id, value in cursor.fetchall():
+                if _is_current_format(value):
+                    continue
+
+                data = decode_check_data(value)
+                if not data and value.strip() != '{}':
+                    # Not a literal (e.g. repr of datetime objects) - keep the text
+                    data = {'legacy': value}
+                    unreadable += 1
+
+                updates.append((encode_check_data(data), row_id))
+
+            if updates:
+                cursor.executemany("UPDATE check_results SET check_data = ? WHERE id = ?", updates)
+                conn.commit()
+                converted += len(updates)
+
+            if (batch_start - min_id) // BATCH_SIZE % 20 == 0:
+                print(f"  ... {converted} rows converted (id < {batch_start + BATCH_SIZE})")
+
+        print(f"[OK] Converted {converted} rows in {time.time() - start_time:.1f}s")
+        if unreadable:
+            print(f"[WARNING] {unreadable} rows could not be parsed and were kept as {{\"legacy\": <text>}}")
+
+        print("\n" + "="*80)
+        print("MIGRATION SUCCESSFUL")
+        print("="*80)
+        return True
+
+    except sqlite3.Error as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        cursor.close()
+        conn.close()
+        print("\nDatabase connection closed")
+
+
+if __name__ == "__main__":
+    success = migrate(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
+    if success:
+        print("\ncheck_data is now stored as compact JSON.")
+        sys.exit(0)
+    else:
+        print("\nMigration failed. Please check the error messages above.")
+        sys.exit(1)
@@ -0,0 +1,94 @@
+"""
+Database migration script to switch an existing database to incremental auto_vacuum
+auto_vacuum can only be changed on an existing database by a full VACUUM, so
+databases created before the SQLite profile enabled it keep auto_vacuum=NONE
+and never shrink after retention purges. Run with PingMonitor Pro closed:
+VACUUM rewrites the whole file and needs free disk space of about its size.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import sqlite3
+
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_MODES = {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}
+
+
+def migrate(db_path: Path = None):
+    """Set auto_vacuum=INCREMENTAL and rebuild the database with VACUUM"""
+    print("\n" + "="*80)
+    print("DATABASE MIGRATION: Enabling incremental auto_vacuum")
+    print("="*80)
+
+    # Get database path (from user home directory)
+    if db_path is None:
+        db_path = Path.home() / ".pingmonitor" / "pingmonitor.db"
+
+    if not db_path.exists():
+        print(f"\n[ERROR] Database not found at: {db_path}")
+        print("The application has not been run yet, or database is in a different location.")
+        return False
+
+    print(f"\nDatabase location: {db_path}")
+
+    # Connect to database (autocommit: VACUUM cannot run inside a transaction)
+    print("\nConnecting to database...")
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    cursor = conn.cursor()
+    print("[OK] Connected")
+
+    try:
+        cursor.execute("PRAGMA auto_vacuum")
+        mode = cursor.fetchone()[0]
+        print(f"\n  auto_vacuum: {AUTO_VACUUM_MODES.get(mode, mode)}")
+
+        if mode == 2:
+            print("\n[SKIP] auto_vacuum is already INCREMENTAL")
+            return True
+
+        size_before = db_path.stat().st_size
+        print(f"\nRebuilding database ({size_before / 1048576:.1f} MB) with VACUUM...")
+        start_time = time.time()
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+        print(f"[OK] Rebuilt in {time.time() - start_time:.1f}s "
+              f"({db_path.stat().st_size / 1048576:.1f} MB)")
+
+        # Verify migration
+        print("\nVerifying migration...")
+        cursor.execute("PRAGMA auto_vacuum")
+        mode = cursor.fetchone()[0]
+
+        if mode == 2:
+            print("[OK] auto_vacuum is INCREMENTAL")
+            print("\n" + "="*80)
+            print("MIGRATION SUCCESSFUL")
+            print("="*80)
+            return True
+        else:
+            print("[ERROR] Verification failed")
+            print(f"  auto_vacuum: {AUTO_VACUUM_MODES.get(mode, mode)}")
+            return False
+
+    except sqlite3.Error as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        if "locked" in str(e).lower() or "busy" in str(e).lower():
+            print("Close PingMonitor Pro and run the migration again.")
+        return False
+
+    finally:
+        cursor.close()
+        conn.close()
+        print("\nDatabase connection closed")
+
+
+if __name__ == "__main__":
+    success = migrate(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
+    if success:
+        print("\nRetention purges now return free pages to the filesystem.")
+        sys.exit(0)
+    else:
+        print("\nMigration failed. Please check the error messages above.")
+        sys.exit(1)
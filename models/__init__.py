@@ -3,17 +3,21 @@ PingMonitor Pro v2.0 - Database Models
 """
 
 from .device import Device, DeviceGroup
-from .check_result import CheckResult, CheckType
+from .check_result import CheckResult, CheckType, LatestCheckResult
 from .alert import Alert, AlertChannel
-from .statistics import DeviceStatistics, SystemStatistics
+from .incident import Incident
+from .statistics import DeviceStatistics, SystemStatistics, RollupWatermark
 
 __all__ = [
     'Device',
     'DeviceGroup',
     'CheckResult',
     'CheckType',
+    'LatestCheckResult',
     'Alert',
     'AlertChannel',
+    'Incident',
     'DeviceStatistics',
-    'SystemStatistics'
+    'SystemStatistics',
+    'RollupWatermark'
 ]
@@ -3,7 +3,8 @@ PingMonitor Pro v2.0 - Database Base
 """
 
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, DateTime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import create_engine, event, inspect, Column, Integer, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
 from pathlib import Path
@@ -21,24 +22,54 @@ class TimestampMixin:
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
+# SQLite performance profile applied to every connection
+# WAL lets the UI read while the writer commits; NORMAL sync is durable in WAL mode
+SQLITE_PRAGMAS = {
+    'auto_vacuum': 'INCREMENTAL',  # New databases only; existing ones: migrate_enable_incremental_vacuum.py
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,  # 256MB memory-mapped I/O
+    'cache_size': -65536,  # 64MB page cache (negative = KiB)
+    'busy_timeout': 5000,  # Wait up to 5s on a locked database instead of failing
+    'temp_store': 'MEMORY'
+}
+
+
+def _apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, Any]):
+    """Apply PRAGMA settings to a raw SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
 class DatabaseManager:
     """Database connection and session manager"""
 
     _instance = None
     _engine = None
     _session_factory = None
+    _write_engine = None
+    _write_session_factory = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def initialize(self, database_url: str = None):
+    def initialize(self, database_url: str = None, sqlite_pragmas: Optional[Dict[str, Any]] = None):
         """
         Initialize database connection
 
+        For file-backed SQLite the performance profile (SQLITE_PRAGMAS) is applied
+        on connect, and a separate single-connection engine serves background
+        writers (see get_write_session) while reads use the pool.
+
         Args:
             database_url: SQLAlchemy database URL
+            sqlite_pragmas: Overrides merged into SQLITE_PRAGMAS
         """
         if database_url is None:
             db_path = Path.home() / ".pingmonitor" / "pingmonitor.db"
@@ -61,6 +92,32 @@ class DatabaseManager:
             sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
         )
 
+        is_file_sqlite = database_url.startswith('sqlite') and ':memory:' not in database_url
+        if is_file_sqlite:
+            pragmas = dict(SQLITE_PRAGMAS)
+            pragmas.update(sqlite_pragmas or {})
+
+            # Single writer connection: background writers queue here instead of
+            # contending for the SQLite write lock from many pooled connections
+            self._write_engine = create_engine(
+                database_url,
+                echo=False,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=60,
+                connect_args={'check_same_thread': False}
+            )
+
+            for engine in (self._engine, self._write_engine):
+                event.listen(engine, 'connect',
+                             lambda dbapi_connection, _record: _apply_sqlite_pragmas(dbapi_connection, pragmas))
+
+            logger.info(f"SQLite profile applied: {pragmas}")
+        else:
+            self._write_engine = self._engine
+
+        self._write_session_factory = sessionmaker(bind=self._write_engine, autocommit=False, autoflush=False)
+
         # Create all tables
         Base.metadata.create_all(self._engine)
         logger.info("Database initialized successfully")
@@ -71,10 +128,47 @@ class DatabaseManager:
             raise RuntimeError("Database not initialized. Call initialize() first.")
         return self._session_factory()
 
+    def get_write_session(self):
+        """
+        Get a session on the dedicated writer connection
+
+        Used by background writers (batch writer, device state store). Only one
+        such session can hold the connection at a time; others wait for it.
+        """
+        if self._write_session_factory is None:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+        return self._write_session_factory()
+
+    def get_missing_columns(self) -> List[str]:
+        """
+        List model columns absent from tables that already exist
+
+        create_all() creates missing tables but never alters existing ones, so a
+        database from an older version keeps its old columns until migrated.
+
+        Returns:
+            "table.column" names declared on the models but missing in the database
+        """
+        if self._engine is None:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+
+        inspector = inspect(self._engine)
+        existing_tables = set(inspector.get_table_names())
+        missing = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            missing.extend(f"{table.name}.{column.name}" for column in table.columns
+                           if column.name not in existing_columns)
+        return missing
+
     def close(self):
         """Close database connection"""
         if self._session_factory:
             self._session_factory.remove()
+        if self._write_engine is not None and self._write_engine is not self._engine:
+            self._write_engine.dispose()
         if self._engine:
             self._engine.dispose()
         logger.info("Database connection closed")
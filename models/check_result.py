@@ -2,11 +2,158 @@
 PingMonitor Pro v2.0 - Check Result Models
 """
 
+import ast
+import base64
 import enum
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, Enum, Text
+import json
+import zlib
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, TypedDict, Union
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Float, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+
+# check_data serialization
+# Compact JSON text (queryable with SQLite json_extract). Payloads longer than
+# CHECK_DATA_COMPRESS_THRESHOLD are stored as prefix + base64(zlib(JSON)), which
+# needs no optional dependency. zlib(msgpack) rows are only read (msgpack is
+# optional and not bundled, so new rows never use it).
+CHECK_DATA_COMPRESS_THRESHOLD = 1024
+ZLIB_JSON_PREFIX = 'zj:'
+ZLIB_MSGPACK_PREFIX = 'zm:'
+
+
+class SSLInfo(TypedDict, total=False):
+    """Certificate details recorded by HTTPS checks"""
+    subject: Dict[str, str]
+    issuer: Dict[str, str]
+    version: int
+    not_before: str
+    not_after: str
+    days_until_expiry: int
+    expired: bool
+    error: str
+
+
+class CheckData(TypedDict, total=False):
+    """Check-specific data stored in CheckResult.check_data"""
+    # Ping
+    min_rtt: float
+    avg_rtt: float
+    max_rtt: float
+    jitter: float
+    # HTTP/HTTPS
+    ssl_info: Optional[SSLInfo]
+    redirects: int
+    final_url: str
+    headers: Dict[str, str]
+    # DNS
+    ip_addresses: List[str]
+    nameservers: List[str]
+    # SSH/TCP
+    server_version: str
+    port_open: bool
+    authentication: str
+    port: int
+
+
+def _json_default(value: Any) -> Any:
+    """Convert values JSON cannot encode natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return str(value)
+
+
+def encode_check_data(data: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Serialize check data for the check_data column
+
+    Args:
+        data: Check result 'data' dict
+
+    Returns:
+        Compact JSON (or compressed) text, None for empty data
+    """
+    if not data:
+        return None
+
+    text = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+    if len(text) <= CHECK_DATA_COMPRESS_THRESHOLD:
+        return text
+
+    return ZLIB_JSON_PREFIX + base64.b64encode(zlib.compress(text.encode('utf-8'), 6)).decode('ascii')
+
+
+def decode_check_data(value: Optional[str]) -> CheckData:
+    """
+    Deserialize the check_data column
+
+    Understands compact JSON, the compressed forms and legacy Python repr
+    strings written by older versions.
+
+    Args:
+        value: Stored check_data text
+
+    Returns:
+        Check data dict (empty if missing or unreadable)
+    """
+    if not value:
+        return {}
+
+    try:
+        if value.startswith(ZLIB_JSON_PREFIX):
+            return json.loads(zlib.decompress(base64.b64decode(value[len(ZLIB_JSON_PREFIX):])))
+        if value.startswith(ZLIB_MSGPACK_PREFIX):
+            if not MSGPACK_AVAILABLE:
+                return {}
+            return msgpack.unpackb(zlib.decompress(base64.b64decode(value[len(ZLIB_MSGPACK_PREFIX):])))
+        return json.loads(value)
+    except (ValueError, zlib.error):
+        pass
+
+    # Legacy str(dict) rows
+    try:
+        data = ast.literal_eval(value)
+        return data if isinstance(data, dict) else {}
+    except (ValueError, SyntaxError):
+        return {}
+
+
+def to_epoch_ms(value: Union[datetime, str]) -> int:
+    """
+    Convert a naive UTC datetime (or its ISO string) to epoch milliseconds
+
+    Args:
+        value: datetime.utcnow()-style datetime or ISO format string
+
+    Returns:
+        Milliseconds since the Unix epoch
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def from_epoch_ms(value: int) -> datetime:
+    """Convert epoch milliseconds to a naive UTC datetime"""
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).replace(tzinfo=None)
+
 
 class CheckType(enum.Enum):
     """Types of checks"""
@@ -24,6 +171,10 @@ class CheckResult(Base, TimestampMixin):
     """Check result model for storing monitoring check results"""
 
     __tablename__ = 'check_results'
+    __table_args__ = (
+        # Per-device history range scans: WHERE device_id = ? AND check_ts BETWEEN ? AND ?
+        Index('ix_check_results_device_ts', 'device_id', 'check_ts'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -31,6 +182,7 @@ class CheckResult(Base, TimestampMixin):
     # Check information
     check_type = Column(Enum(CheckType), nullable=False)
     check_time = Column(String(30), nullable=False, index=True)  # ISO format
+    check_ts = Column(BigInteger)  # Epoch milliseconds (UTC), see migrate_add_check_ts.py
     success = Column(Boolean, nullable=False, index=True)
 
     # Response metrics
@@ -58,9 +210,62 @@ class CheckResult(Base, TimestampMixin):
             'device_id': self.device_id,
             'check_type': self.check_type.value if self.check_type else None,
             'check_time': self.check_time,
+            'check_ts': self.check_ts,
             'success': self.success,
             'response_time': self.response_time,
             'status_code': self.status_code,
             'error_message': self.error_message,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+    def get_data(self) -> CheckData:
+        """Decode check_data into a CheckData dict"""
+        return decode_check_data(self.check_data)
+
+    def set_data(self, data: Optional[Dict[str, Any]]):
+        """Encode a check data dict into check_data"""
+        self.check_data = encode_check_data(data)
+
+
+class LatestCheckResult(Base, TimestampMixin):
+    """
+    Most recent check result per device and check type
+
+    Upserted by the batch writer in the same transaction as the check_results
+    insert, so current state can be read without touching check_results.
+    """
+
+    __tablename__ = 'latest_check_results'
+
+    device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), primary_key=True)
+    check_type = Column(Enum(CheckType), primary_key=True)
+
+    check_time = Column(String(30), nullable=False)  # ISO format
+    check_ts = Column(BigInteger, nullable=False)  # Epoch milliseconds (UTC)
+    success = Column(Boolean, nullable=False)
+    response_time = Column(Float)  # milliseconds
+    status_code = Column(Integer)
+    error_message = Column(Text)
+    check_data = Column(Text)  # See encode_check_data
+
+    def __repr__(self):
+        return f"<LatestCheckResult(device_id={self.device_id}, type={self.check_type.value}, success={self.success})>"
+
+    def to_dict(self):
+        """Convert latest check result to dictionary"""
+        return {
+            'device_id': self.device_id,
+            'check_type': self.check_type.value if self.check_type else None,
+            'check_time': self.check_time,
+            'check_ts': self.check_ts,
+            'success': self.success,
+            'response_time': self.response_time,
+            'status_code': self.status_code,
+            'error_message': self.error_message,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def get_data(self) -> CheckData:
+        """Decode check_data into a CheckData dict"""
+        return decode_check_data(self.check_data)
+
@@ -0,0 +1,55 @@
+"""
+PingMonitor Pro v2.3 - Incident Model
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Index
+from .base import Base, TimestampMixin
+
+
+class Incident(Base, TimestampMixin):
+    """
+    Downtime interval derived from device status transitions
+
+    Opened when a device leaves 'online' for 'offline' or 'degraded' and
+    closed when it returns to 'online'. Written by services/incident_service.py.
+    """
+
+    __tablename__ = 'incidents'
+    __table_args__ = (
+        Index('ix_incidents_device_start', 'device_id', 'start_ts'),
+        Index('ix_incidents_device_end', 'device_id', 'end_ts'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=False)
+
+    # Interval (epoch milliseconds, UTC); end_ts is NULL while the incident is open
+    start_ts = Column(BigInteger, nullable=False)
+    end_ts = Column(BigInteger)
+
+    # Cause of the transition that opened the incident: ping (offline) or web (degraded)
+    cause = Column(String(20), nullable=False)
+    # Worst status seen during the incident: offline outranks degraded
+    status = Column(String(20), nullable=False)
+
+    def __repr__(self):
+        return f"<Incident(id={self.id}, device_id={self.device_id}, cause='{self.cause}', open={self.end_ts is None})>"
+
+    @property
+    def duration_seconds(self):
+        """Incident duration in seconds (None while open)"""
+        if self.end_ts is None:
+            return None
+        return (self.end_ts - self.start_ts) / 1000
+
+    def to_dict(self):
+        """Convert incident to dictionary"""
+        return {
+            'id': self.id,
+            'device_id': self.device_id,
+            'start_ts': self.start_ts,
+            'end_ts': self.end_ts,
+            'cause': self.cause,
+            'status': self.status,
+            'duration_seconds': self.duration_seconds
+        }
@@ -2,7 +2,7 @@
 PingMonitor Pro v2.0 - Statistics Models
 """
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -11,11 +11,18 @@ class DeviceStatistics(Base, TimestampMixin):
     """Device statistics model for time-series data"""
 
     __tablename__ = 'device_statistics'
+    __table_args__ = (
+        Index('ix_device_statistics_bucket', 'device_id', 'period', 'bucket_ts', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     device_id = Column(Integer, ForeignKey('devices.id', ondelete='CASCADE'), nullable=False, index=True)
     timestamp = Column(String(30), nullable=False, index=True)  # ISO format
 
+    # Rollup bucket (see services/statistics_service.py)
+    period = Column(String(10))  # hour, day
+    bucket_ts = Column(BigInteger)  # Bucket start, epoch milliseconds (UTC)
+
     # Aggregated metrics (for the time period)
     checks_performed = Column(Integer, default=0)
     checks_successful = Column(Integer, default=0)
@@ -25,9 +32,11 @@ class DeviceStatistics(Base, TimestampMixin):
     avg_response_time = Column(Float)
     min_response_time = Column(Float)
     max_response_time = Column(Float)
+    response_time_count = Column(Integer)  # Successful checks with a response time (avg divisor)
 
     # Availability
     uptime_percentage = Column(Float)
+    uptime_seconds = Column(Integer)
     downtime_seconds = Column(Integer)
 
     # Status distribution (JSON)
@@ -45,6 +54,8 @@ class DeviceStatistics(Base, TimestampMixin):
             'id': self.id,
             'device_id': self.device_id,
             'timestamp': self.timestamp,
+            'period': self.period,
+            'bucket_ts': self.bucket_ts,
             'checks_performed': self.checks_performed,
             'checks_successful': self.checks_successful,
             'checks_failed': self.checks_failed,
@@ -52,6 +63,7 @@ class DeviceStatistics(Base, TimestampMixin):
             'min_response_time': self.min_response_time,
             'max_response_time': self.max_response_time,
             'uptime_percentage': self.uptime_percentage,
+            'uptime_seconds': self.uptime_seconds,
             'downtime_seconds': self.downtime_seconds
         }
 
@@ -60,10 +72,17 @@ class SystemStatistics(Base, TimestampMixin):
     """System-wide statistics"""
 
     __tablename__ = 'system_statistics'
+    __table_args__ = (
+        Index('ix_system_statistics_bucket', 'period', 'bucket_ts', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(String(30), nullable=False, index=True)
 
+    # Rollup bucket (see services/statistics_service.py)
+    period = Column(String(10))  # hour, day
+    bucket_ts = Column(BigInteger)  # Bucket start, epoch milliseconds (UTC)
+
     # Overall metrics
     total_devices = Column(Integer, default=0)
     online_devices = Column(Integer, default=0)
@@ -97,6 +116,8 @@ class SystemStatistics(Base, TimestampMixin):
         return {
             'id': self.id,
             'timestamp': self.timestamp,
+            'period': self.period,
+            'bucket_ts': self.bucket_ts,
             'total_devices': self.total_devices,
             'online_devices': self.online_devices,
             'offline_devices': self.offline_devices,
@@ -108,3 +129,15 @@ class SystemStatistics(Base, TimestampMixin):
             'cpu_usage': self.cpu_usage,
             'memory_usage': self.memory_usage
         }
+
+
+class RollupWatermark(Base, TimestampMixin):
+    """Progress marker for incremental jobs that consume check_results"""
+
+    __tablename__ = 'rollup_watermarks'
+
+    name = Column(String(50), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)  # Highest check_results.id (or epoch ms) processed
+
+    def __repr__(self):
+        return f"<RollupWatermark(name='{self.name}', last_id={self.last_id})>"
@@ -6,5 +6,6 @@ from .ping_service import PingService
 from .http_service import HTTPService
 from .ssh_service import SSHService
 from .dns_service import DNSService
+from .tcp_service import TCPService
 
-__all__ = ['PingService', 'HTTPService', 'SSHService', 'DNSService']
+__all__ = ['PingService', 'HTTPService', 'SSHService', 'DNSService', 'TCPService']
@@ -0,0 +1,276 @@
+"""
+PingMonitor Pro v2.3 - API Server
+Local HTTP listener for the metrics endpoint and the read-only JSON API
+"""
+
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+import logging
+
+from ..models.check_result import CheckType, to_epoch_ms
+from .archive_service import check_archive
+from .history_service import HistoryService
+from .metrics_exporter import MetricsExporter, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .performance_service import batch_writer
+
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+DEVICE_PATH = re.compile(r'^/devices/(\d+)$')
+HISTORY_PATH = re.compile(r'^/devices/(\d+)/history$')
+
+# History requests: default range and maximum rows returned
+DEFAULT_HISTORY_MS = 3600 * 1000
+MAX_HISTORY_ROWS = 10000
+
+ENDPOINTS = {
+    '/devices': 'All monitored devices (snapshot, ETag)',
+    '/devices/{id}': 'One device (snapshot, ETag)',
+    '/devices/{id}/history?start=&end=&check_type=&limit=': 'Check results in a time range (epoch ms or ISO 8601)',
+    '/summary': 'Status counts and engine statistics (snapshot, ETag)',
+    '/metrics': 'Prometheus metrics'
+}
+
+
+class ApiError(Exception):
+    """Client error returned as a JSON error body"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Dispatches GET requests to the owning ApiServer"""
+
+    server_version = 'PingMonitorPro/2.3'
+
+    def do_GET(self):
+        self.server.api.handle_get(self)
+
+    def log_message(self, format, *args):
+        logger.debug(f"[API] {self.address_string()} - {format % args}")
+
+
+class ApiServer:
+    """
+    Lightweight HTTP server on a background thread (config section 'api')
+
+    Uses the standard library ThreadingHTTPServer, so no web framework is
+    required. Current-state endpoints (/devices, /devices/{id}, /summary)
+    are served from the engine's immutable StatusSnapshot with its version
+    as ETag: a poll with a matching If-None-Match gets 304 without building
+    a body or touching the database. Only /devices/{id}/history reads the
+    database (and archive segments).
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8000,
+                 metrics_exporter: Optional[MetricsExporter] = None,
+                 monitoring_engine=None, enable_docs: bool = True,
+                 cors_enabled: bool = False, cors_origins=None):
+        """
+        Initialize API server
+
+        Args:
+            host: Listen address
+            port: Listen port
+            metrics_exporter: Exporter serving /metrics (None = endpoint disabled)
+            monitoring_engine: Engine publishing status snapshots (None = JSON API disabled)
+            enable_docs: Serve the endpoint list at /
+            cors_enabled: Send Access-Control-Allow-Origin headers
+            cors_origins: Allowed origins ('*' allows any)
+        """
+        self.host = host
+        self.port = port
+        self.metrics_exporter = metrics_exporter
+        self.monitoring_engine = monitoring_engine
+        self.enable_docs = enable_docs
+        self.cors_enabled = cors_enabled
+        self.cors_origins = cors_origins or ['*']
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Bind and start serving on a daemon thread"""
+        if self._server is not None:
+            return
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.api = self
+
+        if self.metrics_exporter:
+            self.metrics_exporter.start()
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name='api-server')
+        self._thread.start()
+        logger.info(f"API server listening on http://{self.host}:{self.port}")
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        logger.info("API server stopped")
+
+    def handle_get(self, request: BaseHTTPRequestHandler):
+        """
+        Route a GET request
+
+        Args:
+            request: Request handler to respond on
+        """
+        url = urlsplit(request.path)
+        path = url.path.rstrip('/') or '/'
+
+        try:
+            if path == '/metrics' and self.metrics_exporter:
+                self._send(request, 200, self.metrics_exporter.get_body(), METRICS_CONTENT_TYPE)
+            elif path == '/' and self.enable_docs:
+                self._send_json(request, 200, {'endpoints': ENDPOINTS})
+            elif self.monitoring_engine is not None:
+                self._handle_json_api(request, path, parse_qs(url.query))
+            else:
+                raise ApiError(404, 'Not found')
+        except ApiError as e:
+            self._send_json(request, e.status, {'error': str(e)})
+        except Exception as e:
+            logger.error(f"[API] Error handling {request.path}: {e}", exc_info=True)
+            self._send_json(request, 500, {'error': 'Internal server error'})
+
+    def _handle_json_api(self, request: BaseHTTPRequestHandler, path: str, query: dict):
+        """Route JSON API requests"""
+        history_match = HISTORY_PATH.match(path)
+        if history_match:
+            self._send_json(request, 200, self._get_history(int(history_match.group(1)), query))
+            return
+
+        snapshot = self.monitoring_engine.status_snapshot
+        if snapshot is None:
+            raise ApiError(503, 'Status snapshot not available yet')
+
+        device_match = DEVICE_PATH.match(path)
+        if path == '/devices':
+            build_body = snapshot.devices_body
+        elif path == '/summary':
+            build_body = snapshot.summary_body
+        elif device_match:
+            device_id = int(device_match.group(1))
+            if device_id not in snapshot.by_id:
+                raise ApiError(404, f'Device {device_id} not found')
+            build_body = partial(snapshot.device_body, device_id)
+        else:
+            raise ApiError(404, 'Not found')
+
+        headers = {'ETag': snapshot.etag, 'Cache-Control': 'no-cache'}
+        if self._etag_matches(request.headers.get('If-None-Match'), snapshot.etag):
+            self._send(request, 304, b'', None, headers)
+        else:
+            self._send(request, 200, build_body(), JSON_CONTENT_TYPE, headers)
+
+    @staticmethod
+    def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Whether an If-None-Match header matches etag (weak comparison)"""
+        if not if_none_match:
+            return False
+        candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+        return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+    @staticmethod
+    def _parse_time(value: Optional[str], default: int) -> int:
+        """Epoch ms or ISO 8601 (UTC) query value -> epoch ms"""
+        if not value:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return to_epoch_ms(datetime.fromisoformat(value))
+        except ValueError:
+            raise ApiError(400, f'Invalid time: {value}')
+
+    def _get_history(self, device_id: int, query: dict) -> dict:
+        """
+        Check results of a device in a time range
+
+        Query: start/end (epoch ms or ISO 8601, default last hour), check_type,
+        limit (max MAX_HISTORY_ROWS). With change-only storage the history is
+        expanded back to regular samples.
+        """
+        now_ms = int(time.time() * 1000)
+        end_ms = self._parse_time(query.get('end', [None])[0], now_ms)
+        start_ms = self._parse_time(query.get('start', [None])[0], end_ms - DEFAULT_HISTORY_MS)
+        if start_ms >= end_ms:
+            raise ApiError(400, 'start must be before end')
+
+        check_type = None
+        if query.get('check_type'):
+            try:
+                check_type = CheckType(query['check_type'][0].lower())
+            except ValueError:
+                raise ApiError(400, f"Invalid check_type: {query['check_type'][0]}")
+
+        try:
+            limit = int(query.get('limit', [MAX_HISTORY_ROWS])[0])
+        except ValueError:
+            raise ApiError(400, 'Invalid limit')
+        if limit < 1:
+            raise ApiError(400, 'limit must be at least 1')
+        limit = min(limit, MAX_HISTORY_ROWS)
+
+        # Read one row past the limit to tell whether the range was truncated
+        if batch_writer.dedup_enabled:
+            results = HistoryService.get_samples(device_id, start_ms, end_ms, check_type=check_type, limit=limit + 1)
+        else:
+            results = check_archive.get_history(device_id, start_ms, end_ms, check_type, limit + 1)
+        results.sort(key=lambda result: result.check_ts)
+
+        return {
+            'device_id': device_id,
+            'start': start_ms,
+            'end': end_ms,
+            'count': min(len(results), limit),
+            'truncated': len(results) > limit,
+            'results': [result.to_dict() for result in results[:limit]]
+        }
+
+    def _send_json(self, request: BaseHTTPRequestHandler, status: int, payload, headers=None):
+        """Write a JSON response"""
+        self._send(request, status, json.dumps(payload, default=str).encode('utf-8'), JSON_CONTENT_TYPE, headers)
+
+    def _send(self, request: BaseHTTPRequestHandler, status: int, body: bytes, content_type: str, headers=None):
+        """Write a complete response"""
+        request.send_response(status)
+        if content_type:
+            request.send_header('Content-Type', content_type)
+        if status != 304:
+            request.send_header('Content-Length', str(len(body)))
+        if self.cors_enabled:
+            origin = request.headers.get('Origin')
+            if '*' in self.cors_origins:
+                request.send_header('Access-Control-Allow-Origin', '*')
+            elif origin in self.cors_origins:
+                request.send_header('Access-Control-Allow-Origin', origin)
+                request.send_header('Vary', 'Origin')
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(body)
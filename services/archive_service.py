@@ -0,0 +1,478 @@
+"""
+PingMonitor Pro v2.3 - Check Result Archive
+Moves old check results into compressed per-device, per-day columnar segments
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy import select, delete
+
+from ..models.base import db_manager
+from ..models.device import Device
+from ..models.check_result import CheckResult, CheckType, to_epoch_ms, from_epoch_ms
+from ..models.statistics import RollupWatermark
+from .statistics_service import WATERMARK_NAME
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86400 * 1000
+
+# Segment file layout (little endian):
+#   header   magic, version, row count, base timestamp (epoch ms)
+#   lengths  byte length of each column below
+#   columns  each padded to 8 bytes
+#     ts       uint32 deltas from the previous timestamp (first = 0)
+#     type     uint8 CheckType codes
+#     success  bit-packed flags (numpy.packbits)
+#     rt       zlib(byte-shuffled float32 response times, NaN = unknown)
+SEGMENT_MAGIC = b'PMAR'
+SEGMENT_VERSION = 1
+SEGMENT_HEADER = struct.Struct('<4sHxxIq')
+SEGMENT_LENGTHS = struct.Struct('<IIII')
+SEGMENT_SUFFIX = '.seg'
+
+CHECK_TYPES = list(CheckType)
+CHECK_TYPE_CODES = {check_type: code for code, check_type in enumerate(CHECK_TYPES)}
+
+
+def _pad8(length: int) -> int:
+    return (length + 7) & ~7
+
+
+class CheckResultArchive:
+    """
+    Columnar archive of check results older than archive_after_days
+
+    Each run moves whole UTC days of rows (already consumed by the statistics
+    rollup) from SQLite into one segment file per device per day, then deletes
+    them from check_results. Segments keep timestamp, check type, success and
+    response time - error messages and check_data stay in SQLite only.
+
+    Segments are read back through numpy.memmap; get_history merges them with
+    live SQLite rows. Requires NumPy - without it archiving is disabled and
+    history comes from SQLite alone.
+    """
+
+    def __init__(self, archive_dir: Optional[Path] = None, archive_after_days: int = 7,
+                 retention_days: int = 365, interval: float = 3600.0):
+        """
+        Initialize archive
+
+        Args:
+            archive_dir: Directory holding segment files
+            archive_after_days: Age (days) after which results are archived
+            retention_days: Days segment files are kept
+            interval: Seconds between archive runs
+        """
+        if archive_dir is None:
+            archive_dir = Path.home() / ".pingmonitor" / "archive"
+
+        self.archive_dir = Path(archive_dir)
+        self.archive_after_days = archive_after_days
+        self.retention_days = retention_days
+        self.interval = interval
+
+        self.total_archived = 0
+        self.total_segments = 0
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._run_lock = threading.Lock()
+
+    def configure(self, archive_dir: Optional[Path] = None, archive_after_days: Optional[int] = None,
+                  retention_days: Optional[int] = None):
+        """Update archive settings (call before start)"""
+        if archive_dir is not None:
+            self.archive_dir = Path(archive_dir)
+        if archive_after_days is not None:
+            self.archive_after_days = archive_after_days
+        if retention_days is not None:
+            self.retention_days = retention_days
+
+    def is_available(self) -> bool:
+        """Whether segments can be written and read (NumPy installed)"""
+        return NUMPY_AVAILABLE
+
+    def start(self):
+        """Start background archive thread"""
+        if not self.is_available():
+            logger.info("Check result archive disabled - NumPy not installed")
+            return
+
+        if self._thread and self._thread.is_alive():
+            return
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name='check-archive')
+        self._thread.start()
+        logger.info(f"Check result archive started (after={self.archive_after_days} days, dir={self.archive_dir})")
+
+    def stop(self):
+        """Stop background archive thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+            logger.info("Check result archive stopped")
+
+    def _run_loop(self):
+        """Archive shortly after startup, then every interval seconds"""
+        if self._stop_event.wait(120.0):
+            return
+
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[ARCHIVE] Archive run failed: {e}", exc_info=True)
+
+            self._stop_event.wait(self.interval)
+
+    # ------------------------------------------------------------------
+    # Archiving
+    # ------------------------------------------------------------------
+
+    def run_once(self) -> int:
+        """
+        Archive all complete days older than archive_after_days
+
+        Returns:
+            Number of check results moved to segments
+        """
+        if not self.is_available():
+            return 0
+
+        with self._run_lock:
+            start_time = time.time()
+            archived = 0
+
+            now_ms = int(time.time() * 1000)
+            cutoff_ms = now_ms - now_ms % DAY_MS - self.archive_after_days * DAY_MS
+
+            session = db_manager.get_session()
+            try:
+                oldest_ts = session.execute(
+                    select(CheckResult.check_ts)
+                    .where(CheckResult.check_ts.isnot(None))
+                    .order_by(CheckResult.check_time)
+                    .limit(1)
+                ).scalar()
+                device_ids = list(session.execute(select(Device.id)).scalars())
+
+                # Only move rows the statistics rollup has already consumed
+                watermark = session.get(RollupWatermark, WATERMARK_NAME)
+                rolled_up_id = watermark.last_id if watermark else 0
+            finally:
+                session.close()
+
+            if oldest_ts is not None:
+                day = oldest_ts - oldest_ts % DAY_MS
+                while day < cutoff_ms and not self._stop_event.is_set():
+                    for device_id in device_ids:
+                        if self._stop_event.is_set():
+                            break
+                        archived += self._archive_device_day(device_id, day, rolled_up_id)
+                    day += DAY_MS
+
+            self._purge_expired_segments(now_ms)
+
+            self.total_archived += archived
+            if archived:
+                logger.info(f"[ARCHIVE] Archived {archived} check results in {time.time() - start_time:.1f}s")
+
+            return archived
+
+    def _archive_device_day(self, device_id: int, day_ms: int, max_id: int) -> int:
+        """Move one device's rows for one UTC day into its segment"""
+        # Read on the pool and write the segment before taking the single writer
+        # connection, which is then held only for the DELETE
+        session = db_manager.get_session()
+        try:
+            rows = session.execute(
+                select(
+                    CheckResult.id,
+                    CheckResult.check_ts,
+                    CheckResult.check_type,
+                    CheckResult.success,
+                    CheckResult.response_time
+                )
+                .where(
+                    CheckResult.device_id == device_id,
+                    CheckResult.check_ts >= day_ms,
+                    CheckResult.check_ts < day_ms + DAY_MS,
+                    CheckResult.id <= max_id
+                )
+                .order_by(CheckResult.check_ts)
+            ).all()
+        finally:
+            session.close()
+
+        if not rows:
+            return 0
+
+        columns = {
+            'check_ts': np.fromiter((row.check_ts for row in rows), dtype=np.int64, count=len(rows)),
+            'check_type': np.fromiter((CHECK_TYPE_CODES[row.check_type] for row in rows), dtype=np.uint8, count=len(rows)),
+            'success': np.fromiter((bool(row.success) for row in rows), dtype=bool, count=len(rows)),
+            'response_time': np.fromiter(
+                (row.response_time if row.response_time is not None else np.nan for row in rows),
+                dtype=np.float32, count=len(rows)
+            )
+        }
+
+        # Late rows for an already archived day are merged into its segment
+        existing = self.read_segment(device_id, day_ms)
+        if existing is not None:
+            columns = {name: np.concatenate([existing[name], columns[name]]) for name in columns}
+            order = np.argsort(columns['check_ts'], kind='stable')
+            columns = {name: values[order] for name, values in columns.items()}
+
+        self._write_segment(self._segment_path(device_id, day_ms), columns)
+        self.total_segments += existing is None
+
+        # Segment is durable - drop the rows from SQLite
+        session = db_manager.get_write_session()
+        try:
+            session.execute(
+                delete(CheckResult).where(
+                    CheckResult.device_id == device_id,
+                    CheckResult.check_ts >= day_ms,
+                    CheckResult.check_ts < day_ms + DAY_MS,
+                    CheckResult.id <= max(row.id for row in rows)
+                )
+            )
+            session.commit()
+            return len(rows)
+
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _purge_expired_segments(self, now_ms: int):
+        """Delete segment files older than retention_days"""
+        if not self.archive_dir.exists():
+            return
+
+        cutoff_ms = now_ms - self.retention_days * DAY_MS
+        for device_dir in self.archive_dir.iterdir():
+            if not device_dir.is_dir():
+                continue
+
+            for segment in device_dir.glob(f"*{SEGMENT_SUFFIX}"):
+                day_ms = self._segment_day(segment)
+                if day_ms is not None and day_ms + DAY_MS <= cutoff_ms:
+                    segment.unlink()
+
+            if not any(device_dir.iterdir()):
+                device_dir.rmdir()
+
+    # ------------------------------------------------------------------
+    # Segment files
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, device_id: int, day_ms: int) -> Path:
+        return self.archive_dir / str(device_id) / f"{from_epoch_ms(day_ms).date().isoformat()}{SEGMENT_SUFFIX}"
+
+    @staticmethod
+    def _segment_day(path: Path) -> Optional[int]:
+        """Day (epoch ms) encoded in a segment file name"""
+        try:
+            return to_epoch_ms(datetime.strptime(path.stem, '%Y-%m-%d'))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _write_segment(path: Path, columns: Dict[str, 'np.ndarray']):
+        """Encode columns and atomically replace the segment file"""
+        timestamps = columns['check_ts']
+        count = len(timestamps)
+        base_ts = int(timestamps[0])
+
+        deltas = np.diff(timestamps, prepend=base_ts).astype(np.uint32)
+        response_times = columns['response_time'].astype('<f4')
+        shuffled = response_times.view(np.uint8).reshape(count, 4).T.tobytes()
+
+        blobs = [
+            deltas.astype('<u4').tobytes(),
+            columns['check_type'].astype(np.uint8).tobytes(),
+            np.packbits(columns['success']).tobytes(),
+            zlib.compress(shuffled, 6)
+        ]
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, count, base_ts))
+            f.write(SEGMENT_LENGTHS.pack(*(len(blob) for blob in blobs)))
+            for blob in blobs:
+                f.write(blob)
+                f.write(b'\0' * (_pad8(len(blob)) - len(blob)))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+
+    def read_segment(self, device_id: int, day_ms: int) -> Optional[Dict[str, 'np.ndarray']]:
+        """
+        Read one segment through a memory map
+
+        Args:
+            device_id: Device ID
+            day_ms: UTC day start (epoch ms)
+
+        Returns:
+            Dict of check_ts/check_type/success/response_time arrays, or None if absent
+        """
+        if not self.is_available():
+            return None
+
+        path = self._segment_path(device_id, day_ms)
+        if not path.exists():
+            return None
+
+        mapped = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, version, count, base_ts = SEGMENT_HEADER.unpack_from(mapped, 0)
+        if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+            logger.warning(f"[ARCHIVE] Unsupported segment file: {path}")
+            return None
+
+        lengths = SEGMENT_LENGTHS.unpack_from(mapped, SEGMENT_HEADER.size)
+        offsets = []
+        offset = SEGMENT_HEADER.size + SEGMENT_LENGTHS.size
+        for length in lengths:
+            offsets.append(offset)
+            offset += _pad8(length)
+
+        def column(index: int):
+            return mapped[offsets[index]:offsets[index] + lengths[index]]
+
+        # Decoded arrays are copies, so the mapping is released once this frame returns
+        shuffled = np.frombuffer(zlib.decompress(column(3)), dtype=np.uint8)
+        return {
+            'check_ts': base_ts + np.cumsum(column(0).view('<u4'), dtype=np.int64),
+            'check_type': np.array(column(1)),
+            'success': np.unpackbits(column(2), count=count).astype(bool),
+            'response_time': np.ascontiguousarray(shuffled.reshape(4, count).T).view('<f4').ravel()
+        }
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+
+    def get_history(self, device_id: Optional[int], start_ms: int, end_ms: Optional[int] = None,
+                    check_type: Optional[CheckType] = None, limit: Optional[int] = None) -> List[CheckResult]:
+        """
+        Get check results for a time range from SQLite and archive segments
+
+        Archived results are returned as transient CheckResult objects (no id,
+        error message or check_data).
+
+        Args:
+            device_id: Device ID, or None for all devices
+            start_ms: Inclusive range start (epoch ms)
+            end_ms: Exclusive range end (epoch ms), None for now
+            check_type: Only results of this check type, None for all
+            limit: Return only the first limit results; SQLite applies the
+                LIMIT and segments stop being read once it is reached
+
+        Returns:
+            CheckResult list ordered by device and time
+        """
+        if end_ms is None:
+            end_ms = int(time.time() * 1000) + 1
+
+        session = db_manager.get_session()
+        try:
+            query = session.query(CheckResult).filter(
+                CheckResult.check_ts >= start_ms,
+                CheckResult.check_ts < end_ms
+            )
+            if device_id is not None:
+                query = query.filter(CheckResult.device_id == device_id)
+            if check_type is not None:
+                query = query.filter(CheckResult.check_type == check_type)
+            if limit is not None:
+                query = query.order_by(CheckResult.device_id, CheckResult.check_ts).limit(limit)
+            live = query.all()
+        finally:
+            session.close()
+
+        results = list(live)
+        if self.is_available() and self.archive_dir.exists():
+            seen = {(result.device_id, result.check_ts, result.check_type) for result in live}
+
+            if device_id is not None:
+                device_ids = [device_id]
+            else:
+                device_ids = sorted(int(path.name) for path in self.archive_dir.iterdir() if path.name.isdigit())
+
+            # The first limit results of the merge are among the first limit of
+            # each source, so archived results stop there as well
+            archived = []
+            for archived_device_id in device_ids:
+                day = start_ms - start_ms % DAY_MS
+                while day < end_ms and (limit is None or len(archived) < limit):
+                    segment = self.read_segment(archived_device_id, day)
+                    if segment is not None:
+                        remaining = None if limit is None else limit - len(archived)
+                        archived.extend(self._segment_results(archived_device_id, segment, start_ms, end_ms,
+                                                              seen, check_type, remaining))
+                    day += DAY_MS
+            results.extend(archived)
+
+        results.sort(key=lambda result: (result.device_id, result.check_ts))
+        return results if limit is None else results[:limit]
+
+    @staticmethod
+    def _segment_results(device_id: int, segment: Dict[str, 'np.ndarray'], start_ms: int, end_ms: int, seen: set,
+                         check_type: Optional[CheckType] = None, limit: Optional[int] = None) -> List[CheckResult]:
+        """Build transient CheckResult objects for the in-range part of a segment"""
+        timestamps = segment['check_ts']
+        low, high = np.searchsorted(timestamps, [start_ms, end_ms])
+        type_code = None if check_type is None else CHECK_TYPE_CODES[check_type]
+
+        results = []
+        for index in range(low, high):
+            if limit is not None and len(results) >= limit:
+                break
+            if type_code is not None and segment['check_type'][index] != type_code:
+                continue
+
+            check_ts = int(timestamps[index])
+            result_type = CHECK_TYPES[segment['check_type'][index]]
+            if (device_id, check_ts, result_type) in seen:
+                continue
+
+            response_time = float(segment['response_time'][index])
+            results.append(CheckResult(
+                device_id=device_id,
+                check_type=result_type,
+                check_time=from_epoch_ms(check_ts).isoformat(),
+                check_ts=check_ts,
+                success=bool(segment['success'][index]),
+                response_time=None if np.isnan(response_time) else response_time
+            ))
+
+        return results
+
+
+# Global instance
+check_archive = CheckResultArchive()
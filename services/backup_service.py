@@ -0,0 +1,213 @@
+"""
+PingMonitor Pro v2.3 - Backup Service
+Online SQLite backups in small page steps with compressed rotation
+"""
+
+import gzip
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = 'pingmonitor-'
+BACKUP_SUFFIX = '.db.gz'
+
+
+class BackupService:
+    """
+    Scheduled online backup of the SQLite database
+
+    Uses SQLite's online backup API (sqlite3.Connection.backup) copying
+    pages_per_step pages at a time with step_pause seconds between steps.
+    The source connection holds one read transaction for the whole copy, so
+    the backup is a consistent snapshot and is never restarted by concurrent
+    writes; in WAL mode that read transaction does not block the batch
+    writer. The copy is gzip-compressed into backup_dir and only the newest
+    keep backups are retained.
+    """
+
+    def __init__(self, db_path: str, backup_dir: Path, interval: float = 86400.0, keep: int = 7,
+                 pages_per_step: int = 1000, step_pause: float = 0.05):
+        """
+        Initialize backup service
+
+        Args:
+            db_path: SQLite database file to back up
+            backup_dir: Directory for compressed backups
+            interval: Seconds between backups
+            keep: Number of compressed backups to retain
+            pages_per_step: Pages copied per backup step
+            step_pause: Seconds to sleep between backup steps
+        """
+        self.db_path = Path(db_path)
+        self.backup_dir = Path(backup_dir)
+        self.interval = interval
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_pause = step_pause
+
+        self.total_backups = 0
+        self.last_backup_path: Optional[Path] = None
+        self.last_duration = 0.0
+        self.last_pages = 0
+        self.last_pages_per_sec = 0.0
+        self.last_size_bytes = 0
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._run_lock = threading.Lock()
+
+    def start(self):
+        """Start background backup thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name='backup')
+        self._thread.start()
+        logger.info(f"Backup service started (interval={self.interval}s, keep={self.keep}, dir={self.backup_dir})")
+
+    def stop(self):
+        """Stop background backup thread (an in-progress backup is abandoned)"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        logger.info("Backup service stopped")
+
+    def _run_loop(self):
+        """Back up when the newest backup is older than interval"""
+        # Let startup (device loading, first checks) settle before backing up
+        if self._stop_event.wait(120.0):
+            return
+
+        while not self._stop_event.is_set():
+            backups = self.list_backups()
+            age = time.time() - backups[-1].stat().st_mtime if backups else None
+
+            if age is None or age >= self.interval:
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"[BACKUP] Backup failed: {e}", exc_info=True)
+                wait = self.interval
+            else:
+                wait = self.interval - age
+
+            self._stop_event.wait(wait)
+
+    def list_backups(self) -> List[Path]:
+        """Compressed backups, oldest first"""
+        if not self.backup_dir.exists():
+            return []
+        return sorted(self.backup_dir.glob(f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}"))
+
+    def run_once(self) -> Optional[Path]:
+        """
+        Take one backup, compress it and rotate old backups
+
+        Returns:
+            Path of the compressed backup, or None if stopped before completion
+        """
+        with self._run_lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            name = f"{BACKUP_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            temp_path = self.backup_dir / f"{name}.db.tmp"
+            backup_path = self.backup_dir / f"{name}{BACKUP_SUFFIX}"
+
+            try:
+                start_time = time.time()
+                pages = self._copy_database(temp_path)
+                if pages is None:
+                    logger.info("[BACKUP] Backup interrupted by shutdown")
+                    return None
+                copy_seconds = time.time() - start_time
+
+                self._compress(temp_path, backup_path)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+            self.last_duration = time.time() - start_time
+            self.last_pages = pages
+            self.last_pages_per_sec = pages / copy_seconds if copy_seconds > 0 else 0.0
+            self.last_size_bytes = backup_path.stat().st_size
+            self.last_backup_path = backup_path
+            self.total_backups += 1
+
+            removed = self._rotate()
+
+            logger.info(f"[BACKUP] {backup_path.name}: {pages} pages in {copy_seconds:.1f}s "
+                        f"({self.last_pages_per_sec:.0f} pages/s), total {self.last_duration:.1f}s, "
+                        f"{self.last_size_bytes / 1024 / 1024:.1f} MB compressed"
+                        + (f", removed {removed} old backups" if removed else ""))
+            return backup_path
+
+    def _copy_database(self, temp_path: Path) -> Optional[int]:
+        """
+        Copy the database to temp_path with the online backup API
+
+        Returns:
+            Number of pages copied, or None if stopped before completion
+        """
+        source = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        target = sqlite3.connect(str(temp_path))
+        progress = {'total': 0}
+
+        def on_progress(status, remaining, total):
+            # Called after every step; backup(sleep=) only applies to BUSY/LOCKED retries
+            progress['total'] = total
+            if remaining and self._stop_event.wait(self.step_pause):
+                raise InterruptedError()
+
+        try:
+            # Pin one snapshot so writes between steps do not restart the backup
+            source.execute("BEGIN")
+            source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+
+            source.backup(target, pages=self.pages_per_step, progress=on_progress)
+            return progress['total']
+        except InterruptedError:
+            return None
+        finally:
+            source.close()
+            target.close()
+
+    @staticmethod
+    def _compress(source_path: Path, backup_path: Path):
+        """Gzip source_path into backup_path (written under a temporary name first)"""
+        partial_path = backup_path.with_name(backup_path.name + '.part')
+        try:
+            with open(source_path, 'rb') as source, gzip.open(partial_path, 'wb', compresslevel=6) as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            partial_path.replace(backup_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+    def _rotate(self) -> int:
+        """Delete all but the newest keep backups"""
+        backups = self.list_backups()
+        expired = backups[:-self.keep] if self.keep > 0 else []
+        for path in expired:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"[BACKUP] Could not remove {path.name}: {e}")
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get last backup statistics"""
+        return {
+            'total_backups': self.total_backups,
+            'last_backup': str(self.last_backup_path) if self.last_backup_path else None,
+            'last_duration': self.last_duration,
+            'last_pages': self.last_pages,
+            'last_pages_per_sec': self.last_pages_per_sec,
+            'last_size_bytes': self.last_size_bytes,
+            'backups': len(self.list_backups())
+        }
@@ -4,6 +4,7 @@ Export data to CSV and PDF formats
 """
 
 import csv
+import json
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
@@ -105,7 +106,7 @@ class ExportService:
                         'Response Time (ms)': f"{result.response_time:.2f}" if result.response_time else 'N/A',
                         'Status Code': result.status_code or 'N/A',
                         'Error Message': result.error_message or 'N/A',
-                        'Check Data': result.check_data or 'N/A'
+                        'Check Data': json.dumps(result.get_data(), ensure_ascii=False) if result.check_data else 'N/A'
                     })
 
             logger.info(f"Exported {len(check_results)} check results to {file_path}")
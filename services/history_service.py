@@ -0,0 +1,140 @@
+"""
+PingMonitor Pro v2.3 - History Service
+Expands change-only check result history into regular samples
+"""
+
+import time
+from itertools import groupby
+from typing import Dict, List, Optional
+import logging
+
+from ..models.base import db_manager
+from ..models.device import Device
+from ..models.check_result import CheckResult, CheckType, from_epoch_ms
+from .archive_service import check_archive
+from .performance_service import batch_writer, carried_sample_times
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryService:
+    """
+    Reader for check result history stored in change-only mode
+
+    With change-only storage a stored row stands for every check up to the
+    next stored row of the same device and check type. Keyframes guarantee a
+    stored row at least every keyframe interval while monitoring runs, so a
+    row is never carried forward further than that - longer gaps stay gaps.
+    The skipped check times come from carried_sample_times, which the
+    statistics rollup shares.
+    """
+
+    @staticmethod
+    def expand(results: List[CheckResult], interval_ms: int, start_ms: int, end_ms: int,
+               max_gap_ms: int) -> List[CheckResult]:
+        """
+        Expand stored rows of one device and check type into regular samples
+
+        Args:
+            results: Stored rows ordered by check_ts (may start before start_ms)
+            interval_ms: Sample spacing (normally the device check interval)
+            start_ms: Inclusive range start (epoch ms)
+            end_ms: Exclusive range end (epoch ms)
+            max_gap_ms: Longest span a row is carried forward (keyframe interval)
+
+        Returns:
+            Transient CheckResult samples ordered by time
+        """
+        samples = []
+
+        for index, result in enumerate(results):
+            if start_ms <= result.check_ts < end_ms:
+                samples.append(result)
+
+            next_ts = results[index + 1].check_ts if index + 1 < len(results) else None
+            for sample_ts in carried_sample_times(result.check_ts, next_ts, interval_ms, max_gap_ms):
+                if sample_ts >= end_ms:
+                    break
+                if sample_ts < start_ms:
+                    continue
+                samples.append(CheckResult(
+                    device_id=result.device_id,
+                    check_type=result.check_type,
+                    check_time=from_epoch_ms(sample_ts).isoformat(),
+                    check_ts=sample_ts,
+                    success=result.success,
+                    response_time=result.response_time,
+                    status_code=result.status_code,
+                    error_message=result.error_message
+                ))
+
+        return samples
+
+    @staticmethod
+    def get_samples(device_id: Optional[int], start_ms: int, end_ms: Optional[int] = None,
+                    interval_seconds: Optional[int] = None, check_type: Optional[CheckType] = None,
+                    limit: Optional[int] = None) -> List[CheckResult]:
+        """
+        Get check result history as regular samples (for charts and exports)
+
+        Reads SQLite and archive segments through check_archive.get_history,
+        starting one keyframe interval early so the row in effect at start_ms
+        is known.
+
+        Args:
+            device_id: Device ID, or None for all devices (not with limit)
+            start_ms: Inclusive range start (epoch ms)
+            end_ms: Exclusive range end (epoch ms), None for now
+            interval_seconds: Sample spacing, defaults to each device's check interval
+            check_type: Only samples of this check type, None for all
+            limit: Read only the first limit stored rows of the range; samples
+                then end at the last row read (at least limit of them)
+
+        Returns:
+            CheckResult list ordered by device, check type and time
+        """
+        if end_ms is None:
+            end_ms = int(time.time() * 1000) + 1
+        if limit is not None and device_id is None:
+            raise ValueError("limit requires a device_id")
+
+        intervals: Dict[int, int] = {}
+        if interval_seconds is None:
+            session = db_manager.get_session()
+            try:
+                query = session.query(Device.id, Device.check_interval)
+                if device_id is not None:
+                    query = query.filter(Device.id == device_id)
+                intervals = {row_id: check_interval or 15 for row_id, check_interval in query.all()}
+            finally:
+                session.close()
+
+        max_gap_ms = batch_writer.dedup_keyframe_ms
+        if limit is None:
+            results = check_archive.get_history(device_id, start_ms - max_gap_ms, end_ms, check_type)
+        else:
+            # Rows in effect at start_ms span at most one keyframe interval
+            results = check_archive.get_history(device_id, start_ms - max_gap_ms, start_ms, check_type)
+            in_range = check_archive.get_history(device_id, start_ms, end_ms, check_type, limit)
+
+            if len(in_range) == limit:
+                # End the samples at the last row read. Rows at its time and up
+                # to half an interval later decide whether a skipped check
+                # lands just before them, so read those too to keep it exact
+                last_ts = in_range[-1].check_ts
+                interval_ms = (interval_seconds or intervals.get(device_id, 15)) * 1000
+                lookahead_end = min(end_ms, last_ts + interval_ms // 2 + 1)
+                in_range = [result for result in in_range if result.check_ts < last_ts]
+                in_range.extend(check_archive.get_history(device_id, last_ts, lookahead_end, check_type))
+                end_ms = last_ts + 1
+
+            results.extend(in_range)
+
+        results.sort(key=lambda result: (result.device_id, result.check_type.value, result.check_ts))
+
+        samples = []
+        for (result_device_id, _), group in groupby(results, key=lambda result: (result.device_id, result.check_type)):
+            interval_ms = (interval_seconds or intervals.get(result_device_id, 15)) * 1000
+            samples.extend(HistoryService.expand(list(group), interval_ms, start_ms, end_ms, max_gap_ms))
+
+        return samples
@@ -2,15 +2,218 @@
 PingMonitor Pro v2.0 - HTTP/HTTPS Check Service
 """
 
+import asyncio
+import threading
 import time
 import requests
-from typing import Dict
-from urllib.parse import urljoin
+from collections import OrderedDict
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 import logging
 import ssl
 
 logger = logging.getLogger(__name__)
 
+# Redirects followed by the async client (requests' own default is 30)
+MAX_REDIRECTS = 10
+
+# Body policies (custom_fields['http_body_mode']):
+#   stream  - read the whole body in chunks, counting bytes without buffering it
+#   partial - read at most http_body_limit bytes, then drop the connection
+#   head    - send HEAD instead of the configured method, no body at all
+BODY_MODES = ('stream', 'partial', 'head')
+DEFAULT_BODY_LIMIT = 4096
+BODY_CHUNK_SIZE = 65536
+
+
+class PeerCertAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records the peer certificate of the connection serving each response
+
+    The certificate is read while the connection is still attached to the
+    response, so certificate checks need no second TLS handshake.
+    """
+
+    def build_response(self, req, resp):
+        response = super().build_response(req, resp)
+        response.peer_cert = None
+        try:
+            sock = getattr(getattr(resp, 'connection', None), 'sock', None)
+            if sock is not None and hasattr(sock, 'getpeercert'):
+                response.peer_cert = sock.getpeercert()
+        except Exception as e:
+            logger.debug(f"Could not read peer certificate: {e}")
+        return response
+
+
+class CertificateCache:
+    """
+    Cache of parsed certificate facts per host:port
+
+    Entries are served until the slow refresh cadence elapses or the
+    certificate gets within expiry_margin of notAfter, whichever comes first;
+    days_until_expiry is recomputed on every read.
+    """
+
+    def __init__(self, refresh_interval: float = 21600, expiry_margin: float = 7 * 86400):
+        """
+        Initialize certificate cache
+
+        Args:
+            refresh_interval: Seconds between certificate refreshes (default: 6 hours)
+            expiry_margin: Refresh on every check once this close to notAfter (default: 7 days)
+        """
+        self.refresh_interval = refresh_interval
+        self.expiry_margin = expiry_margin
+        self.cache: Dict[Tuple[str, int], Dict] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, host: str, port: int) -> Optional[Dict]:
+        """Get cached certificate info, or None if missing or due for refresh"""
+        with self.lock:
+            entry = self.cache.get((host, port))
+
+            if entry is None or time.monotonic() >= entry['refresh_at']:
+                self.misses += 1
+                return None
+
+            not_after = entry['not_after']
+            if (not_after - datetime.now()).total_seconds() <= self.expiry_margin:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            days_until_expiry = (not_after - datetime.now()).days
+            return dict(entry['info'], days_until_expiry=days_until_expiry, expired=days_until_expiry < 0)
+
+    def set(self, host: str, port: int, info: Dict):
+        """Cache parsed certificate info (as returned by HTTPService._parse_certificate)"""
+        if 'not_after' not in info:
+            return
+
+        with self.lock:
+            self.cache[(host, port)] = {
+                'info': info,
+                'not_after': datetime.fromisoformat(info['not_after']),
+                'refresh_at': time.monotonic() + self.refresh_interval
+            }
+
+    def invalidate(self, host: str, port: int):
+        """Drop cached certificate info for host:port"""
+        with self.lock:
+            self.cache.pop((host, port), None)
+
+    def get_hit_rate(self) -> float:
+        """Calculate cache hit rate percentage"""
+        total = self.hits + self.misses
+        return (self.hits / total * 100) if total > 0 else 0
+
+
+class HTTPSessionPool:
+    """
+    Bounded registry of keep-alive requests.Session objects keyed by (scheme, host, port)
+
+    Sessions are evicted least-recently-used first when the registry is full,
+    and dropped once they have been idle for longer than idle_timeout.
+    """
+
+    def __init__(self, max_sessions: int = 256, idle_timeout: float = 120.0):
+        """
+        Initialize session pool
+
+        Args:
+            max_sessions: Maximum number of cached sessions (one per scheme/host/port)
+            idle_timeout: Seconds after which an unused session is closed
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[Tuple[str, str, int], Tuple[requests.Session, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, scheme: str, host: str, port: int) -> requests.Session:
+        """
+        Get the warm session for an origin, creating it if needed
+
+        Args:
+            scheme: URL scheme (http/https)
+            host: Host name or IP address
+            port: TCP port
+
+        Returns:
+            Session to issue the request with
+        """
+        key = (scheme, host, port)
+        now = time.monotonic()
+        evicted: List[requests.Session] = []
+
+        with self.lock:
+            entry = self._sessions.pop(key, None)
+            if entry is not None and now - entry[1] < self.idle_timeout:
+                session = entry[0]
+                self.hits += 1
+            else:
+                if entry is not None:
+                    evicted.append(entry[0])
+                session = self._create_session()
+                self.misses += 1
+
+            # Most recently used entries live at the end
+            self._sessions[key] = (session, now)
+
+            # Drop idle sessions from the LRU end, then enforce the size bound
+            while self._sessions:
+                oldest_key, (oldest_session, last_used) = next(iter(self._sessions.items()))
+                if now - last_used < self.idle_timeout and len(self._sessions) <= self.max_sessions:
+                    break
+                del self._sessions[oldest_key]
+                evicted.append(oldest_session)
+
+            self.evictions += len(evicted)
+
+        # Close outside the lock, closing sockets may block
+        for old_session in evicted:
+            old_session.close()
+
+        return session
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create a session with a small per-origin connection pool"""
+        session = requests.Session()
+        adapter = PeerCertAdapter(pool_connections=1, pool_maxsize=4)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = 'PingMonitor-Pro/2.0'
+        return session
+
+    def close_all(self):
+        """Close all cached sessions"""
+        with self.lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+        logger.info(f"[HTTP POOL] Closed {len(sessions)} sessions")
+
+    def get_hit_rate(self) -> float:
+        """Calculate session reuse rate percentage"""
+        total = self.hits + self.misses
+        return (self.hits / total * 100) if total > 0 else 0
+
+    def __len__(self):
+        with self.lock:
+            return len(self._sessions)
+
 
 class HTTPService:
     """HTTP/HTTPS check service"""
@@ -31,38 +234,56 @@ class HTTPService:
         port = device.https_port if use_https else device.http_port
         url = f"{protocol}://{device.ip_address}:{port}{device.http_path}"
 
+        # Warm keep-alive connection unless the device opts out to measure cold connects
+        keepalive = HTTPService._device_option(device, 'http_keepalive', True)
+        body_mode, body_limit = HTTPService._body_policy(device)
+        method = 'HEAD' if body_mode == 'head' else device.http_method
+
         try:
             start_time = time.time()
 
-            response = requests.request(
-                method=device.http_method,
-                url=url,
-                timeout=device.timeout,
-                verify=device.http_check_ssl if use_https else False,
-                allow_redirects=True,
-                headers={'User-Agent': 'PingMonitor-Pro/2.0'}
-            )
+            if keepalive:
+                session = http_session_pool.get(protocol, device.ip_address, port)
+                response, response_size = HTTPService._request(
+                    session, method, url, device.timeout,
+                    device.http_check_ssl if use_https else False,
+                    body_mode, body_limit
+                )
+            else:
+                with HTTPSessionPool._create_session() as session:
+                    session.headers['Connection'] = 'close'
+                    response, response_size = HTTPService._request(
+                        session, method, url, device.timeout,
+                        device.http_check_ssl if use_https else False,
+                        body_mode, body_limit
+                    )
 
             response_time = (time.time() - start_time) * 1000
 
-            # Check SSL certificate validity if HTTPS
+            # Check SSL certificate validity if HTTPS, using the certificate of
+            # the first hop (the device itself) when no cached facts are fresh
             ssl_info = {}
             if use_https and device.http_check_ssl:
-                ssl_info = HTTPService._check_ssl_certificate(device.ip_address, device.https_port)
+                first_hop = response.history[0] if response.history else response
+                ssl_info = HTTPService._get_ssl_info(device.ip_address, port, getattr(first_hop, 'peer_cert', None))
 
             success = response.status_code == device.http_expected_status
 
+            data = {
+                'ssl_info': ssl_info,
+                'redirects': len(response.history),
+                'final_url': response.url
+            }
+            captured_headers = HTTPService._capture_headers(device, response.headers)
+            if captured_headers:
+                data['headers'] = captured_headers
+
             return {
                 'success': success,
                 'response_time': response_time,
                 'status_code': response.status_code,
-                'response_size': len(response.content),
-                'data': {
-                    'headers': dict(response.headers),
-                    'ssl_info': ssl_info,
-                    'redirects': len(response.history),
-                    'final_url': response.url
-                }
+                'response_size': response_size,
+                'data': data
             }
 
         except requests.exceptions.Timeout:
@@ -84,6 +305,308 @@ class HTTPService:
                 'response_time': 0
             }
 
+    @staticmethod
+    def _request(session: requests.Session, method: str, url: str, timeout: float, verify: bool,
+                 body_mode: str, body_limit: int) -> Tuple[requests.Response, Optional[int]]:
+        """
+        Issue a streamed request and consume the body according to the body policy
+
+        Args:
+            session: Session to use
+            method: HTTP method
+            url: Target URL
+            timeout: Request timeout in seconds
+            verify: Verify the TLS certificate
+            body_mode: One of BODY_MODES
+            body_limit: Maximum bytes read in partial mode
+
+        Returns:
+            Tuple of (response, bytes read); bytes read is the Content-Length in head mode
+        """
+        response = session.request(
+            method=method,
+            url=url,
+            timeout=timeout,
+            verify=verify,
+            allow_redirects=True,
+            stream=True
+        )
+
+        try:
+            if body_mode == 'head':
+                content_length = response.headers.get('Content-Length')
+                return response, int(content_length) if content_length and content_length.isdigit() else None
+
+            response_size = 0
+            chunk_size = min(BODY_CHUNK_SIZE, body_limit) if body_mode == 'partial' else BODY_CHUNK_SIZE
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                response_size += len(chunk)
+                if body_mode == 'partial' and response_size >= body_limit:
+                    break
+
+            return response, response_size
+        finally:
+            # Releases the connection to the pool when the body was fully read,
+            # discards it otherwise
+            response.close()
+
+    @staticmethod
+    def _body_policy(device) -> Tuple[str, int]:
+        """
+        Get the body policy for a device
+
+        Args:
+            device: Device being checked
+
+        Returns:
+            Tuple of (body_mode, body_limit)
+        """
+        body_mode = HTTPService._device_option(device, 'http_body_mode', 'stream')
+        if body_mode not in BODY_MODES:
+            logger.warning(f"Unknown http_body_mode '{body_mode}' for {device.name} - using 'stream'")
+            body_mode = 'stream'
+
+        body_limit = max(1, int(HTTPService._device_option(device, 'http_body_limit', DEFAULT_BODY_LIMIT)))
+        return body_mode, body_limit
+
+    @staticmethod
+    def _capture_headers(device, headers) -> Dict[str, str]:
+        """
+        Copy allowlisted response headers (custom_fields['http_capture_headers'])
+
+        Args:
+            device: Device being checked
+            headers: Response headers (case-insensitive mapping)
+
+        Returns:
+            Captured headers, empty unless the device opts in
+        """
+        allowlist = HTTPService._device_option(device, 'http_capture_headers', None) or []
+        return {name: headers[name] for name in allowlist if name in headers}
+
+    @staticmethod
+    def _device_option(device, key: str, default):
+        """
+        Read a per-device HTTP option from Device.custom_fields
+
+        Args:
+            device: Device being checked
+            key: Option name
+            default: Value used when the option is not set
+
+        Returns:
+            Option value
+        """
+        custom_fields = device.custom_fields or {}
+        value = custom_fields.get(key)
+        return default if value is None else value
+
+    @staticmethod
+    async def async_check(device, use_https: bool = False) -> Dict:
+        """
+        Perform HTTP/HTTPS check as a coroutine (AsyncMonitoringEngine)
+
+        Args:
+            device: Device to check
+            use_https: Use HTTPS instead of HTTP
+
+        Returns:
+            Check result dictionary
+        """
+        protocol = 'https' if use_https else 'http'
+        port = device.https_port if use_https else device.http_port
+        url = f"{protocol}://{device.ip_address}:{port}{device.http_path}"
+        verify = bool(device.http_check_ssl) if use_https else False
+        body_mode, body_limit = HTTPService._body_policy(device)
+        method = 'HEAD' if body_mode == 'head' else device.http_method
+
+        try:
+            start_time = time.time()
+
+            status_code, headers, response_size, final_url, redirects, cert = await asyncio.wait_for(
+                HTTPService._async_request(method, url, verify, body_limit if body_mode == 'partial' else None),
+                timeout=device.timeout
+            )
+
+            response_time = (time.time() - start_time) * 1000
+
+            # Certificate comes from the connection that served the request
+            ssl_info = {}
+            if use_https and device.http_check_ssl:
+                ssl_info = HTTPService._get_ssl_info(device.ip_address, port, cert, allow_handshake=False)
+
+            success = status_code == device.http_expected_status
+
+            data = {
+                'ssl_info': ssl_info,
+                'redirects': redirects,
+                'final_url': final_url
+            }
+            captured_headers = HTTPService._capture_headers(device, CaseInsensitiveDict(headers))
+            if captured_headers:
+                data['headers'] = captured_headers
+
+            return {
+                'success': success,
+                'response_time': response_time,
+                'status_code': status_code,
+                'response_size': response_size,
+                'data': data
+            }
+
+        except asyncio.TimeoutError:
+            return {
+                'success': False,
+                'error': 'HTTP request timeout',
+                'response_time': device.timeout * 1000
+            }
+        except ssl.SSLError as e:
+            return {
+                'success': False,
+                'error': f'SSL certificate error: {str(e)}',
+                'response_time': 0
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'HTTP check failed: {str(e)}',
+                'response_time': 0
+            }
+
+    @staticmethod
+    async def _async_request(method: str, url: str, verify: bool,
+                             body_limit: Optional[int] = None) -> Tuple[int, Dict, int, str, int, Optional[Dict]]:
+        """
+        Minimal HTTP/1.0 client on asyncio streams, following redirects
+
+        HTTP/1.0 keeps responses unchunked, so the body is counted by reading to EOF.
+
+        Args:
+            method: HTTP method
+            url: Target URL
+            verify: Verify the TLS certificate chain and hostname
+            body_limit: Stop reading the body after this many bytes (None = read to EOF)
+
+        Returns:
+            Tuple of (status_code, headers, body_size, final_url, redirects, peer_cert)
+        """
+        for redirects in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            is_https = parts.scheme == 'https'
+            port = parts.port or (443 if is_https else 80)
+
+            ssl_context = None
+            if is_https:
+                ssl_context = ssl.create_default_context()
+                if not verify:
+                    ssl_context.check_hostname = False
+                    ssl_context.verify_mode = ssl.CERT_NONE
+
+            path = parts.path or '/'
+            if parts.query:
+                path = f"{path}?{parts.query}"
+
+            reader, writer = await asyncio.open_connection(parts.hostname, port, ssl=ssl_context)
+            try:
+                writer.write((
+                    f"{method} {path} HTTP/1.0\r\n"
+                    f"Host: {parts.netloc}\r\n"
+                    f"User-Agent: PingMonitor-Pro/2.0\r\n"
+                    f"Connection: close\r\n\r\n"
+                ).encode('latin-1'))
+                await writer.drain()
+
+                status_line = await reader.readline()
+                status_code = int(status_line.split()[1])
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip()] = value.strip()
+
+                peer_cert = writer.get_extra_info('peercert') if is_https else None
+
+                body_size = 0
+                if method.upper() == 'HEAD':
+                    content_length = next((v for k, v in headers.items() if k.lower() == 'content-length'), '')
+                    body_size = int(content_length) if content_length.isdigit() else None
+                else:
+                    while body_limit is None or body_size < body_limit:
+                        read_size = BODY_CHUNK_SIZE if body_limit is None else min(BODY_CHUNK_SIZE, body_limit - body_size)
+                        chunk = await reader.read(read_size)
+                        if not chunk:
+                            break
+                        body_size += len(chunk)
+            finally:
+                writer.close()
+
+            location = next((v for k, v in headers.items() if k.lower() == 'location'), None)
+            if status_code in (301, 302, 303, 307, 308) and location and redirects < MAX_REDIRECTS:
+                url = urljoin(url, location)
+                if status_code == 303:
+                    method = 'GET'
+                continue
+
+            return status_code, headers, body_size, url, redirects, peer_cert
+
+    @staticmethod
+    def _get_ssl_info(hostname: str, port: int, peer_cert: Optional[Dict], allow_handshake: bool = True) -> Dict:
+        """
+        Get certificate facts from cache, the serving connection, or a dedicated handshake
+
+        Args:
+            hostname: Hostname of the device
+            port: HTTPS port
+            peer_cert: Certificate captured from the serving connection, if any
+            allow_handshake: Fall back to a separate TLS handshake when nothing else is available
+
+        Returns:
+            SSL certificate information
+        """
+        ssl_info = certificate_cache.get(hostname, port)
+        if ssl_info is not None:
+            return ssl_info
+
+        if peer_cert:
+            ssl_info = HTTPService._parse_certificate(peer_cert)
+        elif allow_handshake:
+            ssl_info = HTTPService._check_ssl_certificate(hostname, port)
+        else:
+            return {}
+
+        certificate_cache.set(hostname, port, ssl_info)
+        return ssl_info
+
+    @staticmethod
+    def _parse_certificate(cert: Dict) -> Dict:
+        """
+        Extract certificate details from a decoded peer certificate
+
+        Args:
+            cert: Certificate dict as returned by SSLSocket.getpeercert()
+
+        Returns:
+            SSL certificate information
+        """
+        # Parse dates
+        not_before = datetime.strptime(cert['notBefore'], '%b %d %H:%M:%S %Y %Z')
+        not_after = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
+
+        days_until_expiry = (not_after - datetime.now()).days
+
+        return {
+            'subject': dict(x[0] for x in cert['subject']),
+            'issuer': dict(x[0] for x in cert['issuer']),
+            'version': cert['version'],
+            'not_before': not_before.isoformat(),
+            'not_after': not_after.isoformat(),
+            'days_until_expiry': days_until_expiry,
+            'expired': days_until_expiry < 0
+        }
+
     @staticmethod
     def _check_ssl_certificate(hostname: str, port: int) -> Dict:
         """
@@ -98,29 +621,17 @@ class HTTPService:
         """
         try:
             import socket
-            from datetime import datetime
 
             context = ssl.create_default_context()
             with socket.create_connection((hostname, port), timeout=5) as sock:
                 with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    cert = ssock.getpeercert()
-
-                    # Parse dates
-                    not_before = datetime.strptime(cert['notBefore'], '%b %d %H:%M:%S %Y %Z')
-                    not_after = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
-
-                    days_until_expiry = (not_after - datetime.now()).days
-
-                    return {
-                        'subject': dict(x[0] for x in cert['subject']),
-                        'issuer': dict(x[0] for x in cert['issuer']),
-                        'version': cert['version'],
-                        'not_before': not_before.isoformat(),
-                        'not_after': not_after.isoformat(),
-                        'days_until_expiry': days_until_expiry,
-                        'expired': days_until_expiry < 0
-                    }
+                    return HTTPService._parse_certificate(ssock.getpeercert())
 
         except Exception as e:
             logger.error(f"SSL certificate check failed: {e}")
             return {'error': str(e)}
+
+
+# Global instances
+http_session_pool = HTTPSessionPool(max_sessions=256, idle_timeout=120.0)
+certificate_cache = CertificateCache(refresh_interval=21600)  # 6 hour refresh
@@ -0,0 +1,222 @@
+"""
+PingMonitor Pro v2.3 - Incident Service
+Records downtime incidents from status transitions and computes availability
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import insert, update, or_
+
+from ..models.base import db_manager
+from ..models.incident import Incident
+
+logger = logging.getLogger(__name__)
+
+# Status that opens an incident -> cause
+INCIDENT_CAUSES = {
+    'offline': 'ping',
+    'degraded': 'web'
+}
+
+
+class IncidentStore:
+    """
+    Batched writer and query API for the incidents table
+
+    The engine reports status transitions with record_transition(), which
+    only appends an event to an in-memory list. A writer thread applies the
+    pending events every flush_interval seconds in one transaction:
+    open (insert), escalate (degraded -> offline) and close (set end_ts).
+    """
+
+    def __init__(self, flush_interval: float = 1.0):
+        """
+        Initialize incident store
+
+        Args:
+            flush_interval: Seconds between flushes of pending events
+        """
+        self.flush_interval = flush_interval
+        self.pending: List[Tuple[str, int, int, Optional[str]]] = []  # (event, device_id, ts, status)
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.total_opened = 0
+        self.total_closed = 0
+
+        # Start writer thread
+        self._running = True
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
+    def record_transition(self, device_id: int, old_status: str, new_status: str, ts: Optional[int] = None):
+        """
+        Record a device status transition
+
+        Args:
+            device_id: Device ID
+            old_status: Previous status
+            new_status: New status
+            ts: Transition time (epoch ms), defaults to now
+        """
+        if old_status == new_status:
+            return
+
+        if ts is None:
+            ts = int(time.time() * 1000)
+
+        was_down = old_status in INCIDENT_CAUSES
+        is_down = new_status in INCIDENT_CAUSES
+
+        if is_down and not was_down:
+            event = ('open', device_id, ts, new_status)
+        elif was_down and new_status == 'online':
+            event = ('close', device_id, ts, None)
+        elif was_down and new_status == 'offline':
+            event = ('escalate', device_id, ts, new_status)
+        else:
+            return
+
+        with self.lock:
+            self.pending.append(event)
+
+    def _flush_loop(self):
+        """Writer thread - applies pending events every flush_interval"""
+        while self._running:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Apply pending events to the incidents table"""
+        with self.flush_lock:
+            with self.lock:
+                if not self.pending:
+                    return
+                events, self.pending = self.pending, []
+
+            session = None
+            try:
+                session = db_manager.get_write_session()
+                connection = session.connection()
+                table = Incident.__table__
+
+                # Events must apply in order (open before close for the same device);
+                # consecutive opens are inserted with one executemany
+                opens: List[Dict[str, Any]] = []
+                for event, device_id, ts, status in events:
+                    if event == 'open':
+                        opens.append({'device_id': device_id, 'start_ts': ts, 'cause': INCIDENT_CAUSES[status], 'status': status})
+                        continue
+
+                    if opens:
+                        connection.execute(insert(table), opens)
+                        opens = []
+
+                    open_incident = (table.c.device_id == device_id) & table.c.end_ts.is_(None)
+                    if event == 'close':
+                        connection.execute(update(table).where(open_incident).values(end_ts=ts))
+                    else:
+                        connection.execute(update(table).where(open_incident).values(status=status))
+
+                if opens:
+                    connection.execute(insert(table), opens)
+
+                session.commit()
+
+                self.total_opened += sum(1 for event in events if event[0] == 'open')
+                self.total_closed += sum(1 for event in events if event[0] == 'close')
+                logger.debug(f"[INCIDENTS] Applied {len(events)} incident events")
+
+            except Exception as e:
+                logger.error(f"[INCIDENTS] Failed to write incident events: {e}", exc_info=True)
+                if session is not None:
+                    session.rollback()
+
+                # Retry on next flush, ahead of newer events
+                with self.lock:
+                    self.pending = events + self.pending
+            finally:
+                if session is not None:
+                    session.close()
+
+    def force_flush(self):
+        """Force immediate flush of pending events"""
+        self.flush()
+
+    def stop(self):
+        """Stop writer thread and flush remaining events"""
+        self._running = False
+        self.flush()
+
+    def get_incidents(self, device_id: Optional[int], start_ms: int, end_ms: int) -> List[Incident]:
+        """
+        Get incidents overlapping a time window
+
+        Args:
+            device_id: Device ID, or None for all devices
+            start_ms: Window start (epoch ms)
+            end_ms: Window end (epoch ms)
+
+        Returns:
+            Incidents ordered by start
+        """
+        session = db_manager.get_session()
+        try:
+            query = session.query(Incident).filter(
+                Incident.start_ts < end_ms,
+                or_(Incident.end_ts.is_(None), Incident.end_ts > start_ms)
+            )
+            if device_id is not None:
+                query = query.filter(Incident.device_id == device_id)
+            return query.order_by(Incident.device_id, Incident.start_ts).all()
+        finally:
+            session.close()
+
+    def get_availability(self, device_id: int, start_ms: int, end_ms: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Availability, MTTR and MTBF for a device over a time window
+
+        Downtime clips incidents to the window and counts open incidents until
+        end_ms. MTTR uses the full duration of resolved incidents only.
+
+        Args:
+            device_id: Device ID
+            start_ms: Window start (epoch ms)
+            end_ms: Window end (epoch ms), defaults to now
+
+        Returns:
+            Dict with availability_percentage, downtime_seconds, incidents,
+            open_incidents, mttr_seconds (None without resolved incidents) and
+            mtbf_seconds (None when no incident started in the window)
+        """
+        if end_ms is None:
+            end_ms = int(time.time() * 1000)
+
+        window_ms = max(0, end_ms - start_ms)
+        incidents = self.get_incidents(device_id, start_ms, end_ms)
+
+        downtime_ms = 0
+        for incident in incidents:
+            incident_end = incident.end_ts if incident.end_ts is not None else end_ms
+            downtime_ms += max(0, min(incident_end, end_ms) - max(incident.start_ts, start_ms))
+
+        # Failures = incidents that started inside the window
+        failures = sum(1 for incident in incidents if incident.start_ts >= start_ms)
+        uptime_ms = window_ms - downtime_ms
+
+        repair_times_ms = [incident.end_ts - incident.start_ts for incident in incidents if incident.end_ts is not None]
+
+        return {
+            'availability_percentage': uptime_ms / window_ms * 100 if window_ms else None,
+            'downtime_seconds': downtime_ms / 1000,
+            'incidents': len(incidents),
+            'open_incidents': len(incidents) - len(repair_times_ms),
+            'mttr_seconds': sum(repair_times_ms) / 1000 / len(repair_times_ms) if repair_times_ms else None,
+            'mtbf_seconds': uptime_ms / 1000 / failures if failures else None
+        }
+
+
+# Global instance
+incident_store = IncidentStore(flush_interval=1.0)
@@ -0,0 +1,327 @@
+"""
+PingMonitor Pro v2.3 - Latency Histograms
+Log-bucketed (HDR-style) streaming histograms for response time percentiles
+"""
+
+import math
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+# Bucket layout shared by every histogram so they can be merged:
+# values up to MIN_VALUE_MS land in bucket 0, then each bucket is PRECISION
+# wider than the previous one, up to MAX_VALUE_MS (larger values are clamped)
+MIN_VALUE_MS = 0.01
+MAX_VALUE_MS = 600000.0
+PRECISION = 0.02
+_LOG_BASE = math.log1p(PRECISION)
+BUCKET_COUNT = int(math.log(MAX_VALUE_MS / MIN_VALUE_MS) / _LOG_BASE) + 2
+
+# Coarser layout for the per-device CompactWindowedHistogram (~5% relative error)
+COMPACT_MIN_VALUE_MS = 0.1
+COMPACT_MAX_VALUE_MS = 60000.0
+COMPACT_PRECISION = 0.10
+_COMPACT_LOG_BASE = math.log1p(COMPACT_PRECISION)
+COMPACT_BUCKET_COUNT = int(math.log(COMPACT_MAX_VALUE_MS / COMPACT_MIN_VALUE_MS) / _COMPACT_LOG_BASE) + 2
+_COMPACT_COUNT_MAX = 0xFFFF
+
+
+def bucket_index(value: float) -> int:
+    """Bucket holding value (ms)"""
+    if value is None or value <= MIN_VALUE_MS:
+        return 0
+    return min(BUCKET_COUNT - 1, int(math.log(value / MIN_VALUE_MS) / _LOG_BASE) + 1)
+
+
+def bucket_value(index: int) -> float:
+    """Representative value (geometric midpoint) of a bucket"""
+    if index <= 0:
+        return 0.0
+    return MIN_VALUE_MS * math.exp((index - 0.5) * _LOG_BASE)
+
+
+def compact_bucket_index(value: float) -> int:
+    """Bucket holding value (ms) in the compact layout"""
+    if value is None or value <= COMPACT_MIN_VALUE_MS:
+        return 0
+    return min(COMPACT_BUCKET_COUNT - 1, int(math.log(value / COMPACT_MIN_VALUE_MS) / _COMPACT_LOG_BASE) + 1)
+
+
+def compact_bucket_value(index: int) -> float:
+    """Representative value (geometric midpoint) of a compact-layout bucket"""
+    if index <= 0:
+        return 0.0
+    return COMPACT_MIN_VALUE_MS * math.exp((index - 0.5) * _COMPACT_LOG_BASE)
+
+
+class LatencyHistogram:
+    """
+    Mergeable log-bucketed histogram of response times
+
+    Counts are kept sparsely per bucket index, so memory is bounded by
+    BUCKET_COUNT and proportional to the spread of observed values. Insert is
+    O(1); quantiles are read from cumulative bucket counts with ~1% relative
+    error, without keeping or sorting samples.
+    """
+
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value: float, index: Optional[int] = None):
+        """
+        Record one value
+
+        Args:
+            value: Value in milliseconds
+            index: Precomputed bucket_index(value), to keep callers' lock hold short
+        """
+        if index is None:
+            index = bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add other's counts to this histogram"""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def copy(self) -> 'LatencyHistogram':
+        histogram = LatencyHistogram()
+        histogram.merge(self)
+        return histogram
+
+    def clear(self):
+        self.buckets.clear()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """
+        Values at the given quantiles (0..1), in the order given
+
+        Returns:
+            One value per quantile (0.0 when empty)
+        """
+        qs = list(qs)
+        if not self.count:
+            return [0.0] * len(qs)
+
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        values = [0.0] * len(qs)
+        position = 0
+        cumulative = 0
+
+        for index in sorted(self.buckets):
+            cumulative += self.buckets[index]
+            while position < len(order) and cumulative >= qs[order[position]] * self.count:
+                values[order[position]] = min(max(bucket_value(index), self.min), self.max)
+                position += 1
+            if position == len(order):
+                break
+
+        while position < len(order):
+            values[order[position]] = self.max
+            position += 1
+
+        return values
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def summary(self) -> Dict[str, float]:
+        """p50/p95/p99, min, max and average"""
+        p50, p95, p99 = self.quantiles((0.50, 0.95, 0.99))
+        return {
+            'p50': p50,
+            'p95': p95,
+            'p99': p99,
+            'min': self.min or 0,
+            'max': self.max or 0,
+            'avg': self.total / self.count if self.count else 0,
+            'count': self.count
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable state (see from_state)"""
+        return {
+            'buckets': {str(index): count for index, count in self.buckets.items()},
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'LatencyHistogram':
+        histogram = cls()
+        histogram.buckets = {int(index): count for index, count in state.get('buckets', {}).items()}
+        histogram.count = state.get('count', 0)
+        histogram.total = state.get('total', 0.0)
+        histogram.min = state.get('min')
+        histogram.max = state.get('max')
+        return histogram
+
+
+class WindowedHistogram:
+    """
+    Sliding-window histogram built from a ring of time slots
+
+    The window is split into `slots` sub-histograms of window_seconds / slots
+    each; recording touches only the current slot (reset when its time has
+    passed) and reads merge the slots still inside the window. Memory is
+    fixed at `slots` histograms; the window edge moves in slot-sized steps.
+    """
+
+    __slots__ = ('window_seconds', 'slot_seconds', 'histograms', 'epochs')
+
+    def __init__(self, window_seconds: float, slots: int = 12):
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / slots
+        self.histograms = [LatencyHistogram() for _ in range(slots)]
+        self.epochs = [-1] * slots
+
+    def record(self, value: float, index: Optional[int] = None, now: Optional[float] = None):
+        """Record one value (index as in LatencyHistogram.record)"""
+        epoch = int((time.time() if now is None else now) // self.slot_seconds)
+        slot = epoch % len(self.histograms)
+        if self.epochs[slot] != epoch:
+            self.histograms[slot].clear()
+            self.epochs[slot] = epoch
+        self.histograms[slot].record(value, index)
+
+    def snapshot(self, now: Optional[float] = None) -> LatencyHistogram:
+        """Merged histogram of the slots inside the window"""
+        epoch = int((time.time() if now is None else now) // self.slot_seconds)
+        oldest = epoch - len(self.histograms) + 1
+        merged = LatencyHistogram()
+        for slot_epoch, histogram in zip(self.epochs, self.histograms):
+            if slot_epoch >= oldest:
+                merged.merge(histogram)
+        return merged
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            'window_seconds': self.window_seconds,
+            'epochs': list(self.epochs),
+            'histograms': [histogram.to_state() for histogram in self.histograms]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'WindowedHistogram':
+        windowed = cls(state['window_seconds'], len(state['histograms']))
+        windowed.epochs = list(state['epochs'])
+        windowed.histograms = [LatencyHistogram.from_state(histogram) for histogram in state['histograms']]
+        return windowed
+
+
+class CompactWindowedHistogram:
+    """
+    Fixed-size sliding-window histogram for per-device series
+
+    All slots live in one array of uint16 counts (slots x COMPACT_BUCKET_COUNT,
+    saturating), about 1 KB for 4 slots, so memory per series is constant
+    whatever the latency spread. Slot epochs (time // slot_seconds) are
+    passed in by the owner, which keeps the slot length for all series.
+    """
+
+    __slots__ = ('counts', 'epochs')
+
+    def __init__(self, slots: int = 4):
+        self.counts = array('H', bytes(2 * slots * COMPACT_BUCKET_COUNT))
+        self.epochs = array('q', [-1] * slots)
+
+    def record(self, index: int, epoch: int):
+        """
+        Count one value
+
+        Args:
+            index: compact_bucket_index(value)
+            epoch: Current slot epoch
+        """
+        slot = epoch % len(self.epochs)
+        offset = slot * COMPACT_BUCKET_COUNT
+        if self.epochs[slot] != epoch:
+            for position in range(offset, offset + COMPACT_BUCKET_COUNT):
+                self.counts[position] = 0
+            self.epochs[slot] = epoch
+        if self.counts[offset + index] < _COMPACT_COUNT_MAX:
+            self.counts[offset + index] += 1
+
+    def copy(self) -> 'CompactWindowedHistogram':
+        histogram = CompactWindowedHistogram.__new__(CompactWindowedHistogram)
+        histogram.counts = array('H', self.counts)
+        histogram.epochs = array('q', self.epochs)
+        return histogram
+
+    def bucket_counts(self, epoch: int) -> List[int]:
+        """Per-bucket counts summed over the slots inside the window ending at epoch"""
+        oldest = epoch - len(self.epochs) + 1
+        totals = [0] * COMPACT_BUCKET_COUNT
+        for slot, slot_epoch in enumerate(self.epochs):
+            if oldest <= slot_epoch <= epoch:
+                offset = slot * COMPACT_BUCKET_COUNT
+                for index, count in enumerate(self.counts[offset:offset + COMPACT_BUCKET_COUNT]):
+                    if count:
+                        totals[index] += count
+        return totals
+
+    def summary(self, epoch: int) -> Dict[str, float]:
+        """p50/p95/p99, min, max, average (bucket midpoints) and count for the window"""
+        totals = self.bucket_counts(epoch)
+        count = sum(totals)
+        if not count:
+            return {'p50': 0, 'p95': 0, 'p99': 0, 'min': 0, 'max': 0, 'avg': 0, 'count': 0}
+
+        used = [index for index, bucket_count in enumerate(totals) if bucket_count]
+        values = {}
+        cumulative = 0
+        targets = [('p50', 0.50), ('p95', 0.95), ('p99', 0.99)]
+        for index in used:
+            cumulative += totals[index]
+            while targets and cumulative >= targets[0][1] * count:
+                values[targets.pop(0)[0]] = compact_bucket_value(index)
+
+        return {
+            'p50': values['p50'],
+            'p95': values['p95'],
+            'p99': values['p99'],
+            'min': compact_bucket_value(used[0]),
+            'max': compact_bucket_value(used[-1]),
+            'avg': sum(compact_bucket_value(index) * totals[index] for index in used) / count,
+            'count': count
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """Sparse JSON-serializable state: slot epochs and [position, count] pairs"""
+        return {
+            'epochs': list(self.epochs),
+            'counts': [[position, count] for position, count in enumerate(self.counts) if count]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'CompactWindowedHistogram':
+        histogram = cls(len(state['epochs']))
+        histogram.epochs = array('q', state['epochs'])
+        for position, count in state['counts']:
+            if position < len(histogram.counts):
+                histogram.counts[position] = min(count, _COMPACT_COUNT_MAX)
+        return histogram
@@ -0,0 +1,253 @@
+"""
+PingMonitor Pro v2.3 - Metrics Exporter
+Prometheus text exposition rendered from in-memory state
+"""
+
+import math
+import numbers
+import threading
+import time
+from typing import List, Optional
+import logging
+
+from .latency_histogram import LatencyHistogram, bucket_value
+from .performance_service import performance_metrics, device_cache, batch_writer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Prometheus histogram bucket bounds (ms) - log buckets are folded into these
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+DEVICE_STATUSES = ('online', 'offline', 'degraded', 'unknown')
+
+
+def _escape(value) -> str:
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value) -> str:
+    """Render a sample value without losing precision (large counters stay exact)"""
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class _Writer:
+    """Collects exposition lines, emitting HELP/TYPE once per metric family"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.families = set()
+
+    def family(self, name: str, metric_type: str, help_text: str):
+        if name not in self.families:
+            self.families.add(name)
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {metric_type}")
+
+    def sample(self, name: str, value, **labels):
+        if value is None:
+            return
+        self.lines.append(f"{name}{_labels(**labels)} {_format_value(value)}")
+
+    def histogram(self, name: str, help_text: str, histogram: LatencyHistogram, **labels):
+        """Fold a log-bucketed histogram into fixed le buckets (seconds, per Prometheus convention)"""
+        self.family(name, 'histogram', help_text)
+        cumulative = [0] * len(HISTOGRAM_BOUNDS_MS)
+        for index, count in histogram.buckets.items():
+            value = bucket_value(index)
+            for position, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+                if value <= bound:
+                    cumulative[position] += count
+                    break
+
+        running = 0
+        for bound, count in zip(HISTOGRAM_BOUNDS_MS, cumulative):
+            running += count
+            self.sample(f"{name}_bucket", running, **labels, le=f"{bound / 1000:g}")
+        self.sample(f"{name}_bucket", histogram.count, **labels, le='+Inf')
+        self.sample(f"{name}_sum", histogram.total / 1000, **labels)
+        self.sample(f"{name}_count", histogram.count, **labels)
+
+    def render(self) -> str:
+        return '\n'.join(self.lines) + '\n'
+
+
+def render_metrics(monitoring_engine=None) -> str:
+    """
+    Render all metrics in Prometheus text exposition format
+
+    Reads only in-memory state (engine devices, metrics histograms, writer
+    and cache counters) - never the database.
+
+    Args:
+        monitoring_engine: MonitoringEngine for device status and engine telemetry
+
+    Returns:
+        Exposition text
+    """
+    writer = _Writer()
+
+    if monitoring_engine is not None:
+        devices = list(monitoring_engine.devices.values())
+
+        writer.family('pingmonitor_device_up', 'gauge', 'Device is online (1) or not (0)')
+        for device in devices:
+            writer.sample('pingmonitor_device_up', 1 if device.current_status == 'online' else 0,
+                          device_id=device.id, device=device.name)
+
+        writer.family('pingmonitor_device_status', 'gauge', 'Current device status (1 for the active status)')
+        for device in devices:
+            for status in DEVICE_STATUSES:
+                writer.sample('pingmonitor_device_status', 1 if device.current_status == status else 0,
+                              device_id=device.id, device=device.name, status=status)
+
+        writer.family('pingmonitor_device_response_time_seconds', 'gauge', 'Last check response time')
+        for device in devices:
+            if device.response_time is not None:
+                writer.sample('pingmonitor_device_response_time_seconds', device.response_time / 1000,
+                              device_id=device.id, device=device.name)
+
+        writer.family('pingmonitor_devices', 'gauge', 'Monitored devices by status')
+        for status in DEVICE_STATUSES:
+            writer.sample('pingmonitor_devices', sum(1 for device in devices if device.current_status == status),
+                          status=status)
+
+        statistics = monitoring_engine.get_statistics()
+        writer.family('pingmonitor_engine_checks_total', 'counter', 'Checks processed by the engine')
+        writer.sample('pingmonitor_engine_checks_total', statistics['successful_checks'], result='success')
+        writer.sample('pingmonitor_engine_checks_total', statistics['failed_checks'], result='failure')
+
+        telemetry = monitoring_engine.get_engine_telemetry()
+        writer.family('pingmonitor_engine_task_queue_depth', 'gauge', 'Tasks waiting in the engine task queue')
+        writer.sample('pingmonitor_engine_task_queue_depth', telemetry['task_queue_depth'])
+        writer.family('pingmonitor_engine_result_queue_depth', 'gauge', 'Results waiting for processing')
+        writer.sample('pingmonitor_engine_result_queue_depth', telemetry['result_queue_depth'])
+        writer.family('pingmonitor_engine_in_flight', 'gauge', 'Checks currently executing')
+        writer.sample('pingmonitor_engine_in_flight', telemetry['in_flight'])
+        writer.family('pingmonitor_engine_max_workers', 'gauge', 'Configured concurrent checks')
+        writer.sample('pingmonitor_engine_max_workers', telemetry['max_workers'])
+
+        writer.family('pingmonitor_engine_worker_busy_ratio', 'gauge', 'Share of the utilisation window a worker spent executing checks')
+        for worker, worker_stats in telemetry['workers'].items():
+            writer.sample('pingmonitor_engine_worker_busy_ratio', worker_stats['busy_ratio'], worker=worker)
+
+        help_texts = {
+            'schedule_drift': 'Check start delay behind the scheduled due time',
+            'queue_wait': 'Time tasks spent in the engine task queue',
+            'service_time': 'Time spent inside check services',
+            'process_time': 'Time spent processing check results'
+        }
+        for name, histogram in monitoring_engine.telemetry.get_histograms().items():
+            writer.histogram(f'pingmonitor_engine_{name}_seconds', help_texts[name], histogram)
+
+    for check_type, histogram in sorted(performance_metrics.get_histograms().items()):
+        writer.histogram('pingmonitor_check_response_time_seconds', 'Check response time by check type',
+                         histogram, check_type=check_type)
+
+    batch_stats = batch_writer.get_stats()
+    writer.family('pingmonitor_batch_queue_depth', 'gauge', 'Check results waiting for the batch writer')
+    writer.sample('pingmonitor_batch_queue_depth', batch_stats['queue_depth'])
+    writer.family('pingmonitor_batch_queue_capacity', 'gauge', 'Batch writer queue capacity')
+    writer.sample('pingmonitor_batch_queue_capacity', batch_stats['max_queue_size'])
+    writer.family('pingmonitor_batch_records_total', 'counter', 'Check results written by the batch writer')
+    writer.sample('pingmonitor_batch_records_total', batch_stats['total_records'])
+    writer.family('pingmonitor_batch_flushes_total', 'counter', 'Batches flushed')
+    writer.sample('pingmonitor_batch_flushes_total', batch_stats['total_batches'])
+    writer.family('pingmonitor_batch_failed_flushes_total', 'counter', 'Batch write attempts that failed')
+    writer.sample('pingmonitor_batch_failed_flushes_total', batch_stats['failed_batches'])
+    writer.family('pingmonitor_batch_dropped_records_total', 'counter', 'Check results dropped (queue full or rejected)')
+    writer.sample('pingmonitor_batch_dropped_records_total', batch_stats['dropped_records'])
+    writer.family('pingmonitor_batch_flush_seconds', 'gauge', 'Batch flush latency')
+    writer.sample('pingmonitor_batch_flush_seconds', batch_stats['last_flush_ms'] / 1000, stat='last')
+    writer.sample('pingmonitor_batch_flush_seconds', batch_stats['avg_flush_ms'] / 1000, stat='avg')
+    writer.sample('pingmonitor_batch_flush_seconds', batch_stats['max_flush_ms'] / 1000, stat='max')
+
+    writer.family('pingmonitor_device_cache_requests_total', 'counter', 'Device cache lookups')
+    writer.sample('pingmonitor_device_cache_requests_total', device_cache.hits, result='hit')
+    writer.sample('pingmonitor_device_cache_requests_total', device_cache.misses, result='miss')
+    writer.family('pingmonitor_device_cache_hit_ratio', 'gauge', 'Device cache hit ratio')
+    writer.sample('pingmonitor_device_cache_hit_ratio', device_cache.get_hit_rate() / 100)
+
+    return writer.render()
+
+
+class MetricsExporter:
+    """
+    Pre-rendered Prometheus metrics
+
+    A background thread re-renders the exposition every interval seconds;
+    scrapes return the latest rendered bytes, so scrape cost does not depend
+    on device count and never touches the database.
+    """
+
+    def __init__(self, monitoring_engine=None, interval: float = 5.0):
+        """
+        Initialize metrics exporter
+
+        Args:
+            monitoring_engine: MonitoringEngine for device status and engine telemetry
+            interval: Seconds between snapshot renders
+        """
+        self.monitoring_engine = monitoring_engine
+        self.interval = interval
+        self.body = b''
+        self.rendered_at = 0.0
+        self.last_render_ms = 0.0
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Render once and start the refresh thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self.refresh()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name='metrics-exporter')
+        self._thread.start()
+
+    def stop(self):
+        """Stop the refresh thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _run_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.refresh()
+
+    def refresh(self):
+        """Render a new snapshot"""
+        try:
+            start_time = time.perf_counter()
+            text = render_metrics(self.monitoring_engine)
+            self.last_render_ms = (time.perf_counter() - start_time) * 1000
+            text += (f"# HELP pingmonitor_metrics_render_seconds Time to render this snapshot\n"
+                     f"# TYPE pingmonitor_metrics_render_seconds gauge\n"
+                     f"pingmonitor_metrics_render_seconds {self.last_render_ms / 1000:.6g}\n")
+            # Single reference swap - scrapes never see a partial body
+            self.body = text.encode('utf-8')
+            self.rendered_at = time.time()
+        except Exception as e:
+            logger.error(f"[METRICS] Failed to render metrics: {e}", exc_info=True)
+
+    def get_body(self) -> bytes:
+        """Latest rendered exposition"""
+        return self.body
@@ -3,25 +3,71 @@ PingMonitor Pro v2.3 - High-Performance Optimization Service
 Implements CLAUDE-MD high-performance patterns:
 - Multi-layer caching for device configurations
 - Batch database operations
+- Write-behind device state persistence
 - Performance metrics tracking (p50/p95/p99)
 - Memory optimization
 """
 
+import gzip
+import json
 import logging
 import threading
 import time
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from pathlib import Path
+from queue import Queue, Empty
 import statistics
 
+from sqlalchemy import insert, update, select, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+
 from ..models.base import db_manager
 from ..models.device import Device
-from ..models.check_result import CheckResult
+from ..models.check_result import CheckResult, CheckType, LatestCheckResult, to_epoch_ms, encode_check_data
+from .result_journal import ResultJournal
+from .latency_histogram import (
+    LatencyHistogram, WindowedHistogram, CompactWindowedHistogram, bucket_index, compact_bucket_index
+)
 
 logger = logging.getLogger(__name__)
 
 
+def carried_sample_times(check_ts: int, next_ts: Optional[int], interval_ms: int, max_gap_ms: int) -> range:
+    """
+    Times of the checks change-only storage skipped after a stored row
+
+    A stored row stands for one check every interval_ms after it, for at most
+    max_gap_ms (the keyframe interval), until the next stored row of the same
+    device and check type. Real checks land a few ms after the interval
+    multiple, so a slot within half an interval of the next stored row is
+    that row's own check, not a skipped one. Shared by HistoryService.expand
+    and the statistics rollup so both count the same checks.
+
+    Args:
+        check_ts: Stored row time (epoch ms)
+        next_ts: Next stored row time (epoch ms), None if there is none yet
+        interval_ms: Check interval
+        max_gap_ms: Longest span a row is carried forward
+
+    Returns:
+        Skipped check times (excluding check_ts itself)
+
+    Example (jittered 60 s checks, nothing skipped, then one skipped check):
+        >>> list(carried_sample_times(0, 60005, 60000, 300000))
+        []
+        >>> list(carried_sample_times(60005, 180011, 60000, 300000))
+        [120005]
+    """
+    interval_ms = max(1, interval_ms)
+    limit = check_ts + max_gap_ms
+    if next_ts is not None:
+        limit = min(limit, next_ts - interval_ms // 2)
+    return range(check_ts + interval_ms, limit, interval_ms)
+
+
 class DeviceCache:
     """
     Multi-layer caching for device configurations with TTL management
@@ -93,127 +139,738 @@ class BatchDatabaseWriter:
     """
     Batch database operations to minimize round trips
     Implements CLAUDE-MD batch query strategy
+
+    Producers (check workers) only enqueue into a bounded queue and never
+    touch the database. A single writer thread drains the queue in adaptive
+    batches: at least batch_size records or flush_interval seconds, and up to
+    max_batch_size records when a backlog builds up. Records are written with
+    one Core executemany INSERT per batch.
+
+    With enable_journal(), every accepted record is first appended to a
+    ResultJournal and the journal is trimmed only after the batch holding it
+    is committed, so results survive a crash and are replayed on startup.
+    A batch the database keeps rejecting is held and retried before the next
+    one (beyond max_queue_size held rows, re-read from the journal instead);
+    the journal is not trimmed past it until it has been written.
+
+    With configure_dedup(), only rows that differ from the last stored row for
+    the same device and check type (success, status code, error, or response
+    time outside the band) are inserted, plus a keyframe at least every
+    keyframe_interval seconds. latest_check_results is still refreshed from
+    every result. services/history_service.py expands the stored rows back
+    into regular samples.
     """
 
-    def __init__(self, batch_size: int = 50, flush_interval: float = 2.0):
+    # Attempts (with backoff) before a batch failing on a database error is held for retry
+    MAX_WRITE_ATTEMPTS = 4
+
+    def __init__(self, batch_size: int = 50, flush_interval: float = 2.0,
+                 max_batch_size: int = 1000, max_queue_size: int = 50000):
         """
         Initialize batch writer
 
         Args:
             batch_size: Number of records to batch before writing
             flush_interval: Seconds between automatic flushes
+            max_batch_size: Upper bound on records written per batch under backlog
+            max_queue_size: Queue capacity; records beyond it are dropped and counted
         """
         self.batch_size = batch_size
         self.flush_interval = flush_interval
-        self.pending_results: List[Dict[str, Any]] = []
-        self.lock = threading.Lock()
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self.queue: Queue = Queue(maxsize=max_queue_size)  # (journal seq, row)
+        self.flush_lock = threading.Lock()  # Serializes writer thread and force_flush
         self.last_flush = time.time()
         self.total_batches = 0
         self.total_records = 0
+        self.failed_batches = 0
+        self.dropped_records = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.flush_latencies: deque = deque(maxlen=100)
+        self._last_drop_log = 0.0
+
+        # Crash-safe journal (see enable_journal)
+        self.journal: Optional[ResultJournal] = None
+        self.replayed_records = 0
+        self._enqueue_lock = threading.Lock()  # Keeps journal order == queue order
+        self._journal_hold: Optional[int] = None  # Highest seq that may be trimmed while batches are held
+        self._held_batches: List[Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]] = []  # (batch, stored rows)
+        self._journal_only: List[List[int]] = []  # [first seq, last seq] of held rows kept only in the journal
 
-        # Start background flush thread
+        # Change-only storage (see configure_dedup); state is only touched by the writer
+        self.dedup_enabled = False
+        self.dedup_response_band_ms = 50.0
+        self.dedup_keyframe_ms = 300000
+        self.deduplicated_records = 0
+        self._dedup_last: Dict[Tuple[int, Any], Dict[str, Any]] = {}  # Last stored row per (device_id, check_type)
+
+        # Start dedicated writer thread
         self._running = True
-        self._flush_thread = threading.Thread(target=self._auto_flush_loop, daemon=True)
+        self._flush_thread = threading.Thread(target=self._writer_loop, daemon=True)
         self._flush_thread.start()
-        logger.info(f"Batch writer started (batch_size={batch_size}, flush_interval={flush_interval}s)")
+        logger.info(f"Batch writer started (batch_size={batch_size}, flush_interval={flush_interval}s, max_queue={max_queue_size})")
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of records waiting to be written"""
+        return self.queue.qsize()
+
+    def enable_journal(self, journal_dir: Path):
+        """
+        Replay results left by a previous run and start journaling new ones
+
+        Call once at startup, before monitoring starts.
+
+        Args:
+            journal_dir: Directory for journal segment files
+        """
+        journal = ResultJournal(journal_dir)
+
+        rows = journal.replay()
+        if rows:
+            logger.info(f"[JOURNAL] Replaying {len(rows)} uncommitted check results")
+            try:
+                self.replayed_records = self._replay_rows([self._row_from_journal(row) for row in rows])
+            except Exception as e:
+                # Keep the files for the next startup rather than losing them
+                logger.error(f"[JOURNAL] Replay failed, journal left in place: {e}", exc_info=True)
+                return
+
+        journal.open()
+        self.journal = journal
+
+    def configure_dedup(self, enabled: bool, response_band_ms: float = 50.0, keyframe_interval: int = 300):
+        """
+        Enable or disable change-only storage
+
+        Args:
+            enabled: Store only changed results plus periodic keyframes
+            response_band_ms: Response time change (ms) that counts as a change
+            keyframe_interval: Seconds after which an unchanged result is stored anyway
+        """
+        with self.flush_lock:
+            self.dedup_enabled = enabled
+            self.dedup_response_band_ms = response_band_ms
+            self.dedup_keyframe_ms = int(keyframe_interval * 1000)
+            self._dedup_last.clear()
+        logger.info(f"Change-only storage {'enabled' if enabled else 'disabled'} "
+                    f"(band={response_band_ms}ms, keyframe={keyframe_interval}s)")
+
+    @staticmethod
+    def _to_row(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the check_results row for a check result dict"""
+        return {
+            'device_id': result['device_id'],
+            'check_type': result['check_type'],
+            'check_time': result['timestamp'],
+            'check_ts': result.get('check_ts') or to_epoch_ms(result['timestamp']),
+            'success': result.get('success', False),
+            'response_time': result.get('response_time'),
+            'status_code': result.get('status_code'),
+            'error_message': result.get('error'),
+            'check_data': encode_check_data(result.get('data'))
+        }
+
+    @staticmethod
+    def _row_to_journal(row: Dict[str, Any]) -> Dict[str, Any]:
+        journal_row = dict(row)
+        journal_row['check_type'] = row['check_type'].name
+        return journal_row
+
+    @staticmethod
+    def _row_from_journal(journal_row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(journal_row)
+        row['check_type'] = CheckType[journal_row['check_type']]
+        return row
 
     def add_check_result(self, result: Dict[str, Any]):
-        """Add check result to batch queue"""
-        with self.lock:
-            self.pending_results.append(result)
+        """Add check result to batch queue (never blocks on the database)"""
+        row = self._to_row(result)
+
+        with self._enqueue_lock:
+            if not self.queue.full():
+                seq = self.journal.append(self._row_to_journal(row)) if self.journal else 0
+                self.queue.put_nowait((seq, row))
+                return
+
+        self.dropped_records += 1
 
-            # Flush if batch size reached
-            if len(self.pending_results) >= self.batch_size:
-                logger.debug(f"[BATCH] Size threshold reached ({len(self.pending_results)} records)")
-                self._flush()
+        # Rate-limit the warning - under sustained overload this fires per record
+        now = time.time()
+        if now - self._last_drop_log >= 10.0:
+            self._last_drop_log = now
+            logger.warning(f"[BATCH] Queue full ({self.max_queue_size} records) - dropped {self.dropped_records} records so far")
 
-    def _auto_flush_loop(self):
-        """Background thread to periodically flush pending results"""
+    def _writer_loop(self):
+        """Writer thread - drains the queue in adaptive batches"""
         while self._running:
-            time.sleep(0.5)
+            try:
+                first = self.queue.get(timeout=0.5)
+            except Empty:
+                continue
 
-            with self.lock:
-                time_since_flush = time.time() - self.last_flush
+            batch = [first]
+            deadline = time.time() + self.flush_interval
+
+            # Collect until batch_size or flush_interval, whichever comes first
+            while len(batch) < self.batch_size and self._running:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except Empty:
+                    break
+
+            # Under backlog, take whatever is already queued (bounded)
+            self._drain_into(batch, self.max_batch_size)
+
+            with self.flush_lock:
+                self._write_batch(batch)
+
+    def _drain_into(self, batch: List[Tuple[int, Dict[str, Any]]], limit: int):
+        """Move already-queued records into batch without blocking"""
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except Empty:
+                break
+
+    def _insert_rows(self, rows: List[Dict[str, Any]], latest_rows: Optional[List[Dict[str, Any]]] = None):
+        """
+        Insert rows and refresh latest_check_results in one transaction on the writer connection
+
+        Args:
+            rows: Rows to insert into check_results
+            latest_rows: Rows to upsert into latest_check_results (defaults to rows)
+        """
+        session = db_manager.get_write_session()
+        try:
+            # Single executemany INSERT - no ORM object construction or identity map
+            connection = session.connection()
+            if rows:
+                connection.execute(insert(CheckResult.__table__), rows)
+            self._upsert_latest(connection, latest_rows if latest_rows is not None else rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _write_batch(self, batch: List[Tuple[int, Dict[str, Any]]]):
+        """
+        Write one batch of check results to the database
+
+        Database errors (locked, I/O) are retried with backoff; data errors
+        fall back to row-by-row inserts so one bad row cannot sink the batch.
+
+        Args:
+            batch: (journal seq, row) pairs to insert
+        """
+        if not batch:
+            return
+
+        rows = [row for _, row in batch]
+        start_time = time.time()
+
+        if self._held_batches or self._journal_only:
+            self._retry_held_batches()
+
+        stored_rows, dedup_state = self._select_changed_rows(rows) if self.dedup_enabled else (rows, None)
+        deduplicated = len(rows) - len(stored_rows)
+
+        for attempt in range(self.MAX_WRITE_ATTEMPTS):
+            try:
+                self._insert_rows(stored_rows, rows)
+                break
+            except OperationalError as e:
+                self.failed_batches += 1
+                logger.error(f"[BATCH FLUSH ERROR] Failed to write batch of {len(rows)} records (attempt {attempt + 1}): {e}")
+                if attempt + 1 < self.MAX_WRITE_ATTEMPTS:
+                    time.sleep(0.5 * 2 ** attempt)
+            except Exception as e:
+                self.failed_batches += 1
+                logger.error(f"[BATCH FLUSH ERROR] Batch of {len(rows)} records rejected, writing rows individually: {e}")
+                stored_rows = self._insert_rows_individually(stored_rows, rows)
+                if dedup_state is not None:
+                    dedup_state = self._dedup_state_for(stored_rows)
+                break
+        else:
+            # Database unavailable: retry the rows before the next batch
+            self._hold_journal(batch[0][0] - 1)
+            self._hold_batch(batch, stored_rows)
+            return
+
+        if dedup_state is not None:
+            self._dedup_last.update(dedup_state)
+            self.deduplicated_records += deduplicated
+
+        elapsed = (time.time() - start_time) * 1000
+        record_count = len(stored_rows)
+        self.total_batches += 1
+        self.total_records += record_count
+        self.last_flush_ms = elapsed
+        self.max_flush_ms = max(self.max_flush_ms, elapsed)
+        self.flush_latencies.append(elapsed)
+        self.last_flush = time.time()
 
-                # Flush if interval exceeded and we have pending results
-                if time_since_flush >= self.flush_interval and self.pending_results:
-                    logger.debug(f"[BATCH] Time threshold reached ({time_since_flush:.1f}s, {len(self.pending_results)} records)")
-                    self._flush()
+        if self.journal:
+            seq = batch[-1][0]
+            self.journal.commit(seq if self._journal_hold is None else min(seq, self._journal_hold))
 
-    def _flush(self):
-        """Flush pending results to database"""
-        if not self.pending_results:
+        logger.info(f"[BATCH FLUSH] Wrote {record_count} records in {elapsed:.1f}ms (queue: {self.queue_depth}, total: {self.total_records} in {self.total_batches} batches)")
+
+    def _select_changed_rows(self, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[Tuple[int, Any], Dict[str, Any]]]:
+        """
+        Pick the rows change-only storage has to insert
+
+        Args:
+            rows: Batch rows in arrival order
+
+        Returns:
+            (rows to insert, new last stored row per key - applied after commit)
+        """
+        stored = []
+        last_stored: Dict[Tuple[int, Any], Dict[str, Any]] = {}
+
+        for row in rows:
+            key = (row['device_id'], row['check_type'])
+            last = last_stored.get(key) or self._dedup_last.get(key)
+
+            if last is not None and row['check_ts'] < last['check_ts']:
+                # Late row - store it but keep the newer row as reference
+                stored.append(row)
+                continue
+
+            if last is None or self._is_changed(row, last) or row['check_ts'] - last['check_ts'] >= self.dedup_keyframe_ms:
+                stored.append(row)
+                last_stored[key] = row
+
+        return stored, last_stored
+
+    def _is_changed(self, row: Dict[str, Any], last: Dict[str, Any]) -> bool:
+        """Whether row differs from the last stored row beyond the configured band"""
+        if (row['success'] != last['success'] or
+                row['status_code'] != last['status_code'] or
+                row['error_message'] != last['error_message']):
+            return True
+
+        response_time, last_response_time = row['response_time'], last['response_time']
+        if response_time is None or last_response_time is None:
+            return response_time is not last_response_time
+        return abs(response_time - last_response_time) > self.dedup_response_band_ms
+
+    @staticmethod
+    def _upsert_latest(connection, rows: List[Dict[str, Any]]):
+        """
+        Upsert the newest row per (device_id, check_type) into latest_check_results
+
+        Args:
+            connection: Connection inside the batch insert transaction
+            rows: Check result rows just inserted
+        """
+        latest: Dict[Tuple[int, Any], Dict[str, Any]] = {}
+        for row in rows:
+            key = (row['device_id'], row['check_type'])
+            current = latest.get(key)
+            if current is None or row['check_ts'] >= current['check_ts']:
+                latest[key] = row
+        if not latest:
             return
 
+        table = LatestCheckResult.__table__
+        statement = sqlite_insert(table)
+        updated_columns = ('check_time', 'check_ts', 'success', 'response_time',
+                           'status_code', 'error_message', 'check_data', 'updated_at')
+        statement = statement.on_conflict_do_update(
+            index_elements=['device_id', 'check_type'],
+            set_={column: statement.excluded[column] for column in updated_columns},
+            # Replayed or late rows never overwrite newer state
+            where=statement.excluded.check_ts >= table.c.check_ts
+        )
+        connection.execute(statement, list(latest.values()))
+
+    def _insert_rows_individually(self, rows: List[Dict[str, Any]],
+                                  latest_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert rows one by one, dropping (and counting) rows the database rejects
+
+        Args:
+            rows: Rows to insert into check_results
+            latest_rows: Rows to upsert into latest_check_results afterwards
+                (the whole batch, including rows change-only storage skipped)
+
+        Returns:
+            Rows actually inserted
+        """
+        inserted = []
+        for row in rows:
+            try:
+                self._insert_rows([row], [])
+                inserted.append(row)
+            except Exception as e:
+                self.dropped_records += 1
+                logger.error(f"[BATCH FLUSH ERROR] Dropped check result for device {row.get('device_id')}: {e}")
+
         try:
-            session = db_manager.get_session()
-            start_time = time.time()
-
-            # Create CheckResult objects in batch
-            check_results = [
-                CheckResult(
-                    device_id=result['device_id'],
-                    check_type=result['check_type'],
-                    check_time=result['timestamp'],
-                    success=result.get('success', False),
-                    response_time=result.get('response_time'),
-                    status_code=result.get('status_code'),
-                    error_message=result.get('error'),
-                    check_data=str(result.get('data', {}))
-                )
-                for result in self.pending_results
-            ]
+            self._insert_rows([], latest_rows)
+        except Exception:
+            for row in latest_rows:
+                try:
+                    self._insert_rows([], [row])
+                except Exception as e:
+                    logger.error(f"[BATCH FLUSH ERROR] Latest result not refreshed for device {row.get('device_id')}: {e}")
 
-            # Batch insert
-            session.bulk_save_objects(check_results)
-            session.commit()
+        return inserted
+
+    def _dedup_state_for(self, rows: List[Dict[str, Any]]) -> Dict[Tuple[int, Any], Dict[str, Any]]:
+        """Newest row per (device_id, check_type) among rows actually inserted"""
+        state: Dict[Tuple[int, Any], Dict[str, Any]] = {}
+        for row in rows:
+            key = (row['device_id'], row['check_type'])
+            last = state.get(key) or self._dedup_last.get(key)
+            if last is None or row['check_ts'] >= last['check_ts']:
+                state[key] = row
+        return state
+
+    def _hold_journal(self, seq: int):
+        """Never trim the journal past seq (rows after it were not written)"""
+        if self.journal and (self._journal_hold is None or seq < self._journal_hold):
+            self._journal_hold = seq
+
+    def _hold_batch(self, batch: List[Tuple[int, Dict[str, Any]]], stored_rows: List[Dict[str, Any]]):
+        """Keep a batch the database rejected for _retry_held_batches"""
+        held_count = sum(len(held_batch) for held_batch, _ in self._held_batches)
+        if held_count + len(batch) > self.max_queue_size:
+            # Bounded like the queue: beyond it only the journal keeps the rows
+            if not self.journal:
+                self.dropped_records += len(batch)
+                logger.error(f"[BATCH FLUSH ERROR] Gave up on {len(batch)} records")
+                return
+
+            first_seq, last_seq = batch[0][0], batch[-1][0]
+            if self._journal_only and self._journal_only[-1][1] + 1 == first_seq:
+                self._journal_only[-1][1] = last_seq
+            else:
+                self._journal_only.append([first_seq, last_seq])
+            logger.error(f"[BATCH FLUSH ERROR] Gave up on {len(batch)} records - kept in journal for retry")
+            return
+
+        self._held_batches.append((batch, stored_rows))
+        logger.error(f"[BATCH FLUSH ERROR] Gave up on {len(batch)} records - held for retry "
+                     f"({held_count + len(batch)} held)")
+
+    def _retry_held_batches(self):
+        """Write held batches in order; release the journal hold once all are written"""
+        while self._held_batches:
+            held_batch, stored_rows = self._held_batches[0]
+            held_rows = [row for _, row in held_batch]
+            try:
+                self._insert_rows(stored_rows, held_rows)
+            except OperationalError as e:
+                logger.warning(f"[BATCH FLUSH ERROR] {len(self._held_batches)} held batches still not written: {e}")
+                return
+            except Exception as e:
+                logger.error(f"[BATCH FLUSH ERROR] Held batch of {len(held_batch)} records rejected, writing rows individually: {e}")
+                stored_rows = self._insert_rows_individually(stored_rows, held_rows)
 
-            elapsed = (time.time() - start_time) * 1000
-            record_count = len(self.pending_results)
-            self.total_batches += 1
-            self.total_records += record_count
+            if self.dedup_enabled:
+                self._dedup_last.update(self._dedup_state_for(stored_rows))
+            self._held_batches.pop(0)
+            self.total_records += len(stored_rows)
+            logger.info(f"[BATCH FLUSH] Wrote {len(stored_rows)} held records")
 
-            logger.info(f"[BATCH FLUSH] Wrote {record_count} records in {elapsed:.1f}ms (total: {self.total_records} in {self.total_batches} batches)")
+        while self._journal_only:
+            first_seq, last_seq = self._journal_only[0]
+            chunk: List[Tuple[int, Dict[str, Any]]] = []
+            for seq, journal_row in self.journal.read_range(first_seq, last_seq):
+                chunk.append((seq, self._row_from_journal(journal_row)))
+                if len(chunk) >= self.max_batch_size:
+                    if not self._write_journal_only_chunk(chunk):
+                        return
+                    chunk = []
+            if chunk and not self._write_journal_only_chunk(chunk):
+                return
+            self._journal_only.pop(0)
 
-            # Clear pending results
-            self.pending_results.clear()
-            self.last_flush = time.time()
+        self._journal_hold = None
+
+    def _write_journal_only_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]]) -> bool:
+        """
+        Write held rows re-read from the journal (all of them - no change-only filtering)
 
+        Returns:
+            False if the database still rejects writes
+        """
+        rows = [row for _, row in chunk]
+        try:
+            self._insert_rows(rows, rows)
+        except OperationalError as e:
+            logger.warning(f"[BATCH FLUSH ERROR] Journal-held records still not written: {e}")
+            return False
         except Exception as e:
-            logger.error(f"[BATCH FLUSH ERROR] Failed to write batch: {e}", exc_info=True)
+            logger.error(f"[BATCH FLUSH ERROR] Journal-held batch of {len(rows)} records rejected, writing rows individually: {e}")
+            rows = self._insert_rows_individually(rows, rows)
+
+        if self.dedup_enabled:
+            self._dedup_last.update(self._dedup_state_for(rows))
+        self._journal_only[0][0] = chunk[-1][0] + 1
+        self.total_records += len(rows)
+        logger.info(f"[BATCH FLUSH] Wrote {len(rows)} journal-held records")
+        return True
+
+    def _replay_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert journal rows not already in the database
+
+        A crash between commit and journal trim can leave committed rows in the
+        journal, so rows matching an existing (device_id, check_ts, check_type)
+        are skipped.
+
+        Returns:
+            Number of rows inserted
+        """
+        session = db_manager.get_write_session()
+        try:
+            new_rows = []
+            for row in rows:
+                exists = session.execute(
+                    select(CheckResult.id).where(
+                        CheckResult.device_id == row['device_id'],
+                        CheckResult.check_ts == row['check_ts'],
+                        CheckResult.check_type == row['check_type']
+                    ).limit(1)
+                ).first()
+                if exists is None:
+                    new_rows.append(row)
+
+            if new_rows:
+                connection = session.connection()
+                connection.execute(insert(CheckResult.__table__), new_rows)
+                self._upsert_latest(connection, new_rows)
+            session.commit()
+
+            logger.info(f"[JOURNAL] Replayed {len(new_rows)} check results ({len(rows) - len(new_rows)} already committed)")
+            return len(new_rows)
+        except Exception:
             session.rollback()
+            raise
         finally:
             session.close()
 
     def force_flush(self):
-        """Force immediate flush of pending results"""
-        with self.lock:
-            if self.pending_results:
-                logger.info(f"[BATCH] Force flush requested ({len(self.pending_results)} records)")
-                self._flush()
+        """Force immediate flush of all queued results"""
+        with self.flush_lock:
+            depth = self.queue_depth
+            if depth:
+                logger.info(f"[BATCH] Force flush requested ({depth} records)")
+
+            if self._held_batches or self._journal_only:
+                self._retry_held_batches()
+
+            while True:
+                batch: List[Tuple[int, Dict[str, Any]]] = []
+                self._drain_into(batch, self.max_batch_size)
+                if not batch:
+                    break
+                self._write_batch(batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer queue and flush statistics"""
+        latencies = list(self.flush_latencies)
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_size': self.max_queue_size,
+            'total_records': self.total_records,
+            'total_batches': self.total_batches,
+            'failed_batches': self.failed_batches,
+            'dropped_records': self.dropped_records,
+            'replayed_records': self.replayed_records,
+            'deduplicated_records': self.deduplicated_records,
+            'last_flush_ms': self.last_flush_ms,
+            'avg_flush_ms': statistics.mean(latencies) if latencies else 0.0,
+            'max_flush_ms': self.max_flush_ms
+        }
 
     def stop(self):
         """Stop batch writer and flush remaining records"""
         self._running = False
+        self._flush_thread.join(timeout=5.0)
         self.force_flush()
+        if self.journal:
+            self.journal.close()
         logger.info("Batch writer stopped")
 
 
-class PerformanceMetrics:
+class DeviceStateStore:
     """
-    Track performance metrics including p50, p95, p99 response times
-    Implements CLAUDE-MD performance monitoring strategy
+    Write-behind store for the live device state columns
+
+    The engine records every check's device state here instead of running a
+    SELECT + UPDATE transaction per result. Only columns that actually changed
+    are marked dirty, and a dedicated writer thread flushes them with one
+    executemany UPDATE per distinct column set every flush_interval seconds.
     """
 
-    def __init__(self, window_size: int = 1000):
+    # Device columns owned by the monitoring engine
+    PERSISTED_COLUMNS = (
+        'current_status',
+        'last_check_time',
+        'last_status_change',
+        'response_time',
+        'total_checks',
+        'successful_checks',
+        'failed_checks',
+        'uptime_percentage',
+        'ping_status',
+        'web_status'
+    )
+
+    def __init__(self, flush_interval: float = 1.0):
         """
-        Initialize performance metrics tracker
+        Initialize device state store
 
         Args:
-            window_size: Number of recent measurements to keep for percentile calculations
+            flush_interval: Seconds between flushes of dirty device state
         """
-        self.window_size = window_size
-        self.response_times: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window_size))
+        self.flush_interval = flush_interval
+        self.state: Dict[int, Dict[str, Any]] = {}  # Authoritative in-memory state
+        self.dirty: Dict[int, Dict[str, Any]] = {}  # Changed columns not yet flushed
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()  # Serializes flushes (writer thread vs force_flush)
+        self.total_flushes = 0
+        self.total_rows = 0
+        self.last_flush_ms = 0.0
+
+        # Start dedicated writer thread
+        self._running = True
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+        logger.info(f"Device state store started (flush_interval={flush_interval}s)")
+
+    def update(self, device: Device):
+        """
+        Record the current state of a device, marking changed columns dirty
+
+        Args:
+            device: Device with updated state
+        """
+        values = {column: getattr(device, column, None) for column in self.PERSISTED_COLUMNS}
+
+        with self.lock:
+            previous = self.state.get(device.id)
+            if previous is None:
+                changed = values
+            else:
+                changed = {column: value for column, value in values.items() if previous.get(column) != value}
+
+            if changed:
+                self.state[device.id] = values
+                self.dirty.setdefault(device.id, {}).update(changed)
+
+    def get(self, device_id: int) -> Optional[Dict[str, Any]]:
+        """Get the latest recorded state of a device"""
+        with self.lock:
+            values = self.state.get(device_id)
+            return dict(values) if values is not None else None
+
+    def _flush_loop(self):
+        """Writer thread - flushes dirty device state every flush_interval"""
+        while self._running:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Write all dirty device state to the database"""
+        with self.flush_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                pending, self.dirty = self.dirty, {}
+
+            # Group rows by changed column set: one executemany per statement shape
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+            for device_id, changed in pending.items():
+                columns = tuple(sorted(changed))
+                row = {f"v_{column}": changed[column] for column in columns}
+                row['device_id'] = device_id
+                groups[columns].append(row)
+
+            session = None
+            try:
+                session = db_manager.get_write_session()
+                start_time = time.time()
+
+                table = Device.__table__
+                for columns, rows in groups.items():
+                    statement = (
+                        update(table)
+                        .where(table.c.id == bindparam('device_id'))
+                        .values({column: bindparam(f"v_{column}") for column in columns})
+                    )
+                    session.connection().execute(statement, rows)
+
+                session.commit()
+
+                elapsed = (time.time() - start_time) * 1000
+                self.total_flushes += 1
+                self.total_rows += len(pending)
+                self.last_flush_ms = elapsed
+                logger.debug(f"[STATE FLUSH] Updated {len(pending)} devices with {len(groups)} statements in {elapsed:.1f}ms")
+
+            except Exception as e:
+                logger.error(f"[STATE FLUSH ERROR] Failed to write device state: {e}", exc_info=True)
+                if session is not None:
+                    session.rollback()
+
+                # Re-queue for the next flush; newer changes take precedence
+                with self.lock:
+                    for device_id, changed in pending.items():
+                        if device_id in self.state:
+                            merged = dict(changed)
+                            merged.update(self.dirty.get(device_id, {}))
+                            self.dirty[device_id] = merged
+            finally:
+                if session is not None:
+                    session.close()
+
+    def force_flush(self):
+        """Force immediate flush of dirty device state"""
+        self.flush()
+
+    def stop(self):
+        """Stop writer thread and flush remaining state"""
+        self._running = False
+        self.flush()
+        logger.info("Device state store stopped")
+
+
+class PerformanceMetrics:
+    """
+    Track performance metrics including p50, p95, p99 response times
+    Implements CLAUDE-MD performance monitoring strategy
+
+    Response times go into log-bucketed streaming histograms (see
+    latency_histogram.py): one for the lifetime and sliding 1m/5m/1h windows
+    per check type. record_check computes the bucket outside the lock and
+    only increments counters under it; readers copy histograms under the
+    lock and compute percentiles after releasing it.
+    """
+
+    # Sliding windows: name -> (seconds, slots)
+    WINDOWS = {
+        '1m': (60, 6),
+        '5m': (300, 10),
+        '1h': (3600, 12)
+    }
+
+    def __init__(self):
+        """Initialize performance metrics tracker"""
+        self.lifetime: Dict[str, LatencyHistogram] = {}
+        self.windows: Dict[str, Dict[str, WindowedHistogram]] = {}
         self.check_counts: Dict[str, int] = defaultdict(int)
         self.success_counts: Dict[str, int] = defaultdict(int)
         self.lock = threading.Lock()
@@ -228,37 +885,72 @@ class PerformanceMetrics:
             response_time: Response time in milliseconds
             success: Whether check succeeded
         """
+        response_time = response_time or 0.0
+        index = bucket_index(response_time)
+        now = time.time()
+
         with self.lock:
-            self.response_times[check_type].append(response_time)
+            histogram = self.lifetime.get(check_type)
+            if histogram is None:
+                histogram = self.lifetime[check_type] = LatencyHistogram()
+                self.windows[check_type] = {
+                    name: WindowedHistogram(seconds, slots) for name, (seconds, slots) in self.WINDOWS.items()
+                }
+
+            histogram.record(response_time, index)
+            for windowed in self.windows[check_type].values():
+                windowed.record(response_time, index, now)
+
             self.check_counts[check_type] += 1
             if success:
                 self.success_counts[check_type] += 1
 
-    def get_percentiles(self, check_type: str) -> Dict[str, float]:
+    def get_histogram(self, check_type: Optional[str] = None, window: Optional[str] = None) -> LatencyHistogram:
         """
-        Calculate p50, p95, p99 percentiles for check type
+        Copy of a response time histogram
 
         Args:
-            check_type: Type of check
+            check_type: Type of check, or None to merge all check types
+            window: '1m', '5m', '1h', or None for lifetime
 
         Returns:
-            Dict with p50, p95, p99 values
+            Histogram snapshot (safe to use without the lock)
         """
+        now = time.time()
+        merged = LatencyHistogram()
         with self.lock:
-            times = list(self.response_times.get(check_type, []))
+            check_types = [check_type] if check_type else list(self.lifetime)
+            for name in check_types:
+                if name not in self.lifetime:
+                    continue
+                if window is None:
+                    merged.merge(self.lifetime[name])
+                else:
+                    merged.merge(self.windows[name][window].snapshot(now))
+        return merged
 
-            if not times:
-                return {'p50': 0, 'p95': 0, 'p99': 0, 'min': 0, 'max': 0, 'avg': 0}
+    def get_histograms(self) -> Dict[str, LatencyHistogram]:
+        """
+        Copies of the lifetime histograms of every check type
 
-            sorted_times = sorted(times)
-            return {
-                'p50': statistics.quantiles(sorted_times, n=2)[0] if len(sorted_times) >= 2 else sorted_times[0],
-                'p95': statistics.quantiles(sorted_times, n=20)[18] if len(sorted_times) >= 20 else sorted_times[-1],
-                'p99': statistics.quantiles(sorted_times, n=100)[98] if len(sorted_times) >= 100 else sorted_times[-1],
-                'min': min(sorted_times),
-                'max': max(sorted_times),
-                'avg': statistics.mean(sorted_times)
-            }
+        Returns:
+            Dict of check type -> histogram snapshot
+        """
+        with self.lock:
+            return {name: histogram.copy() for name, histogram in self.lifetime.items()}
+
+    def get_percentiles(self, check_type: str, window: Optional[str] = None) -> Dict[str, float]:
+        """
+        Calculate p50, p95, p99 percentiles for check type
+
+        Args:
+            check_type: Type of check
+            window: '1m', '5m', '1h', or None for lifetime
+
+        Returns:
+            Dict with p50, p95, p99, min, max, avg and count
+        """
+        return self.get_histogram(check_type, window).summary()
 
     def get_throughput(self, check_type: str = None) -> float:
         """
@@ -270,15 +962,16 @@ class PerformanceMetrics:
         Returns:
             Checks per second
         """
-        with self.lock:
-            elapsed = time.time() - self.start_time
-            if elapsed == 0:
-                return 0
+        elapsed = time.time() - self.start_time
+        if elapsed == 0:
+            return 0
 
+        with self.lock:
             if check_type:
-                return self.check_counts.get(check_type, 0) / elapsed
+                count = self.check_counts.get(check_type, 0)
             else:
-                return sum(self.check_counts.values()) / elapsed
+                count = sum(self.check_counts.values())
+        return count / elapsed
 
     def get_success_rate(self, check_type: str) -> float:
         """
@@ -292,31 +985,57 @@ class PerformanceMetrics:
         """
         with self.lock:
             total = self.check_counts.get(check_type, 0)
-            if total == 0:
-                return 0
             success = self.success_counts.get(check_type, 0)
-            return (success / total) * 100
+        if total == 0:
+            return 0
+        return (success / total) * 100
 
     def get_summary(self) -> Dict[str, Any]:
-        """Get comprehensive performance summary"""
+        """
+        Get comprehensive performance summary
+
+        Counters and histograms are copied under the lock in one pass;
+        percentiles are computed after it is released.
+        """
+        now = time.time()
         with self.lock:
-            summary = {
-                'uptime_seconds': time.time() - self.start_time,
-                'total_checks': sum(self.check_counts.values()),
-                'throughput_cps': self.get_throughput(),
-                'check_types': {}
+            check_counts = dict(self.check_counts)
+            success_counts = dict(self.success_counts)
+            lifetime = {name: histogram.copy() for name, histogram in self.lifetime.items()}
+            windows = {
+                name: {window: windowed.snapshot(now) for window, windowed in check_windows.items()}
+                for name, check_windows in self.windows.items()
             }
 
-            for check_type in self.check_counts.keys():
-                percentiles = self.get_percentiles(check_type)
-                summary['check_types'][check_type] = {
-                    'count': self.check_counts[check_type],
-                    'success_rate': self.get_success_rate(check_type),
-                    'throughput': self.get_throughput(check_type),
-                    'response_times': percentiles
-                }
+        elapsed = now - self.start_time
+        overall = LatencyHistogram()
+        overall_windows = {window: LatencyHistogram() for window in self.WINDOWS}
+
+        summary = {
+            'uptime_seconds': elapsed,
+            'total_checks': sum(check_counts.values()),
+            'throughput_cps': sum(check_counts.values()) / elapsed if elapsed else 0,
+            'check_types': {}
+        }
 
-            return summary
+        for check_type, count in check_counts.items():
+            overall.merge(lifetime[check_type])
+            for window, histogram in windows[check_type].items():
+                overall_windows[window].merge(histogram)
+
+            summary['check_types'][check_type] = {
+                'count': count,
+                'success_rate': success_counts.get(check_type, 0) / count * 100 if count else 0,
+                'throughput': count / elapsed if elapsed else 0,
+                'response_times': lifetime[check_type].summary(),
+                'windows': {window: histogram.summary() for window, histogram in windows[check_type].items()}
+            }
+
+        # All check types merged
+        summary['response_times'] = overall.summary()
+        summary['windows'] = {window: histogram.summary() for window, histogram in overall_windows.items()}
+
+        return summary
 
     def log_summary(self):
         """Log performance summary"""
@@ -343,7 +1062,153 @@ class PerformanceMetrics:
         logger.info("=" * 80)
 
 
+class DeviceLatencyTracker:
+    """
+    Per-device, per-check-type response time histograms over a sliding window
+
+    Each (device_id, check_type) series is a CompactWindowedHistogram: a fixed
+    ~1 KB array, so memory grows only with the number of series and is capped
+    at max_series (least recently updated series are evicted). Only
+    successful checks are recorded, so timeouts do not skew SLA percentiles.
+    State is saved on shutdown and restored on startup with save()/load().
+    """
+
+    def __init__(self, window_seconds: int = 3600, slots: int = 4, max_series: int = 100000):
+        """
+        Initialize device latency tracker
+
+        Args:
+            window_seconds: Sliding window length
+            slots: Window slots (the window moves in window_seconds / slots steps)
+            max_series: Maximum number of (device, check type) series kept
+        """
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.slot_seconds = window_seconds / slots
+        self.max_series = max_series
+        self.series: 'OrderedDict[Tuple[int, str], CompactWindowedHistogram]' = OrderedDict()
+        self.evicted_series = 0
+        self.lock = threading.Lock()
+
+    def _epoch(self, now: Optional[float] = None) -> int:
+        return int((time.time() if now is None else now) // self.slot_seconds)
+
+    def record(self, device_id: int, check_type: str, response_time: float):
+        """
+        Record a successful check's response time
+
+        Args:
+            device_id: Device ID
+            check_type: Type of check (PING, HTTP, etc.)
+            response_time: Response time in milliseconds
+        """
+        index = compact_bucket_index(response_time)
+        epoch = self._epoch()
+        key = (device_id, check_type)
+
+        with self.lock:
+            histogram = self.series.get(key)
+            if histogram is None:
+                histogram = self.series[key] = CompactWindowedHistogram(self.slots)
+                if len(self.series) > self.max_series:
+                    self.series.popitem(last=False)
+                    self.evicted_series += 1
+            else:
+                self.series.move_to_end(key)
+            histogram.record(index, epoch)
+
+    def get_percentiles(self, device_id: int, check_type: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Sliding-window percentiles for a device
+
+        Args:
+            device_id: Device ID
+            check_type: Type of check, or None for every check type of the device
+
+        Returns:
+            Dict of check type -> p50/p95/p99/min/max/avg/count
+        """
+        epoch = self._epoch()
+        with self.lock:
+            if check_type is None:
+                keys = [key for key in self.series if key[0] == device_id]
+            else:
+                keys = [(device_id, check_type)] if (device_id, check_type) in self.series else []
+            histograms = {key[1]: self.series[key].copy() for key in keys}
+
+        return {name: histogram.summary(epoch) for name, histogram in histograms.items()}
+
+    def remove_device(self, device_id: int):
+        """Drop all series of a device"""
+        with self.lock:
+            for key in [key for key in self.series if key[0] == device_id]:
+                del self.series[key]
+
+    def save(self, path: Path):
+        """
+        Write all series to a gzipped JSON file (sparse counts only)
+
+        Args:
+            path: Target file
+        """
+        with self.lock:
+            series = [
+                {'device_id': key[0], 'check_type': key[1], 'histogram': histogram.to_state()}
+                for key, histogram in self.series.items()
+            ]
+
+        state = {'window_seconds': self.window_seconds, 'slots': self.slots, 'series': series}
+        partial_path = Path(str(path) + '.tmp')
+        with gzip.open(partial_path, 'wt', encoding='utf-8') as file:
+            json.dump(state, file, separators=(',', ':'))
+        partial_path.replace(path)
+        logger.info(f"[LATENCY] Saved {len(series)} device latency histograms to {path}")
+
+    def load(self, path: Path):
+        """
+        Restore series saved by save(); ignored if missing or saved with another window layout
+
+        Args:
+            path: File written by save()
+        """
+        path = Path(path)
+        if not path.exists():
+            return
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                state = json.load(file)
+        except Exception as e:
+            logger.warning(f"[LATENCY] Could not read {path}: {e}")
+            return
+
+        if state.get('window_seconds') != self.window_seconds or state.get('slots') != self.slots:
+            logger.info("[LATENCY] Saved histograms use a different window - not restored")
+            return
+
+        with self.lock:
+            for item in state.get('series', [])[-self.max_series:]:
+                key = (item['device_id'], item['check_type'])
+                self.series[key] = CompactWindowedHistogram.from_state(item['histogram'])
+                self.series.move_to_end(key)
+            while len(self.series) > self.max_series:
+                self.series.popitem(last=False)
+
+        logger.info(f"[LATENCY] Restored {len(state.get('series', []))} device latency histograms")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Series count and eviction statistics"""
+        with self.lock:
+            return {
+                'series': len(self.series),
+                'max_series': self.max_series,
+                'evicted_series': self.evicted_series
+            }
+
+
 # Global instances
 device_cache = DeviceCache(ttl_seconds=300)  # 5 minute TTL
 batch_writer = BatchDatabaseWriter(batch_size=50, flush_interval=2.0)
-performance_metrics = PerformanceMetrics(window_size=1000)
+device_state_store = DeviceStateStore(flush_interval=1.0)
+performance_metrics = PerformanceMetrics()
+device_latency = DeviceLatencyTracker(window_seconds=3600, slots=4)
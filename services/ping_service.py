@@ -2,20 +2,156 @@
 PingMonitor Pro v2.0 - Ping Check Service
 """
 
+import asyncio
+import ipaddress
 import platform
+import socket
 import subprocess
 import time
-from typing import Dict
+from typing import Dict, List
 import logging
 
 try:
-    from icmplib import ping as icmplib_ping
+    from icmplib import ping as icmplib_ping, async_ping as icmplib_async_ping
+    from icmplib import ICMPv4Socket, ICMPRequest
+    from icmplib.exceptions import ICMPError, TimeoutExceeded
+    from icmplib.utils import unique_identifier
     ICMPLIB_AVAILABLE = True
 except ImportError:
     ICMPLIB_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# ICMP sequence numbers are 16-bit: one batch socket covers at most this many hosts
+BATCH_SEQUENCE_SPACE = 65536
+
+# Receive buffer for batch sockets, so a burst of replies is not dropped while sending
+BATCH_RCVBUF = 4 * 1024 * 1024
+
+
+class BatchPinger:
+    """
+    Fleet-level ICMP echo prober
+
+    Sends one echo request per host over a single unprivileged ICMP socket and
+    demultiplexes the replies by identifier and sequence number, so a whole
+    batch of hosts costs one round-trip timeout instead of one worker per host.
+    """
+
+    def __init__(self, privileged: bool = False):
+        """
+        Initialize batch pinger
+
+        Args:
+            privileged: Use a raw socket instead of an unprivileged datagram socket
+        """
+        self.privileged = privileged
+
+    def is_available(self) -> bool:
+        """Check whether an ICMP socket can be opened on this system"""
+        if not ICMPLIB_AVAILABLE:
+            return False
+        try:
+            with ICMPv4Socket(privileged=self.privileged):
+                return True
+        except Exception as e:
+            logger.info(f"Batch ICMP socket unavailable: {e}")
+            return False
+
+    def ping_many(self, addresses: List[str], timeout: float) -> Dict[str, Dict]:
+        """
+        Ping many IPv4 hosts with one echo request each
+
+        Args:
+            addresses: IPv4 addresses to ping
+            timeout: Seconds to wait for replies after the last request is sent
+
+        Returns:
+            Dict mapping address to a check result dictionary
+        """
+        results: Dict[str, Dict] = {}
+        for offset in range(0, len(addresses), BATCH_SEQUENCE_SPACE):
+            results.update(self._ping_slice(addresses[offset:offset + BATCH_SEQUENCE_SPACE], timeout))
+        return results
+
+    def _ping_slice(self, addresses: List[str], timeout: float) -> Dict[str, Dict]:
+        """Ping up to BATCH_SEQUENCE_SPACE hosts over one socket"""
+        results: Dict[str, Dict] = {}
+        pending = {}  # (id, sequence) -> ICMPRequest
+        identifier = unique_identifier()
+
+        with ICMPv4Socket(privileged=self.privileged) as sock:
+            try:
+                sock.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, BATCH_RCVBUF)
+            except OSError:
+                pass
+
+            for sequence, address in enumerate(addresses):
+                request = ICMPRequest(destination=address, id=identifier, sequence=sequence)
+                try:
+                    sock.send(request)
+                except Exception as e:
+                    results[address] = self._failure(f"Ping failed: {str(e)}", 0)
+                    continue
+
+                # On Linux datagram sockets the kernel rewrites the identifier;
+                # send() updates the request so the key matches the replies
+                pending[(request.id, request.sequence)] = request
+
+            deadline = time.time() + timeout
+            while pending:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+
+                try:
+                    reply = sock.receive(timeout=remaining)
+                except TimeoutExceeded:
+                    break
+
+                # Raw sockets see every ICMP reply on the host, not just ours
+                request = pending.pop((reply.id, reply.sequence), None)
+                if request is None:
+                    continue
+
+                rtt = (reply.time - request.time) * 1000
+                try:
+                    reply.raise_for_status()
+                except ICMPError as e:
+                    results[request.destination] = self._failure(f"Ping failed: {str(e)}", rtt)
+                    continue
+
+                results[request.destination] = {
+                    'success': True,
+                    'response_time': rtt,
+                    'packet_loss': 0.0,
+                    'packets_sent': 1,
+                    'packets_received': 1,
+                    'data': {
+                        'min_rtt': rtt,
+                        'avg_rtt': rtt,
+                        'max_rtt': rtt,
+                        'jitter': 0.0
+                    }
+                }
+
+        for request in pending.values():
+            results[request.destination] = self._failure('Ping timeout', timeout * 1000)
+
+        return results
+
+    @staticmethod
+    def _failure(error: str, response_time: float) -> Dict:
+        """Build a failed single-probe result"""
+        return {
+            'success': False,
+            'error': error,
+            'response_time': response_time,
+            'packet_loss': 1.0,
+            'packets_sent': 1,
+            'packets_received': 0
+        }
+
 
 class PingService:
     """
@@ -43,6 +179,75 @@ class PingService:
         # Fallback to system ping
         return PingService._ping_system(device)
 
+    @staticmethod
+    def check_many(devices) -> Dict[int, Dict]:
+        """
+        Ping many devices in one batch (MonitoringEngine batch check service)
+
+        IPv4 devices share one ICMP socket; anything else falls back to check().
+
+        Args:
+            devices: Devices to check
+
+        Returns:
+            Dict mapping device ID to check result dictionary
+        """
+        results: Dict[int, Dict] = {}
+        batchable = [d for d in devices if PingService._is_ipv4(d.ip_address)] if ICMPLIB_AVAILABLE else []
+
+        if batchable:
+            timeout = max(d.timeout for d in batchable)
+            try:
+                by_address = batch_pinger.ping_many([d.ip_address for d in batchable], timeout)
+                for device in batchable:
+                    results[device.id] = dict(by_address[device.ip_address])
+            except Exception as e:
+                logger.warning(f"Batch ping failed, falling back to per-device ping: {e}")
+
+        for device in devices:
+            if device.id not in results:
+                results[device.id] = PingService.check(device)
+
+        return results
+
+    @staticmethod
+    def _is_ipv4(address: str) -> bool:
+        """Check whether address is an IPv4 literal"""
+        try:
+            return isinstance(ipaddress.ip_address(address), ipaddress.IPv4Address)
+        except ValueError:
+            return False
+
+    @staticmethod
+    async def async_check(device) -> Dict:
+        """
+        Perform ping check on device as a coroutine (AsyncMonitoringEngine)
+
+        Args:
+            device: Device to check
+
+        Returns:
+            Check result dictionary
+        """
+        if ICMPLIB_AVAILABLE:
+            try:
+                start_time = time.time()
+
+                host = await icmplib_async_ping(
+                    device.ip_address,
+                    count=1,
+                    timeout=device.timeout,
+                    privileged=False
+                )
+
+                return PingService._icmplib_result(host, (time.time() - start_time) * 1000)
+            except Exception as e:
+                logger.debug(f"icmplib async ping failed, falling back to system ping: {e}")
+
+        # Fallback to system ping on the default executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, PingService._ping_system, device)
+
     @staticmethod
     def _ping_icmplib(device) -> Dict:
         """
@@ -66,19 +271,7 @@ class PingService:
 
             response_time = (time.time() - start_time) * 1000
 
-            return {
-                'success': host.is_alive,
-                'response_time': host.avg_rtt if host.is_alive else response_time,
-                'packet_loss': host.packet_loss,
-                'packets_sent': host.packets_sent,
-                'packets_received': host.packets_received,
-                'data': {
-                    'min_rtt': host.min_rtt,
-                    'avg_rtt': host.avg_rtt,
-                    'max_rtt': host.max_rtt,
-                    'jitter': host.jitter
-                }
-            }
+            return PingService._icmplib_result(host, response_time)
 
         except Exception as e:
             return {
@@ -87,6 +280,32 @@ class PingService:
                 'response_time': 0
             }
 
+    @staticmethod
+    def _icmplib_result(host, response_time: float) -> Dict:
+        """
+        Convert an icmplib Host into a check result dictionary
+
+        Args:
+            host: icmplib Host result
+            response_time: Measured wall time in milliseconds
+
+        Returns:
+            Check result dictionary
+        """
+        return {
+            'success': host.is_alive,
+            'response_time': host.avg_rtt if host.is_alive else response_time,
+            'packet_loss': host.packet_loss,
+            'packets_sent': host.packets_sent,
+            'packets_received': host.packets_received,
+            'data': {
+                'min_rtt': host.min_rtt,
+                'avg_rtt': host.avg_rtt,
+                'max_rtt': host.max_rtt,
+                'jitter': host.jitter
+            }
+        }
+
     @staticmethod
     def _ping_system(device) -> Dict:
         """
@@ -167,3 +386,7 @@ class PingService:
                 'error': f"Ping failed: {str(e)}",
                 'response_time': 0
             }
+
+
+# Global instance
+batch_pinger = BatchPinger(privileged=False)
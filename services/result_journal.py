@@ -0,0 +1,247 @@
+"""
+PingMonitor Pro v2.3 - Result Journal
+Crash-safe append-only journal for check results awaiting a database commit
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = 'results-'
+SEGMENT_SUFFIX = '.journal'
+
+
+class ResultJournal:
+    """
+    Append-only journal of accepted check result rows
+
+    Every row gets a sequence number and is written (one JSON line) to the
+    active segment file before it is queued for the database. Writes go to the
+    OS immediately, so a killed process loses nothing; a background thread
+    fsyncs every fsync_interval, bounding loss on power failure. Segments
+    rotate at max_segment_bytes; commit(seq) deletes segments whose rows are
+    all committed and truncates the active one once it is fully committed.
+    Whatever is left on disk is returned by replay() on the next startup;
+    read_range() re-reads not yet committed rows while running.
+    """
+
+    def __init__(self, journal_dir: Path, fsync_interval: float = 0.2,
+                 max_segment_bytes: int = 4 * 1024 * 1024):
+        """
+        Initialize journal
+
+        Args:
+            journal_dir: Directory holding journal segment files
+            fsync_interval: Seconds between fsyncs of the active segment
+            max_segment_bytes: Size at which the active segment is rotated
+        """
+        self.journal_dir = Path(journal_dir)
+        self.fsync_interval = fsync_interval
+        self.max_segment_bytes = max_segment_bytes
+
+        self.lock = threading.Lock()
+        self.last_seq = 0
+        self.committed_seq = 0
+        self.total_fsyncs = 0
+
+        self._file = None
+        self._file_path: Optional[Path] = None
+        self._closed_segments: List[Tuple[Path, int]] = []  # (path, last seq)
+        self._dirty = False
+
+        self._stop_event = threading.Event()
+        self._fsync_thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Startup
+    # ------------------------------------------------------------------
+
+    def _segment_paths(self) -> List[Path]:
+        """Existing segment files, oldest first"""
+        if not self.journal_dir.exists():
+            return []
+        return sorted(self.journal_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    def replay(self) -> List[Dict[str, Any]]:
+        """
+        Read rows left in the journal by a previous run
+
+        A torn final line (crash mid-write) is ignored.
+
+        Returns:
+            Rows in append order
+        """
+        rows = []
+        for path in self._segment_paths():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rows.append(json.loads(line)['row'])
+                    except (ValueError, KeyError):
+                        logger.warning(f"[JOURNAL] Skipping unreadable entry in {path.name}")
+        return rows
+
+    def open(self):
+        """
+        Discard replayed segments and start appending
+
+        Call only after rows returned by replay() are committed.
+        """
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        for path in self._segment_paths():
+            path.unlink()
+
+        with self.lock:
+            self._open_segment()
+
+        self._stop_event.clear()
+        self._fsync_thread = threading.Thread(target=self._fsync_loop, daemon=True, name='result-journal')
+        self._fsync_thread.start()
+        logger.info(f"Result journal opened: {self.journal_dir}")
+
+    def _open_segment(self):
+        """Start a new active segment (lock held)"""
+        self._file_path = self.journal_dir / f"{SEGMENT_PREFIX}{self.last_seq + 1:016d}{SEGMENT_SUFFIX}"
+        self._file = open(self._file_path, 'a', encoding='utf-8')
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+
+    def append(self, row: Dict[str, Any]) -> int:
+        """
+        Append a row
+
+        Args:
+            row: JSON-serializable row
+
+        Returns:
+            Sequence number of the row
+        """
+        line = json.dumps({'row': row}, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+        with self.lock:
+            self.last_seq += 1
+            self._file.write(line)
+            self._file.flush()  # Hand to the OS: survives a process kill
+            self._dirty = True
+
+            if self._file.tell() >= self.max_segment_bytes:
+                self._rotate()
+
+            return self.last_seq
+
+    def _rotate(self):
+        """Close the active segment and open a new one (lock held)"""
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._closed_segments.append((self._file_path, self.last_seq))
+        self._dirty = False
+        self._open_segment()
+
+    def read_range(self, first_seq: int, last_seq: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Re-read appended rows by sequence number
+
+        For rows the caller no longer holds in memory. The caller must not
+        commit() past first_seq until it is done with them.
+
+        Args:
+            first_seq: First sequence number to return
+            last_seq: Last sequence number to return
+
+        Yields:
+            (seq, row) pairs in append order
+        """
+        with self.lock:
+            # Segment files in order, with their last seq and the bytes holding rows up to it
+            segments = [(path, segment_last_seq, None) for path, segment_last_seq in self._closed_segments]
+            if self._file is not None:
+                segments.append((self._file_path, self.last_seq, self._file.tell()))
+
+        for path, segment_last_seq, size in segments:
+            if segment_last_seq < first_seq:
+                continue
+
+            with open(path, 'rb') as f:
+                lines = (f.read() if size is None else f.read(size)).decode('utf-8').splitlines()
+
+            # Truncation restarts a segment, so number its lines back from its last seq
+            seq = segment_last_seq - len(lines) + 1
+            for line in lines:
+                if seq > last_seq:
+                    return
+                if seq >= first_seq:
+                    try:
+                        yield seq, json.loads(line)['row']
+                    except (ValueError, KeyError):
+                        logger.warning(f"[JOURNAL] Skipping unreadable entry in {path.name}")
+                seq += 1
+
+    # ------------------------------------------------------------------
+    # Commit / durability
+    # ------------------------------------------------------------------
+
+    def commit(self, seq: int):
+        """
+        Mark all rows up to seq as committed to the database
+
+        Args:
+            seq: Highest committed sequence number
+        """
+        with self.lock:
+            if seq <= self.committed_seq:
+                return
+            self.committed_seq = seq
+
+            while self._closed_segments and self._closed_segments[0][1] <= seq:
+                path, _ = self._closed_segments.pop(0)
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.warning(f"[JOURNAL] Failed to remove {path.name}: {e}")
+
+            if self._file is not None and seq >= self.last_seq:
+                self._file.truncate(0)
+                self._file.seek(0)
+                self._dirty = True
+
+    def _fsync_loop(self):
+        """Background group fsync of the active segment"""
+        while not self._stop_event.wait(self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        """fsync the active segment if it has unsynced writes"""
+        with self.lock:
+            if not self._dirty or self._file is None:
+                return
+            fd = os.dup(self._file.fileno())
+            self._dirty = False
+
+        # fsync outside the lock so appends are never blocked by the disk
+        try:
+            os.fsync(fd)
+            self.total_fsyncs += 1
+        except OSError as e:
+            logger.warning(f"[JOURNAL] fsync failed: {e}")
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """Stop fsync thread and close the active segment (uncommitted rows stay on disk)"""
+        self._stop_event.set()
+        if self._fsync_thread:
+            self._fsync_thread.join(timeout=2.0)
+            self._fsync_thread = None
+
+        self.sync()
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
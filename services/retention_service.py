@@ -0,0 +1,225 @@
+"""
+PingMonitor Pro v2.3 - Retention Service
+Purges expired raw check results in small primary key batches
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+
+from sqlalchemy import select, delete, func, text
+
+from ..models.base import db_manager
+from ..models.check_result import CheckResult, to_epoch_ms
+from ..models.statistics import DeviceStatistics, SystemStatistics, RollupWatermark
+from .statistics_service import WATERMARK_NAME
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionService:
+    """
+    Background purge of check results older than database.retention_days
+
+    Raw rows are deleted by primary key range in batches of batch_size, each
+    in its own short transaction on the writer connection with a pause in
+    between, so the UI and batch writer are never locked out for long. Rows
+    above the statistics rollup watermark are never purged, and hourly
+    rollups are kept for statistics_retention_days (daily rollups forever),
+    so trends outlive the raw data. Freed pages are returned with
+    PRAGMA incremental_vacuum when the database uses auto_vacuum=INCREMENTAL.
+    """
+
+    def __init__(self, retention_days: int = 90, statistics_retention_days: int = 365,
+                 interval: float = 3600.0, batch_size: int = 5000, batch_pause: float = 0.05,
+                 vacuum_pages: int = 2000):
+        """
+        Initialize retention service
+
+        Args:
+            retention_days: Days raw check results are kept
+            statistics_retention_days: Days hourly rollups are kept
+            interval: Seconds between purge runs
+            batch_size: Primary key range deleted per transaction
+            batch_pause: Seconds to sleep between delete batches
+            vacuum_pages: Maximum free pages released per incremental vacuum step
+        """
+        self.retention_days = retention_days
+        self.statistics_retention_days = statistics_retention_days
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.vacuum_pages = vacuum_pages
+
+        self.total_deleted = 0
+        self.last_run_seconds = 0.0
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._run_lock = threading.Lock()
+
+    def start(self):
+        """Start background purge thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name='retention')
+        self._thread.start()
+        logger.info(f"Retention service started (retention={self.retention_days} days, interval={self.interval}s)")
+
+    def stop(self):
+        """Stop background purge thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        logger.info("Retention service stopped")
+
+    def _run_loop(self):
+        """Purge shortly after startup, then every interval seconds"""
+        # Let startup (device loading, first checks) settle before purging
+        if self._stop_event.wait(60.0):
+            return
+
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[RETENTION] Purge run failed: {e}", exc_info=True)
+
+            self._stop_event.wait(self.interval)
+
+    def run_once(self) -> int:
+        """
+        Purge expired check results and hourly rollups
+
+        Returns:
+            Number of check results deleted
+        """
+        with self._run_lock:
+            start_time = time.time()
+
+            deleted = self._purge_check_results()
+            stats_deleted = self._purge_statistics()
+
+            if deleted or stats_deleted:
+                self._incremental_vacuum()
+
+            self.total_deleted += deleted
+            self.last_run_seconds = time.time() - start_time
+
+            if deleted or stats_deleted:
+                logger.info(f"[RETENTION] Deleted {deleted} check results and {stats_deleted} hourly statistics in {self.last_run_seconds:.1f}s")
+
+            return deleted
+
+    def _purge_check_results(self) -> int:
+        """Delete expired check results in primary key batches"""
+        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+        cutoff_iso = cutoff.isoformat()
+
+        session = db_manager.get_session()
+        try:
+            min_id = session.execute(select(func.min(CheckResult.id))).scalar()
+
+            # First id still inside retention (check_time index seek); ids grow with time
+            boundary_id = session.execute(
+                select(CheckResult.id)
+                .where(CheckResult.check_time >= cutoff_iso)
+                .order_by(CheckResult.check_time)
+                .limit(1)
+            ).scalar()
+            if boundary_id is None:
+                boundary_id = (session.execute(select(func.max(CheckResult.id))).scalar() or 0) + 1
+
+            # Never purge rows the statistics rollup has not consumed yet
+            watermark = session.get(RollupWatermark, WATERMARK_NAME)
+            rolled_up_id = watermark.last_id if watermark else 0
+        finally:
+            session.close()
+
+        end_id = min(boundary_id, rolled_up_id + 1)
+        if min_id is None or min_id >= end_id:
+            return 0
+
+        deleted = 0
+        for batch_start in range(min_id, end_id, self.batch_size):
+            if self._stop_event.is_set():
+                break
+
+            batch_end = min(batch_start + self.batch_size, end_id)
+            session = db_manager.get_write_session()
+            try:
+                result = session.execute(
+                    delete(CheckResult).where(
+                        CheckResult.id >= batch_start,
+                        CheckResult.id < batch_end,
+                        CheckResult.check_time < cutoff_iso
+                    )
+                )
+                session.commit()
+                deleted += result.rowcount
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+            # Give the batch writer and UI a turn at the database
+            time.sleep(self.batch_pause)
+
+        return deleted
+
+    def _purge_statistics(self) -> int:
+        """Delete hourly rollups older than statistics_retention_days"""
+        cutoff_ms = to_epoch_ms(datetime.utcnow() - timedelta(days=self.statistics_retention_days))
+
+        session = db_manager.get_write_session()
+        try:
+            deleted = 0
+            for model in (DeviceStatistics, SystemStatistics):
+                result = session.execute(
+                    delete(model).where(model.period == 'hour', model.bucket_ts < cutoff_ms)
+                )
+                deleted += result.rowcount
+            session.commit()
+            return deleted
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _incremental_vacuum(self):
+        """Return free pages to the filesystem in bounded steps"""
+        session = db_manager.get_write_session()
+        try:
+            if session.get_bind().dialect.name != 'sqlite':
+                return
+
+            if session.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+                # Databases created before the SQLite profile keep auto_vacuum=NONE
+                logger.warning("[RETENTION] auto_vacuum is not INCREMENTAL - database file will not shrink; "
+                               "run migrate_enable_incremental_vacuum.py with the application closed")
+                return
+
+            # incremental_vacuum frees one page per result row stepped, so a plain
+            # execute() stops after the first page; executescript() runs it to the end
+            raw_connection = session.connection().connection.dbapi_connection
+
+            while not self._stop_event.is_set():
+                free_pages = session.execute(text("PRAGMA freelist_count")).scalar() or 0
+                if free_pages == 0:
+                    break
+
+                raw_connection.executescript(f"PRAGMA incremental_vacuum({min(free_pages, self.vacuum_pages)});")
+                session.commit()
+                time.sleep(self.batch_pause)
+        except Exception as e:
+            logger.warning(f"[RETENTION] Incremental vacuum failed: {e}")
+            session.rollback()
+        finally:
+            session.close()
@@ -0,0 +1,505 @@
+"""
+PingMonitor Pro v2.3 - Statistics Rollup Service
+Incrementally aggregates check_results into hourly and daily
+DeviceStatistics / SystemStatistics buckets
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import aliased
+
+from ..models.base import db_manager
+from ..models.device import Device
+from ..models.check_result import CheckResult, from_epoch_ms
+from ..models.statistics import DeviceStatistics, SystemStatistics, RollupWatermark
+from .performance_service import batch_writer, carried_sample_times
+
+logger = logging.getLogger(__name__)
+
+# Bucket length per rollup period (milliseconds)
+PERIODS = {
+    'hour': 3600 * 1000,
+    'day': 86400 * 1000
+}
+
+WATERMARK_NAME = 'statistics_rollup'
+
+# Epoch ms up to which closed buckets have had their uptime/downtime finalised
+CLOSED_WATERMARK_NAME = 'statistics_rollup_closed'
+
+
+class _Partial:
+    """Aggregate of some check results for one device and bucket"""
+
+    __slots__ = ('performed', 'successful', 'rt_min', 'rt_max', 'rt_sum', 'rt_count')
+
+    def __init__(self, performed=0, successful=0, rt_min=None, rt_max=None, rt_sum=0.0, rt_count=0):
+        self.performed = performed
+        self.successful = successful
+        self.rt_min = rt_min
+        self.rt_max = rt_max
+        self.rt_sum = rt_sum
+        self.rt_count = rt_count
+
+    def merge(self, other: '_Partial'):
+        """Add another partial aggregate into this one"""
+        self.performed += other.performed
+        self.successful += other.successful
+        self.rt_min = _min(self.rt_min, other.rt_min)
+        self.rt_max = _max(self.rt_max, other.rt_max)
+        self.rt_sum += other.rt_sum
+        self.rt_count += other.rt_count
+
+
+def _min(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _max(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+
+class StatisticsRollupService:
+    """
+    Background rollup of raw check results into hourly/daily statistics
+
+    Each run aggregates check_results with id above the stored watermark
+    (in chunks, grouped in SQL per device and hour), merges the partials into
+    existing DeviceStatistics buckets, recomputes the touched SystemStatistics
+    buckets from the device buckets and advances the watermark - all in one
+    transaction per chunk, so rows are never counted twice or rescanned.
+
+    Response time statistics cover successful checks that recorded a response
+    time; uptime/downtime seconds are the elapsed part of the bucket split by
+    the failure ratio. Buckets still open at a run are finalised to their full
+    length by the first run after they close, even if no new rows arrive.
+
+    With change-only storage (BatchDatabaseWriter.configure_dedup) a stored row
+    also stands for the checks that were skipped after it; those are counted
+    when the next stored row of the same device and check type is rolled up.
+    """
+
+    def __init__(self, interval: float = 300.0, chunk_size: int = 50000):
+        """
+        Initialize rollup service
+
+        Args:
+            interval: Seconds between rollup runs
+            chunk_size: Maximum check_results ids aggregated per transaction
+        """
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.total_rows = 0
+        self.last_run_ms = 0.0
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._run_lock = threading.Lock()
+
+    def start(self):
+        """Start background rollup thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name='statistics-rollup')
+        self._thread.start()
+        logger.info(f"Statistics rollup started (interval={self.interval}s)")
+
+    def stop(self):
+        """Stop background rollup thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        logger.info("Statistics rollup stopped")
+
+    def _run_loop(self):
+        """Run a rollup immediately, then every interval seconds"""
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[ROLLUP] Rollup run failed: {e}", exc_info=True)
+
+            self._stop_event.wait(self.interval)
+
+    def get_watermark(self) -> int:
+        """Highest check_results.id already rolled up"""
+        session = db_manager.get_session()
+        try:
+            watermark = session.get(RollupWatermark, WATERMARK_NAME)
+            return watermark.last_id if watermark else 0
+        finally:
+            session.close()
+
+    def run_once(self) -> int:
+        """
+        Roll up all check results above the watermark
+
+        Returns:
+            Number of check_results ids consumed
+        """
+        with self._run_lock:
+            start_time = time.time()
+            consumed = 0
+
+            session = db_manager.get_write_session()
+            try:
+                watermark = session.get(RollupWatermark, WATERMARK_NAME)
+                if watermark is None:
+                    watermark = RollupWatermark(name=WATERMARK_NAME, last_id=0)
+                    session.add(watermark)
+
+                max_id = session.execute(select(func.max(CheckResult.id))).scalar() or 0
+
+                while watermark.last_id < max_id and not self._stop_event.is_set():
+                    low_id = watermark.last_id
+                    high_id = min(max_id, low_id + self.chunk_size)
+
+                    self._roll_up_chunk(session, low_id, high_id)
+                    watermark.last_id = high_id
+                    session.commit()
+
+                    consumed += high_id - low_id
+
+                self._finalise_closed_buckets(session)
+                session.commit()
+
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+            self.last_run_ms = (time.time() - start_time) * 1000
+            self.total_rows += consumed
+            if consumed:
+                logger.info(f"[ROLLUP] Rolled up {consumed} check result ids in {self.last_run_ms:.1f}ms")
+
+            return consumed
+
+    def _roll_up_chunk(self, session, low_id: int, high_id: int):
+        """
+        Aggregate check_results with low_id < id <= high_id into statistics buckets
+
+        Args:
+            session: Write session (committed by the caller)
+            low_id: Exclusive lower id bound
+            high_id: Inclusive upper id bound
+        """
+        hour_ms = PERIODS['hour']
+        day_ms = PERIODS['day']
+
+        hour_bucket = CheckResult.check_ts - (CheckResult.check_ts % hour_ms)
+        success_rt = case((CheckResult.success, CheckResult.response_time))
+
+        rows = session.execute(
+            select(
+                CheckResult.device_id,
+                hour_bucket.label('bucket'),
+                func.count(),
+                func.sum(case((CheckResult.success, 1), else_=0)),
+                func.min(success_rt),
+                func.max(success_rt),
+                func.sum(success_rt),
+                func.count(success_rt)
+            )
+            .where(CheckResult.id > low_id, CheckResult.id <= high_id, CheckResult.check_ts.isnot(None))
+            .group_by(CheckResult.device_id, 'bucket')
+        ).all()
+
+        hourly: Dict[Tuple[int, int], _Partial] = {}
+        for device_id, bucket, performed, successful, rt_min, rt_max, rt_sum, rt_count in rows:
+            hourly[(device_id, bucket)] = _Partial(performed, successful or 0, rt_min, rt_max, rt_sum or 0.0, rt_count)
+
+        if batch_writer.dedup_enabled:
+            for key, partial in self._skipped_check_partials(session, low_id, high_id).items():
+                hourly.setdefault(key, _Partial()).merge(partial)
+
+        partials: Dict[str, Dict[Tuple[int, int], _Partial]] = {'hour': hourly, 'day': {}}
+        for (device_id, bucket), partial in hourly.items():
+            daily = partials['day'].setdefault((device_id, bucket - bucket % day_ms), _Partial())
+            daily.merge(partial)
+
+        now_ms = int(time.time() * 1000)
+        for period, period_partials in partials.items():
+            if period_partials:
+                self._merge_device_buckets(session, period, period_partials, now_ms)
+                self._refresh_system_buckets(session, period, {bucket for _, bucket in period_partials})
+
+    def _skipped_check_partials(self, session, low_id: int, high_id: int) -> Dict[Tuple[int, int], _Partial]:
+        """
+        Hourly partials for checks change-only storage did not insert
+
+        As in HistoryService.expand, a stored row stands for one check every
+        device check interval until the next stored row of the same device and
+        check type, for at most one keyframe interval (carried_sample_times).
+        Each row in the chunk accounts for the skipped checks of the stored row
+        before it.
+
+        Args:
+            session: Write session
+            low_id: Exclusive lower id bound
+            high_id: Inclusive upper id bound
+
+        Returns:
+            Partials keyed by (device_id, hour bucket)
+        """
+        hour_ms = PERIODS['hour']
+        max_gap_ms = batch_writer.dedup_keyframe_ms
+
+        previous = aliased(CheckResult)
+        previous_id = (
+            select(previous.id)
+            .where(
+                previous.device_id == CheckResult.device_id,
+                previous.check_type == CheckResult.check_type,
+                previous.check_ts < CheckResult.check_ts
+            )
+            .order_by(previous.check_ts.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        rows = session.execute(
+            select(CheckResult.check_ts, previous_id, Device.check_interval)
+            .join(Device, Device.id == CheckResult.device_id)
+            .where(CheckResult.id > low_id, CheckResult.id <= high_id, CheckResult.check_ts.isnot(None))
+        ).all()
+
+        # Fetch the predecessors in parameter-limit sized groups
+        previous_ids = list({row_previous_id for _, row_previous_id, _ in rows if row_previous_id is not None})
+        predecessors = {}
+        for start in range(0, len(previous_ids), 10000):
+            for row in session.execute(
+                select(CheckResult.id, CheckResult.device_id, CheckResult.check_ts,
+                       CheckResult.success, CheckResult.response_time)
+                .where(CheckResult.id.in_(previous_ids[start:start + 10000]))
+            ):
+                predecessors[row.id] = row
+
+        partials: Dict[Tuple[int, int], _Partial] = {}
+        for check_ts, row_previous_id, check_interval in rows:
+            stored = predecessors.get(row_previous_id)
+            if stored is None:
+                continue
+
+            interval_ms = (check_interval or 15) * 1000
+            response_time = stored.response_time if stored.success else None
+
+            for sample_ts in carried_sample_times(stored.check_ts, check_ts, interval_ms, max_gap_ms):
+                key = (stored.device_id, sample_ts - sample_ts % hour_ms)
+                partials.setdefault(key, _Partial()).merge(_Partial(
+                    1, 1 if stored.success else 0, response_time, response_time,
+                    response_time or 0.0, 0 if response_time is None else 1
+                ))
+
+        return partials
+
+    def _merge_device_buckets(self, session, period: str, partials: Dict[Tuple[int, int], _Partial], now_ms: int):
+        """Merge partial aggregates into DeviceStatistics rows, creating missing buckets"""
+        bucket_ms = PERIODS[period]
+        device_ids = {device_id for device_id, _ in partials}
+        buckets = {bucket for _, bucket in partials}
+
+        existing = {
+            (row.device_id, row.bucket_ts): row
+            for row in session.query(DeviceStatistics).filter(
+                DeviceStatistics.period == period,
+                DeviceStatistics.bucket_ts.in_(buckets),
+                DeviceStatistics.device_id.in_(device_ids)
+            )
+        }
+
+        for (device_id, bucket), partial in partials.items():
+            row = existing.get((device_id, bucket))
+            if row is None:
+                row = DeviceStatistics(
+                    device_id=device_id,
+                    period=period,
+                    bucket_ts=bucket,
+                    timestamp=from_epoch_ms(bucket).isoformat(),
+                    checks_performed=0,
+                    checks_successful=0,
+                    checks_failed=0
+                )
+                session.add(row)
+            else:
+                # Fold the stored bucket back into the partial (buckets written
+                # before response_time_count existed averaged over successes)
+                rt_count = row.response_time_count
+                if rt_count is None:
+                    rt_count = row.checks_successful or 0
+                partial.merge(_Partial(
+                    row.checks_performed or 0,
+                    row.checks_successful or 0,
+                    row.min_response_time,
+                    row.max_response_time,
+                    (row.avg_response_time or 0.0) * rt_count,
+                    rt_count
+                ))
+
+            row.checks_performed = partial.performed
+            row.checks_successful = partial.successful
+            row.checks_failed = partial.performed - partial.successful
+            row.min_response_time = partial.rt_min
+            row.max_response_time = partial.rt_max
+            row.avg_response_time = partial.rt_sum / partial.rt_count if partial.rt_count else None
+            row.response_time_count = partial.rt_count
+            row.uptime_percentage = partial.successful / partial.performed * 100 if partial.performed else None
+            self._apply_availability(row, bucket_ms, now_ms)
+
+        session.flush()
+
+    @staticmethod
+    def _apply_availability(row: DeviceStatistics, bucket_ms: int, now_ms: int):
+        """Split the elapsed part of the bucket into uptime/downtime by failure ratio"""
+        elapsed_seconds = min(bucket_ms, max(0, now_ms - row.bucket_ts)) // 1000
+        performed = row.checks_performed or 0
+        downtime = round(elapsed_seconds * (row.checks_failed or 0) / performed) if performed else 0
+
+        row.uptime_seconds = elapsed_seconds - downtime
+        row.downtime_seconds = downtime
+
+    def _finalise_closed_buckets(self, session):
+        """
+        Extend buckets that closed since the last run to their full length
+
+        A bucket is only merged when new rows arrive, so without this the last
+        partial bucket of a device would keep the uptime/downtime elapsed at the
+        run that last touched it.
+
+        Args:
+            session: Write session (committed by the caller)
+        """
+        watermark = session.get(RollupWatermark, CLOSED_WATERMARK_NAME)
+        if watermark is None:
+            watermark = RollupWatermark(name=CLOSED_WATERMARK_NAME, last_id=0)
+            session.add(watermark)
+
+        now_ms = int(time.time() * 1000)
+        finalised = 0
+        for period, bucket_ms in PERIODS.items():
+            # Buckets whose end falls in (last run, now]
+            low_bucket = max(0, watermark.last_id - bucket_ms)
+            high_bucket = now_ms - bucket_ms
+            if high_bucket < low_bucket:
+                continue
+
+            for row in session.query(DeviceStatistics).filter(
+                DeviceStatistics.period == period,
+                DeviceStatistics.timestamp > from_epoch_ms(low_bucket).isoformat(),
+                DeviceStatistics.bucket_ts > low_bucket,
+                DeviceStatistics.bucket_ts <= high_bucket
+            ):
+                self._apply_availability(row, bucket_ms, now_ms)
+                finalised += 1
+
+        watermark.last_id = now_ms
+        session.flush()
+        if finalised:
+            logger.info(f"[ROLLUP] Finalised {finalised} closed buckets")
+
+    def _refresh_system_buckets(self, session, period: str, buckets: set):
+        """Recompute SystemStatistics rows for the given buckets from device buckets"""
+        rt_count = func.coalesce(DeviceStatistics.response_time_count, DeviceStatistics.checks_successful)
+        rows = session.execute(
+            select(
+                DeviceStatistics.bucket_ts,
+                func.count(),
+                func.sum(case((DeviceStatistics.checks_failed == 0, 1), else_=0)),
+                func.sum(case((DeviceStatistics.checks_successful == 0, 1), else_=0)),
+                func.sum(DeviceStatistics.checks_performed),
+                func.sum(DeviceStatistics.checks_successful),
+                func.sum(DeviceStatistics.checks_failed),
+                func.sum(DeviceStatistics.avg_response_time * rt_count),
+                func.sum(case((DeviceStatistics.avg_response_time.isnot(None), rt_count), else_=0)),
+                func.max(DeviceStatistics.max_response_time)
+            )
+            .where(DeviceStatistics.period == period, DeviceStatistics.bucket_ts.in_(buckets))
+            .group_by(DeviceStatistics.bucket_ts)
+        ).all()
+
+        existing = {
+            row.bucket_ts: row
+            for row in session.query(SystemStatistics).filter(
+                SystemStatistics.period == period,
+                SystemStatistics.bucket_ts.in_(buckets)
+            )
+        }
+
+        for bucket, devices, online, offline, performed, successful, failed, rt_total, rt_samples, rt_max in rows:
+            row = existing.get(bucket)
+            if row is None:
+                row = SystemStatistics(period=period, bucket_ts=bucket, timestamp=from_epoch_ms(bucket).isoformat())
+                session.add(row)
+
+            # Per bucket: all checks OK = online, none OK = offline, mixed = degraded
+            row.total_devices = devices
+            row.online_devices = online
+            row.offline_devices = offline
+            row.degraded_devices = devices - online - offline
+            row.total_checks = performed
+            row.successful_checks = successful
+            row.failed_checks = failed
+            row.avg_check_duration = rt_total / rt_samples if rt_samples and rt_total is not None else None
+            row.max_check_duration = rt_max
+
+    def get_device_statistics(self, device_id: int, period: str = 'hour',
+                              start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> List[Dict]:
+        """
+        Get rolled-up statistics for one device
+
+        Args:
+            device_id: Device ID
+            period: 'hour' or 'day'
+            start_ms: Inclusive lower bucket bound (epoch ms)
+            end_ms: Exclusive upper bucket bound (epoch ms)
+
+        Returns:
+            List of bucket dicts ordered by time
+        """
+        session = db_manager.get_session()
+        try:
+            query = session.query(DeviceStatistics).filter(
+                DeviceStatistics.device_id == device_id,
+                DeviceStatistics.period == period
+            )
+            if start_ms is not None:
+                query = query.filter(DeviceStatistics.bucket_ts >= start_ms)
+            if end_ms is not None:
+                query = query.filter(DeviceStatistics.bucket_ts < end_ms)
+
+            return [row.to_dict() for row in query.order_by(DeviceStatistics.bucket_ts)]
+        finally:
+            session.close()
+
+    def get_system_statistics(self, period: str = 'hour',
+                              start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> List[Dict]:
+        """
+        Get rolled-up system-wide statistics
+
+        Args:
+            period: 'hour' or 'day'
+            start_ms: Inclusive lower bucket bound (epoch ms)
+            end_ms: Exclusive upper bucket bound (epoch ms)
+
+        Returns:
+            List of bucket dicts ordered by time
+        """
+        session = db_manager.get_session()
+        try:
+            query = session.query(SystemStatistics).filter(SystemStatistics.period == period)
+            if start_ms is not None:
+                query = query.filter(SystemStatistics.bucket_ts >= start_ms)
+            if end_ms is not None:
+                query = query.filter(SystemStatistics.bucket_ts < end_ms)
+
+            return [row.to_dict() for row in query.order_by(SystemStatistics.bucket_ts)]
+        finally:
+            session.close()
@@ -0,0 +1,113 @@
+"""
+PingMonitor Pro v2.3 - Status Snapshot
+Immutable device status snapshot published by the monitoring engine
+"""
+
+import json
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+DEVICE_STATUSES = ('online', 'offline', 'degraded', 'unknown')
+
+
+def device_state(device) -> Dict[str, Any]:
+    """
+    Plain-dict copy of a device's configuration and live state
+
+    Args:
+        device: Device (attributes are read once, the dict is never shared with it)
+
+    Returns:
+        JSON-serializable dict
+    """
+    state = device.to_dict()
+    state.update({
+        'ping_status': getattr(device, 'ping_status', None),
+        'web_status': getattr(device, 'web_status', None),
+        'last_check_time': device.last_check_time,
+        'last_status_change': device.last_status_change,
+        'total_checks': device.total_checks,
+        'successful_checks': device.successful_checks,
+        'failed_checks': device.failed_checks,
+        'check_interval': device.check_interval
+    })
+    return state
+
+
+class StatusSnapshot:
+    """
+    Point-in-time view of all monitored devices
+
+    Built once by the engine and never modified afterwards, so API handlers
+    can read it from any thread without locks. JSON bodies are encoded on
+    first use and cached on the snapshot.
+    """
+
+    def __init__(self, version: int, epoch: int, devices: List[Dict[str, Any]], statistics: Dict[str, Any]):
+        """
+        Initialize snapshot
+
+        Args:
+            version: Monotonic snapshot version within this engine run
+            epoch: Engine run identifier (distinguishes versions across restarts)
+            devices: Device state dicts (see device_state)
+            statistics: Engine statistics at publish time
+        """
+        self.version = version
+        self.etag = f'"{epoch:x}-{version}"'
+        self.generated_at = datetime.utcnow().isoformat()
+        self.devices = tuple(sorted(devices, key=lambda device: device['id']))
+        self.by_id = {device['id']: device for device in self.devices}
+
+        counts = {status: 0 for status in DEVICE_STATUSES}
+        for device in self.devices:
+            status = device['current_status'] if device['current_status'] in counts else 'unknown'
+            counts[status] += 1
+
+        self.summary = {
+            'version': version,
+            'generated_at': self.generated_at,
+            'total_devices': len(self.devices),
+            'status_counts': counts,
+            'statistics': dict(statistics)
+        }
+
+        self._encoded: Dict[Any, bytes] = {}
+        self._encode_lock = threading.Lock()
+
+    def encode(self, key, build: Callable[[], Any]) -> bytes:
+        """
+        JSON body for key, built and encoded once per snapshot
+
+        Args:
+            key: Cache key (e.g. 'devices', ('device', 7))
+            build: Returns the object to encode on first use
+
+        Returns:
+            UTF-8 JSON bytes
+        """
+        body = self._encoded.get(key)
+        if body is None:
+            with self._encode_lock:
+                body = self._encoded.get(key)
+                if body is None:
+                    body = json.dumps(build(), default=str).encode('utf-8')
+                    self._encoded[key] = body
+        return body
+
+    def devices_body(self) -> bytes:
+        return self.encode('devices', lambda: {
+            'version': self.version,
+            'generated_at': self.generated_at,
+            'devices': list(self.devices)
+        })
+
+    def device_body(self, device_id: int) -> Optional[bytes]:
+        device = self.by_id.get(device_id)
+        if device is None:
+            return None
+        return self.encode(('device', device_id), lambda: device)
+
+    def summary_body(self) -> bytes:
+        return self.encode('summary', lambda: self.summary)
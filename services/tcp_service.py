@@ -0,0 +1,159 @@
+"""
+PingMonitor Pro v2.3 - TCP Port Check Service
+"""
+
+import asyncio
+import time
+import socket
+from typing import Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TCPService:
+    """
+    TCP connect check service
+
+    Ports come from Device.custom_fields: 'tcp_ports' (list of ports or a
+    comma-separated string) or a single 'tcp_port'. Devices without either
+    get no TCP check. The check succeeds only if every port accepts a
+    connection.
+    """
+
+    @staticmethod
+    def get_ports(device) -> List[int]:
+        """
+        Resolve the TCP ports to probe
+
+        Args:
+            device: Device to check
+
+        Returns:
+            Ports from custom_fields (empty = TCP check disabled)
+        """
+        custom_fields = device.custom_fields or {}
+        ports = custom_fields.get('tcp_ports')
+        if ports is None:
+            ports = custom_fields.get('tcp_port')
+        if ports is None or ports == '':
+            return []
+        if isinstance(ports, str):
+            ports = ports.split(',')
+        elif not isinstance(ports, (list, tuple)):
+            ports = [ports]
+
+        resolved = []
+        for port in ports:
+            try:
+                port = int(str(port).strip())
+            except ValueError:
+                logger.warning(f"Invalid TCP port {port!r} for {device.name}")
+                continue
+            if 0 < port < 65536 and port not in resolved:
+                resolved.append(port)
+        return resolved
+
+    @staticmethod
+    def _build_result(ports: List[int], times: Dict[int, float], errors: Dict[int, str]) -> Dict:
+        """Combine per-port outcomes into one check result"""
+        if not ports:
+            return {
+                'success': False,
+                'error': 'No TCP ports configured (custom_fields tcp_ports)',
+                'response_time': 0
+            }
+
+        data = {'ports': {str(port): times.get(port) for port in ports}}
+        if errors:
+            return {
+                'success': False,
+                'error': '; '.join(f"port {port}: {error}" for port, error in errors.items()),
+                'response_time': max(times.values(), default=0),
+                'data': data
+            }
+
+        return {
+            'success': True,
+            'response_time': max(times.values()),
+            'data': data
+        }
+
+    @staticmethod
+    def _connect(host: str, port: int, timeout: float) -> float:
+        """Connect once and return the connect time in ms"""
+        start_time = time.time()
+        with socket.create_connection((host, port), timeout=timeout):
+            return (time.time() - start_time) * 1000
+
+    @staticmethod
+    def check(device) -> Dict:
+        """
+        Perform TCP connect check on every configured port
+
+        Args:
+            device: Device to check
+
+        Returns:
+            Check result dictionary
+        """
+        ports = TCPService.get_ports(device)
+        times: Dict[int, float] = {}
+        errors: Dict[int, str] = {}
+
+        for port in ports:
+            try:
+                times[port] = TCPService._connect(device.ip_address, port, device.timeout)
+            except socket.timeout:
+                errors[port] = 'connect timeout'
+                times[port] = device.timeout * 1000
+            except Exception as e:
+                errors[port] = f'TCP check failed: {str(e)}'
+
+        return TCPService._build_result(ports, times, errors)
+
+    @staticmethod
+    async def _async_connect(host: str, port: int, timeout: float) -> float:
+        """Connect once on the event loop and return the connect time in ms"""
+        start_time = time.time()
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+        response_time = (time.time() - start_time) * 1000
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+        return response_time
+
+    @staticmethod
+    async def async_check(device) -> Dict:
+        """
+        Perform TCP connect check as a coroutine (AsyncMonitoringEngine)
+
+        All configured ports are probed concurrently.
+
+        Args:
+            device: Device to check
+
+        Returns:
+            Check result dictionary
+        """
+        ports = TCPService.get_ports(device)
+        outcomes = await asyncio.gather(
+            *(TCPService._async_connect(device.ip_address, port, device.timeout) for port in ports),
+            return_exceptions=True
+        )
+
+        times: Dict[int, float] = {}
+        errors: Dict[int, str] = {}
+        for port, outcome in zip(ports, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                errors[port] = 'connect timeout'
+                times[port] = device.timeout * 1000
+            elif isinstance(outcome, Exception):
+                errors[port] = f'TCP check failed: {str(outcome)}'
+            else:
+                times[port] = outcome
+
+        return TCPService._build_result(ports, times, errors)
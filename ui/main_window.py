@@ -206,7 +206,7 @@ class MainWindow(QMainWindow):
         self.tab_widget.addTab(self.statistics_tab, "📈 Statistics")
 
         # Performance tab (High-Performance Monitoring)
-        self.performance_tab = PerformancePanel(self)
+        self.performance_tab = PerformancePanel(self, self.monitoring_engine)
         self.tab_widget.addTab(self.performance_tab, "⚡ Performance")
 
         # Logs tab
@@ -11,7 +11,6 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPoint, QThread
 from PyQt6.QtGui import QIcon, QPixmap, QPainter, QBrush, QColor, QAction, QCursor
-from datetime import datetime, timedelta
 import subprocess
 import webbrowser
 from pathlib import Path
@@ -24,15 +23,19 @@ from .settings_widget import SettingsWidget
 from .logs_viewer import LogsViewer
 from .devices_manager import DevicesManager
 from .dashboard_widget import DashboardWidget
+from .performance_panel import PerformancePanel
 from .components.status_indicator import StatusIndicatorCell
 from .design_system import DesignSystem
 from ..services.notification_service import NotificationService
 from ..services.auto_recovery_service import AutoRecoveryService
 from ..services.aggregated_email_service import AggregatedEmailService
 from ..services.export_service import ExportService
+from ..services.archive_service import check_archive
+from ..services.history_service import HistoryService
+from ..services.performance_service import batch_writer
 from ..utils.config_importer import ConfigImporter
 from ..models.device import Device
-from ..models.check_result import CheckResult
+from ..models.check_result import to_epoch_ms
 from ..models.base import db_manager
 import os
 
@@ -502,6 +505,10 @@ class MainWindowV2(QMainWindow):
     self.devices_tab = self._create_devices_tab()
     self.tab_widget.addTab(self.devices_tab, "Dispositivi")
 
+    # Performance tab (batch writer, cache and engine telemetry)
+    self.performance_tab = PerformancePanel(self, self.monitoring_engine)
+    self.tab_widget.addTab(self.performance_tab, "Prestazioni")
+
     # Logs tab
     self.logs_tab = self._create_logs_tab()
     self.tab_widget.addTab(self.logs_tab, "Log")
@@ -791,8 +798,8 @@ class MainWindowV2(QMainWindow):
           break
 
       if device_id:
-        # Reset last check time to force immediate check
-        self.monitoring_engine.last_check_times[device_id] = datetime.utcnow() - timedelta(hours=1)
+        # Move device to the head of the schedule to force immediate check
+        self.monitoring_engine.force_immediate_check(device_id)
         self.status_bar.showMessage(f"Check forzato per {device_ip}", 3000)
         logger.info(f"Forced check for device {device_ip}")
       else:
@@ -1320,11 +1327,9 @@ class MainWindowV2(QMainWindow):
       # Show loading message
       self.status_bar.showMessage(" Esecuzione check istantaneo su tutti i dispositivi...", 30000)
 
-      # Force immediate check by resetting last check times
+      # Force immediate check on all devices
       logger.info("MANUAL CHECK NOW: Forcing immediate check on all devices")
-      for device_id in self.monitoring_engine.devices.keys():
-        # Reset last check time to force immediate check
-        self.monitoring_engine.last_check_times[device_id] = datetime.utcnow() - timedelta(hours=10)
+      self.monitoring_engine.force_immediate_check()
 
       # Update UI
       self._update_ui()
@@ -1470,28 +1475,26 @@ class MainWindowV2(QMainWindow):
       if not file_path:
         return
 
-      # Get check results from database
+      # Get check results from database and archive segments
       from datetime import datetime, timedelta
-      session = db_manager.get_session()
-      try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+      cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        check_results = session.query(CheckResult).filter(
-          CheckResult.check_time >= cutoff_date.isoformat()
-        ).all()
+      if batch_writer.dedup_enabled:
+        # Change-only storage: expand back to one row per check interval
+        check_results = HistoryService.get_samples(None, to_epoch_ms(cutoff_date))
+      else:
+        check_results = check_archive.get_history(None, to_epoch_ms(cutoff_date))
 
-        if not check_results:
-          QMessageBox.warning(
-            self,
-            "Nessun Dato",
-            f"Non ci sono check results negli ultimi {days} giorni."
-          )
-          return
+      if not check_results:
+        QMessageBox.warning(
+          self,
+          "Nessun Dato",
+          f"Non ci sono check results negli ultimi {days} giorni."
+        )
+        return
 
-        # Export
-        success, message = ExportService.export_check_results_to_csv(check_results, file_path)
-      finally:
-        session.close()
+      # Export
+      success, message = ExportService.export_check_results_to_csv(check_results, file_path)
 
       if success:
         QMessageBox.information(
@@ -1676,6 +1679,8 @@ class MainWindowV2(QMainWindow):
         self.update_timer.stop()
       if hasattr(self, 'email_aggregate_timer'):
         self.email_aggregate_timer.stop()
+      if hasattr(self, 'performance_tab'):
+        self.performance_tab.update_timer.stop()
 
       # 3. Close SSH connections
       if hasattr(self, 'ssh_terminal'):
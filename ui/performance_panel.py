@@ -5,6 +5,7 @@ Real-time visualization of high-performance optimizations:
 - Throughput metrics
 - Cache hit rates
 - Batch write statistics
+- Engine scheduler lag, queue wait and worker utilisation
 """
 
 import logging
@@ -24,8 +25,17 @@ logger = logging.getLogger(__name__)
 class PerformancePanel(QWidget):
     """Performance metrics dashboard panel"""
 
-    def __init__(self, parent=None):
+    # Engine telemetry histograms shown in the Engine group
+    ENGINE_HISTOGRAMS = [
+        ('schedule_drift', "Schedule Drift:"),
+        ('queue_wait', "Queue Wait:"),
+        ('service_time', "Check Service:"),
+        ('process_time', "Result Processing:")
+    ]
+
+    def __init__(self, parent=None, monitoring_engine=None):
         super().__init__(parent)
+        self.monitoring_engine = monitoring_engine
         self.init_ui()
 
         # Update timer (every 2 seconds)
@@ -92,6 +102,8 @@ class PerformancePanel(QWidget):
         self.label_batch_pending = QLabel("0")
         self.label_batch_total = QLabel("0")
         self.label_batch_count = QLabel("0")
+        self.label_batch_latency = QLabel("0ms")
+        self.label_batch_dropped = QLabel("0")
 
         batch_layout.addWidget(QLabel("Pending:"), 0, 0)
         batch_layout.addWidget(self.label_batch_pending, 0, 1)
@@ -99,6 +111,10 @@ class PerformancePanel(QWidget):
         batch_layout.addWidget(self.label_batch_total, 1, 1)
         batch_layout.addWidget(QLabel("Batches Flushed:"), 2, 0)
         batch_layout.addWidget(self.label_batch_count, 2, 1)
+        batch_layout.addWidget(QLabel("Flush Latency:"), 3, 0)
+        batch_layout.addWidget(self.label_batch_latency, 3, 1)
+        batch_layout.addWidget(QLabel("Dropped:"), 4, 0)
+        batch_layout.addWidget(self.label_batch_dropped, 4, 1)
 
         batch_group.setLayout(batch_layout)
         layout.addWidget(batch_group)
@@ -124,6 +140,31 @@ class PerformancePanel(QWidget):
         response_group.setLayout(response_layout)
         layout.addWidget(response_group)
 
+        # Engine Telemetry Group (sliding window p50 / p95 / p99)
+        engine_group = QGroupBox("Engine Telemetry (last 5 min, p50 / p95 / p99)")
+        engine_layout = QGridLayout()
+
+        self.engine_labels = {}
+        for row, (name, title) in enumerate(self.ENGINE_HISTOGRAMS):
+            self.engine_labels[name] = QLabel("-")
+            engine_layout.addWidget(QLabel(title), row, 0)
+            engine_layout.addWidget(self.engine_labels[name], row, 1)
+
+        row = len(self.ENGINE_HISTOGRAMS)
+        self.label_engine_queues = QLabel("-")
+        self.label_worker_busy = QLabel("-")
+        self.worker_progress = QProgressBar()
+        self.worker_progress.setMaximum(100)
+
+        engine_layout.addWidget(QLabel("Queued / In Flight:"), row, 0)
+        engine_layout.addWidget(self.label_engine_queues, row, 1)
+        engine_layout.addWidget(QLabel("Worker Busy:"), row + 1, 0)
+        engine_layout.addWidget(self.label_worker_busy, row + 1, 1)
+        engine_layout.addWidget(self.worker_progress, row + 2, 0, 1, 2)
+
+        engine_group.setLayout(engine_layout)
+        layout.addWidget(engine_group)
+
         layout.addStretch()
         self.setLayout(layout)
 
@@ -155,42 +196,61 @@ class PerformancePanel(QWidget):
                 self.cache_progress.setStyleSheet("QProgressBar::chunk { background-color: #F44336; }")  # Red
 
             # Update batch writer stats
-            self.label_batch_pending.setText(str(len(batch_writer.pending_results)))
-            self.label_batch_total.setText(str(batch_writer.total_records))
-            self.label_batch_count.setText(str(batch_writer.total_batches))
-
-            # Calculate overall response time percentiles (aggregate all check types)
-            all_times = []
-            for check_type_data in summary['check_types'].values():
-                times = check_type_data.get('response_times', {})
-                if times:
-                    # Collect all available response times
-                    if 'p50' in times:
-                        all_times.append(times.get('p50', 0))
-                    if 'p95' in times:
-                        all_times.append(times.get('p95', 0))
-                    if 'p99' in times:
-                        all_times.append(times.get('p99', 0))
-
-            # Calculate aggregate percentiles if we have data
-            if summary['check_types']:
-                # Get first check type's data as representative
-                first_check_type = list(summary['check_types'].values())[0]
-                times = first_check_type.get('response_times', {})
-
-                self.label_p50.setText(f"{times.get('p50', 0):.1f}ms")
-                self.label_p95.setText(f"{times.get('p95', 0):.1f}ms")
-                self.label_p99.setText(f"{times.get('p99', 0):.1f}ms")
-                self.label_avg.setText(f"{times.get('avg', 0):.1f}ms")
-            else:
-                self.label_p50.setText("0ms")
-                self.label_p95.setText("0ms")
-                self.label_p99.setText("0ms")
-                self.label_avg.setText("0ms")
+            batch_stats = batch_writer.get_stats()
+            self.label_batch_pending.setText(str(batch_stats['queue_depth']))
+            self.label_batch_total.setText(str(batch_stats['total_records']))
+            self.label_batch_count.setText(str(batch_stats['total_batches']))
+            self.label_batch_latency.setText(f"{batch_stats['last_flush_ms']:.1f}ms (max {batch_stats['max_flush_ms']:.1f}ms)")
+            self.label_batch_dropped.setText(str(batch_stats['dropped_records']))
+
+            # Response time percentiles across all check types (merged histograms)
+            times = summary['response_times']
+            self.label_p50.setText(f"{times['p50']:.1f}ms")
+            self.label_p95.setText(f"{times['p95']:.1f}ms")
+            self.label_p99.setText(f"{times['p99']:.1f}ms")
+            self.label_avg.setText(f"{times['avg']:.1f}ms")
+
+            if self.monitoring_engine is not None:
+                self._update_engine_telemetry()
 
         except Exception as e:
             logger.error(f"Error updating performance metrics: {e}", exc_info=True)
 
+    def _update_engine_telemetry(self):
+        """Update engine telemetry group"""
+        telemetry = self.monitoring_engine.get_engine_telemetry()
+
+        for name, label in self.engine_labels.items():
+            window = telemetry['histograms'][name]['window']
+            if window['count']:
+                label.setText(f"{window['p50']:.1f} / {window['p95']:.1f} / {window['p99']:.1f}ms ({window['count']})")
+            else:
+                label.setText("-")
+
+        self.label_engine_queues.setText(
+            f"{telemetry['task_queue_depth']} tasks, {telemetry['result_queue_depth']} results / "
+            f"{telemetry['in_flight']} of {telemetry['max_workers']}"
+        )
+
+        workers = telemetry['workers']
+        if workers:
+            ratios = [worker['busy_ratio'] for worker in workers.values()]
+            # Idle pool threads never show up, so average over the configured pool size
+            average = sum(ratios) / max(len(ratios), telemetry['max_workers']) * 100
+            self.label_worker_busy.setText(f"{average:.0f}% avg, {max(ratios) * 100:.0f}% max ({len(workers)} workers)")
+            self.worker_progress.setValue(int(average))
+
+            # Color code: sustained high utilisation means concurrent_checks is too low
+            if average >= 85:
+                self.worker_progress.setStyleSheet("QProgressBar::chunk { background-color: #F44336; }")  # Red
+            elif average >= 60:
+                self.worker_progress.setStyleSheet("QProgressBar::chunk { background-color: #FFC107; }")  # Yellow
+            else:
+                self.worker_progress.setStyleSheet("QProgressBar::chunk { background-color: #4CAF50; }")  # Green
+        else:
+            self.label_worker_busy.setText("-")
+            self.worker_progress.setValue(0)
+
     def _format_duration(self, seconds: float) -> str:
         """Format duration in human-readable format"""
         if seconds < 60: